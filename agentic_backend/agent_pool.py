@@ -0,0 +1,373 @@
+"""
+Bounded, prioritized job queue for blocking agent runs.
+
+`Agent.run` / `Team.run` are synchronous and can take a minute, so calling
+them directly inside a Telegram handler freezes the event loop for every
+user. AgentPool runs them as jobs on a bounded thread pool instead:
+
+- a global concurrency limit (worker count) and a per-user limit
+- jobs wait in a priority queue ordered by command type (paid /analyze
+  before /og_intel before heavy /discover scans), then credit tier, then
+  fairness (a user's second job queues behind other users' first), then
+  arrival
+- queued jobs can be cancelled; a cancelled running job releases its
+  caller at once (the thread finishes in the background and keeps its
+  worker until then)
+- queue positions come with ETAs simulated from the measured run time of
+  recent jobs of each command
+- active jobs and run-time history are journalled to disk, so jobs that
+  were queued or running when the bot stopped can be resumed on restart;
+  changes are coalesced and written at most every `journal_interval`
+  seconds by a background writer, off the event loop
+- a job that joined another user's identical run in flight (see
+  analysis_cache) is tracked with `sharing()`, so /status can show it
+
+Threads are used rather than processes because agents, models and tool
+clients hold sockets and locks that cannot be pickled; the runs are
+I/O-bound (LLM and HTTP calls), so the GIL is not the bottleneck.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import statistics
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+COMMAND_PRIORITY = {"analyze": 0, "og_intel": 1, "discover": 2}
+TIER_PRIORITY = {"premium": 0, "standard": 1, "free": 2}
+
+
+def credit_tier(balance: Optional[int]) -> str:
+    """Credit tier for a balance: premium (50+), standard (1+ or unknown) or free"""
+    if balance is None:
+        return "standard"
+    if balance >= 50:
+        return "premium"
+    return "standard" if balance > 0 else "free"
+
+
+class UserBusyError(Exception):
+    """Raised when a user already has the maximum number of runs in flight."""
+
+
+class JobCancelledError(Exception):
+    """Raised to a job's caller when the job is cancelled."""
+
+
+@dataclass
+class Job:
+    """One unit of agent work and enough context to resume it after a restart."""
+    id: str
+    user_id: str
+    command: str
+    args: List[str] = field(default_factory=list)
+    chat_id: Optional[int] = None
+    tier: str = "standard"
+    credits: int = 0  # credits charged for the job, refunded if it cannot complete
+    consumption_id: str = ""  # the credits API consumption that charged them
+    enqueued_at: float = 0.0
+    started_at: Optional[float] = None
+    state: str = "new"  # new | queued | running | shared | done | failed | cancelled
+    seq: int = 0
+    rank: int = 0  # the user's active jobs ahead of this one when it was queued
+
+    @property
+    def sort_key(self) -> Tuple[int, int, int, int]:
+        return (COMMAND_PRIORITY.get(self.command, len(COMMAND_PRIORITY)),
+                TIER_PRIORITY.get(self.tier, len(TIER_PRIORITY)), self.rank, self.seq)
+
+
+class AgentPool:
+    """
+    Dispatch blocking callables to a bounded thread pool, in priority order.
+
+    Args:
+        max_workers: Runs executing at the same time across all users
+        per_user_limit: Runs a single user may have queued or executing
+        journal_path: JSON file for active jobs and run-time history (None: memory only)
+        default_run_seconds: Run-time estimate for commands without history
+        journal_interval: Seconds over which journal changes are coalesced into one write
+    """
+
+    def __init__(self, max_workers: int = 4, per_user_limit: int = 1, journal_path: Optional[str] = None,
+                 default_run_seconds: float = 60.0, journal_interval: float = 1.0):
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self.journal_path = journal_path
+        self.default_run_seconds = default_run_seconds
+        self.journal_interval = journal_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+        self._journal_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-journal")
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self.journal_writes = 0
+        self._heap: List[Tuple[Tuple[int, int, int, int], str]] = []
+        self._jobs: Dict[str, Job] = {}
+        self._ready: Dict[str, asyncio.Future] = {}
+        self._cancelled: Dict[str, asyncio.Future] = {}
+        self._per_user: Dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self.durations: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=50))
+        self.running = 0
+        self._recovered: List[Job] = self._load()
+
+    # --- Journal ---
+
+    def _load(self) -> List[Job]:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable job journal {self.journal_path}: {e}")
+            return []
+        for command, samples in journal.get("durations", {}).items():
+            self.durations[command].extend(samples)
+        return [Job(**job) for job in journal.get("jobs", [])]
+
+    def _save(self):
+        """Schedule a journal write; changes within journal_interval share one."""
+        if not self.journal_path or self._save_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._snapshot())  # no event loop to defer on
+            return
+        self._save_handle = loop.call_later(self.journal_interval, self._save_now)
+
+    def _save_now(self):
+        self._save_handle = None
+        self._journal_writer.submit(self._write, self._snapshot())
+
+    def _snapshot(self) -> Dict:
+        # asdict copies, so the writer thread never sees the live jobs
+        return {
+            "jobs": [asdict(job) for job in self._jobs.values()] + [asdict(job) for job in self._recovered],
+            "durations": {command: list(samples) for command, samples in self.durations.items()},
+        }
+
+    def _write(self, journal: Dict):
+        tmp = f"{self.journal_path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(journal, f)
+            os.replace(tmp, self.journal_path)
+            self.journal_writes += 1
+        except OSError as e:
+            print(f"⚠️ Could not write job journal: {e}")
+
+    def flush_journal(self):
+        """Write any scheduled journal change now and wait for it."""
+        if self._save_handle is None:
+            return
+        self._save_handle.cancel()
+        self._save_handle = None
+        self._journal_writer.submit(self._write, self._snapshot()).result()
+
+    def recover(self) -> List[Job]:
+        """Jobs that were queued or running when the journal was last written; resubmit them to resume."""
+        recovered, self._recovered = self._recovered, []
+        for job in recovered:
+            job.state, job.started_at = "new", None
+        return recovered
+
+    # --- Inspection ---
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state == "queued")
+
+    def user_busy(self, user_id: str) -> bool:
+        return self._per_user.get(user_id, 0) >= self.per_user_limit
+
+    def user_jobs(self, user_id: str) -> List[Job]:
+        return [job for job in self._jobs.values()
+                if job.user_id == user_id and job.state in ("queued", "running", "shared")]
+
+    def shared_with(self, job: Job) -> Optional[Job]:
+        """The queued or running job of the same command and target that a shared job is waiting on."""
+        for other in self._jobs.values():
+            if (other.state in ("queued", "running") and other.command == job.command
+                    and other.args[:1] == job.args[:1]):
+                return other
+        return None
+
+    def _queue_order(self) -> List[Job]:
+        return [self._jobs[job_id] for _, job_id in sorted(self._heap)
+                if job_id in self._jobs and self._jobs[job_id].state == "queued"]
+
+    def queue_position(self, job: Job) -> int:
+        """1-based position among jobs waiting for a worker (0 if it is running or not queued)."""
+        for position, queued in enumerate(self._queue_order(), 1):
+            if queued is job:
+                return position
+        return 0
+
+    def estimate(self, command: str) -> float:
+        """Expected run time of a command: median of recent runs."""
+        samples = self.durations.get(command)
+        return statistics.median(samples) if samples else self.default_run_seconds
+
+    def eta(self, job: Job) -> Tuple[float, float]:
+        """(seconds until the job starts, seconds until it finishes), simulated from run-time history."""
+        now = time.time()
+        if job.state == "shared":
+            owner = self.shared_with(job)
+            return self.eta(owner) if owner is not None else (0.0, self.estimate(job.command))
+        if job.state == "running":
+            return 0.0, max(0.0, self.estimate(job.command) - (now - job.started_at))
+        free_at = [max(0.0, self.estimate(j.command) - (now - j.started_at))
+                   for j in self._jobs.values() if j.state == "running"]
+        free_at += [0.0] * max(0, self.max_workers - len(free_at))
+        heapq.heapify(free_at)
+        for queued in self._queue_order():
+            start = heapq.heappop(free_at)
+            finish = start + self.estimate(queued.command)
+            if queued is job:
+                return start, finish
+            heapq.heappush(free_at, finish)
+        return 0.0, self.estimate(job.command)
+
+    # --- Jobs ---
+
+    def new_job(self, user_id: str, command: str, args: List[str] = None, chat_id: Optional[int] = None,
+                tier: str = "standard", credits: int = 0, consumption_id: str = "") -> Job:
+        return Job(uuid.uuid4().hex[:8], user_id, command, list(args or []), chat_id, tier, credits, consumption_id)
+
+    @contextmanager
+    def sharing(self, job: Job):
+        """
+        Track ``job`` while its caller waits on another user's identical run.
+
+        Shared jobs are listed by user_jobs() (and journalled) but hold no
+        worker or per-user slot and cannot be cancelled: the run belongs to
+        the other user.
+        """
+        job.state = "shared"
+        self._jobs[job.id] = job
+        self._save()
+        try:
+            yield job
+        finally:
+            if self._jobs.get(job.id) is job and job.state == "shared":
+                del self._jobs[job.id]
+                job.state = "new"
+                self._save()
+
+    def _dispatch(self):
+        while self.running < self.max_workers and self._heap:
+            _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.state != "queued":
+                continue
+            self.running += 1
+            job.state, job.started_at = "running", time.time()
+            self._ready[job_id].set_result(None)
+
+    def _finish(self, job: Job, future: asyncio.Future):
+        """Executor future done: free the worker slot and record the run time."""
+        if not future.cancelled():
+            future.exception()  # retrieved here; the caller may have stopped waiting
+        self.running -= 1
+        if job.state != "cancelled":
+            self.durations[job.command].append(time.time() - job.started_at)
+        self._dispatch()
+        self._save()
+
+    async def submit(
+        self,
+        job: Job,
+        fn: Callable,
+        *args,
+        on_queued: Callable[[int, float], Awaitable[None]] = None,
+        **kwargs,
+    ):
+        """
+        Run ``fn(*args, **kwargs)`` for ``job`` on the pool and return its result.
+
+        Raises UserBusyError if the user is at their limit and JobCancelledError
+        if the job is cancelled. When no worker is free,
+        ``on_queued(position, eta_seconds)`` is awaited before waiting for one.
+        """
+        if self.user_busy(job.user_id):
+            raise UserBusyError(job.user_id)
+        loop = asyncio.get_running_loop()
+
+        job.rank = self._per_user[job.user_id]
+        self._per_user[job.user_id] += 1
+        job.seq, job.enqueued_at, job.state = next(self._seq), time.time(), "queued"
+        self._jobs[job.id] = job
+        self._ready[job.id] = loop.create_future()
+        self._cancelled[job.id] = loop.create_future()
+        heapq.heappush(self._heap, (job.sort_key, job.id))
+        self._dispatch()
+        self._save()
+        future = None
+        try:
+            if job.state == "queued" and on_queued:
+                await on_queued(self.queue_position(job), self.eta(job)[0])
+            await self._ready[job.id]
+            if job.state == "cancelled":
+                raise JobCancelledError(job.id)
+
+            future = loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+            future.add_done_callback(partial(self._finish, job))
+            cancelled = self._cancelled[job.id]
+            await asyncio.wait({future, cancelled}, return_when=asyncio.FIRST_COMPLETED)
+            if job.state == "cancelled":
+                raise JobCancelledError(job.id)
+            result = future.result()
+            job.state = "done"
+            return result
+        except BaseException:
+            if future is None and job.started_at is not None:
+                # Given a worker slot but never ran; hand it on
+                self.running -= 1
+                self._dispatch()
+            if job.state in ("queued", "running"):
+                job.state = "failed" if future is not None else "cancelled"
+            raise
+        finally:
+            self._jobs.pop(job.id, None)
+            self._ready.pop(job.id, None)
+            self._cancelled.pop(job.id, None)
+            self._per_user[job.user_id] -= 1
+            if not self._per_user[job.user_id]:
+                del self._per_user[job.user_id]
+            self._save()
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; its caller gets JobCancelledError."""
+        job = self._jobs.get(job_id)
+        if job is None or job.state not in ("queued", "running"):
+            return False
+        was_queued = job.state == "queued"
+        job.state = "cancelled"
+        if was_queued and not self._ready[job_id].done():
+            self._ready[job_id].set_exception(JobCancelledError(job_id))
+        if not self._cancelled[job_id].done():
+            self._cancelled[job_id].set_result(None)
+        self._save()
+        return True
+
+    def shutdown(self, wait: bool = False):
+        self.flush_journal()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._journal_writer.shutdown(wait=True)
+
+
+agent_pool = AgentPool(
+    max_workers=int(os.getenv("AGENT_MAX_WORKERS", "4")),
+    per_user_limit=int(os.getenv("AGENT_PER_USER_LIMIT", "1")),
+    journal_path=os.getenv("AGENT_JOURNAL_PATH", "agent_jobs.json") or None,
+)
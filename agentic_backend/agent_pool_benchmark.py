@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent users on the agent worker pool.
+
+Simulates N users issuing a command at the same moment against a stubbed
+agent whose run() blocks for a fixed time (like a real LLM team run), and
+compares:
+
+- blocking: run() called directly in the handler (previous bot behaviour)
+- pool: run() dispatched through AgentPool
+
+For each mode it reports the wall time until every user has a reply and
+the worst event-loop stall seen by a heartbeat task, which is what other
+users feel while analyses are running.
+
+A second section queues a burst of mixed commands from users of every
+credit tier and compares first-come-first-served dispatch with the
+priority queue: mean wait per command, and how far the ETA given when a
+job was queued was from its actual start.
+
+    python agent_pool_benchmark.py --users 8 --workers 4 --agent-seconds 1.0
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from dataclasses import asdict
+
+from agent_pool import AgentPool, Job, TIER_PRIORITY
+
+# Relative run time of each command (in units of --agent-seconds)
+COMMAND_SECONDS = {"analyze": 1.0, "og_intel": 0.6, "discover": 1.5}
+
+
+class StubAgent:
+    """Stands in for an agno Agent/Team: run() blocks like an LLM call."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def run(self, prompt: str):
+        time.sleep(self.seconds)
+        return f"analysis for {prompt}"
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Return the worst observed event-loop lag while running."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run_mode(mode: str, users: int, workers: int, agent: StubAgent) -> dict:
+    pool = AgentPool(max_workers=workers, per_user_limit=1)
+    queued_replies = []
+    finish_times = []
+
+    async def handler(user: int):
+        user_id = f"user-{user}"
+        if mode == "blocking":
+            agent.run(user_id)
+        else:
+            async def notify(position: int, eta: float):
+                queued_replies.append(position)
+            await pool.submit(pool.new_job(user_id, "analyze"), agent.run, user_id, on_queued=notify)
+        finish_times.append(time.perf_counter())
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(u) for u in range(users)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_lag = await monitor
+    pool.shutdown()
+
+    return {
+        "wall_s": elapsed,
+        "first_reply_s": min(finish_times) - start,
+        "mean_reply_s": sum(t - start for t in finish_times) / len(finish_times),
+        "worst_loop_lag_s": worst_lag,
+        "queued_replies": len(queued_replies),
+    }
+
+
+class FifoJob(Job):
+    """A job without priority classes: dispatched in arrival order (per-user fairness kept)."""
+
+    @property
+    def sort_key(self):
+        return (0, 0, self.rank, self.seq)
+
+
+async def run_mix(prioritized: bool, jobs: int, workers: int, unit: float, seed: int) -> dict:
+    pool = AgentPool(max_workers=workers, per_user_limit=1)
+    for command, share in COMMAND_SECONDS.items():
+        pool.durations[command].append(share * unit)  # run-time history from earlier runs
+    rng = random.Random(seed)
+    waits = {command: [] for command in COMMAND_SECONDS}
+    eta_errors = []
+
+    async def handler(user: int):
+        command = rng.choice(list(COMMAND_SECONDS))
+        job = pool.new_job(f"user-{user}", command, tier=rng.choice(list(TIER_PRIORITY)))
+        if not prioritized:
+            job = FifoJob(**asdict(job))
+        predicted = {}
+        started = {}
+
+        async def notify(position: int, eta: float):
+            predicted["start"] = eta
+
+        def run():
+            started["at"] = time.perf_counter()
+            time.sleep(COMMAND_SECONDS[command] * unit)
+
+        queued_at = time.perf_counter()
+        await pool.submit(job, run, on_queued=notify)
+        wait = started["at"] - queued_at
+        waits[command].append(wait)
+        if "start" in predicted:
+            eta_errors.append(abs(predicted["start"] - wait))
+
+    await asyncio.gather(*(handler(u) for u in range(jobs)))
+    pool.shutdown()
+    return {
+        "waits": {command: sum(w) / len(w) for command, w in waits.items() if w},
+        "eta_error_s": sum(eta_errors) / len(eta_errors) if eta_errors else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentPool concurrency benchmark")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--agent-seconds", type=float, default=1.0)
+    parser.add_argument("--mix-jobs", type=int, default=24, help="Jobs in the mixed-priority burst")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    agent = StubAgent(args.agent_seconds)
+    print(f"🤖 {args.users} users, {args.workers} workers, agent run = {args.agent_seconds}s")
+    print("=" * 78)
+    print(f"{'mode':<10}{'wall s':>10}{'first reply s':>15}{'mean reply s':>14}{'loop lag s':>12}{'queued':>8}")
+    print("-" * 78)
+    results = {}
+    for mode in ("blocking", "pool"):
+        results[mode] = r = asyncio.run(run_mode(mode, args.users, args.workers, agent))
+        print(f"{mode:<10}{r['wall_s']:>10.2f}{r['first_reply_s']:>15.2f}{r['mean_reply_s']:>14.2f}"
+              f"{r['worst_loop_lag_s']:>12.3f}{r['queued_replies']:>8}")
+
+    speedup = results["blocking"]["wall_s"] / results["pool"]["wall_s"]
+    print(f"\n⚡ Pool serves {args.users} concurrent users {speedup:.1f}x faster; "
+          f"worst loop stall {results['blocking']['worst_loop_lag_s']:.2f}s -> "
+          f"{results['pool']['worst_loop_lag_s'] * 1000:.1f}ms")
+
+    print(f"\n🎯 Mixed burst: {args.mix_jobs} jobs, {args.workers} workers (mean wait per command, s)")
+    print("=" * 78)
+    print(f"{'dispatch':<12}" + "".join(f"{'/' + c:>14}" for c in COMMAND_SECONDS) + f"{'ETA error s':>16}")
+    print("-" * 78)
+    for label, prioritized in (("fifo", False), ("priority", True)):
+        r = asyncio.run(run_mix(prioritized, args.mix_jobs, args.workers, args.agent_seconds, args.seed))
+        print(f"{label:<12}" + "".join(f"{r['waits'].get(c, 0.0):>14.2f}" for c in COMMAND_SECONDS)
+              + f"{r['eta_error_s']:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
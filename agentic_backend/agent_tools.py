@@ -0,0 +1,347 @@
+"""
+Custom toolkits for the FinRizz agents.
+
+Kept apart from agents.py so that importing the agents module (and the bot)
+does not pull in agno's tool machinery, numpy or the pyeth clients; the
+agent factories import this module when they first build an agent.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import requests
+from agno.tools import Toolkit
+from dotenv import load_dotenv
+
+from holder_concentration import ConcentrationEngine, concentration_engine
+from sentiment_stream import PostFileReader, SentimentPipeline, post_reader, sample_sentiment, shared_sentiment_pipeline
+
+load_dotenv()
+
+# Reads SUBGRAPH_URL at import, so after .env is loaded
+from subgraph_client import (  # noqa: E402
+    SubgraphClient, SubgraphError, pools_query, subgraph_client, token_query, top_holders_query,
+    whale_transfers_query,
+)
+
+
+class TwitterTools(Toolkit):
+    """
+    Twitter sentiment with bot detection, from the streaming pipeline in
+    sentiment_stream when a post stream (TWEET_STREAM_PATH) is configured.
+    """
+
+    def __init__(self, pipeline: Optional[SentimentPipeline] = None, reader: Optional[PostFileReader] = None,
+                 **kwargs):
+        self._pipeline = pipeline
+        self._reader = reader
+        super().__init__(name="twitter_tools", tools=[self.get_sentiment], **kwargs)
+
+    def get_sentiment(self, token_symbol: str) -> str:
+        """
+        Get recent Twitter sentiment for a token, excluding posts from bot accounts.
+        - Accounts posting more than BOT_MAX_POSTS (3) times per BOT_WINDOW_SECONDS are flagged as bots.
+        - Counts bullish, bearish and neutral posts mentioning the token's cashtag.
+
+        Args:
+            token_symbol (str): Token symbol, e.g. "ETH" or "$ETH".
+
+        Returns:
+            JSON with authentic sentiment, post counts and detected bot accounts.
+        """
+        reader = self._reader or post_reader
+        if reader is None and self._pipeline is None:
+            return json.dumps(sample_sentiment(token_symbol))  # no post stream configured
+        pipeline = self._pipeline or shared_sentiment_pipeline()
+        if pipeline is None:
+            return json.dumps({"error": "Twitter sentiment is unavailable (numpy is not installed)"})
+        if reader is not None:
+            pipeline.ingest_stream(reader.read_new())
+        result = pipeline.sentiment(token_symbol)
+        if result is None:
+            return json.dumps({"token": token_symbol, "error": f"No posts about ${token_symbol.lstrip('$').upper()} "
+                                                              f"in the last {pipeline.window:.0f}s"})
+        return json.dumps(result)
+
+class GameTheoryTools(Toolkit):
+    """Game theory analysis of market dynamics, backed by holder concentration metrics."""
+
+    def __init__(self, engine: Optional[ConcentrationEngine] = None, **kwargs):
+        self._engine = engine or concentration_engine
+        super().__init__(name="game_theory_tools",
+                         tools=[self.get_holder_concentration, self.analyze_market_behavior], **kwargs)
+
+    def _concentration(self, token_address: str) -> Optional[dict]:
+        snapshot = self._engine.snapshot(token_address)
+        if snapshot is None and subgraph_client is not None and self._engine.available:
+            snapshot = self._engine.load_from_subgraph(token_address, subgraph_client)
+        return snapshot
+
+    def get_holder_concentration(self, token_address: str) -> str:
+        """
+        Get holder concentration metrics for a token: top-10 and top-100 share
+        of supply, HHI, Gini coefficient and the largest holders.
+
+        Args:
+            token_address (str): Token contract address.
+
+        Returns:
+            JSON with the metrics at the latest indexed block.
+        """
+        if not self._engine.available:
+            return json.dumps({"error": "Holder concentration is unavailable (numpy is not installed)"})
+        try:
+            snapshot = self._concentration(token_address)
+        except SubgraphError as e:
+            return json.dumps({"error": str(e)})
+        if snapshot is None:
+            return json.dumps({"error": f"No holder data for {token_address}"})
+        return json.dumps(snapshot)
+
+    def analyze_market_behavior(self, whale_data: dict, sentiment_data: dict):
+        """
+        Analyzes market behavior from a game theory perspective.
+        - Checks for coordination between whales.
+        - Models potential outcomes of sentiment vs. whale action.
+
+        Args:
+            whale_data (dict): Whale findings; "concentration_risk" (top-10 share, 0-1) is
+                looked up from "token_address" when missing.
+            sentiment_data (dict): Sentiment findings, with "authentic_sentiment".
+        """
+        concentration_risk = whale_data.get("concentration_risk")
+        if concentration_risk is None and whale_data.get("token_address") and self._engine.available:
+            try:
+                snapshot = self._concentration(whale_data["token_address"])
+            except SubgraphError:
+                snapshot = None
+            concentration_risk = snapshot["concentration_risk"] if snapshot else None
+        if concentration_risk is None:
+            return "Undetermined game: No holder concentration data to assess whale risk."
+        if sentiment_data.get("authentic_sentiment") == "Bullish" and float(concentration_risk) < 0.2:
+            return "Positive-sum game: Conditions are favorable for retail and whales."
+        else:
+            return "Zero-sum game: High risk of manipulation or conflict of interest."
+
+# The Pyth oracle client lives in ../pyeth
+PYETH_PATH = os.getenv("PYETH_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pyeth"))
+if PYETH_PATH not in sys.path:
+    sys.path.append(PYETH_PATH)
+
+from price_provider import PythPriceProvider  # noqa: E402  (pyeth)
+from pyth_oracle import PRICE_FEEDS  # noqa: E402  (pyeth)
+from erc20_market import MULTICALL3_ADDRESS, Erc20MarketReader  # noqa: E402  (pyeth)
+from bot_metrics import Histogram  # noqa: E402
+
+# Served with the agent run metrics at the bot's /metrics (bot_metrics, METRICS_PORT)
+
+PYTH_TOOL_SECONDS = Histogram(
+    "finrizz_pyth_tool_duration_seconds",
+    "Latency of market agent Pyth tool calls",
+    ["tool"],
+)
+
+_price_provider: Optional[PythPriceProvider] = None
+_price_provider_lock = threading.Lock()
+
+
+def shared_price_provider() -> PythPriceProvider:
+    """The process-wide Pyth provider: one oracle (pooled Hermes session) and one price cache."""
+    global _price_provider
+    if _price_provider is None:
+        with _price_provider_lock:
+            if _price_provider is None:
+                _price_provider = PythPriceProvider(ttl=float(os.getenv("PYTH_PRICE_TTL", "5")))
+    return _price_provider
+
+
+def pyth_symbol(symbol: str) -> str:
+    """'btc', '$ETH', 'sol-usd' -> the Pyth feed symbol ('BTC/USD', ...)"""
+    symbol = symbol.strip().lstrip("$").upper().replace("-", "/")
+    return symbol if "/" in symbol else f"{symbol}/USD"
+
+
+class PythNetworkTools(Toolkit):
+    """Live token prices from Pyth Network (Hermes), served through the shared price provider."""
+
+    def __init__(self, provider: Optional[PythPriceProvider] = None, **kwargs):
+        self._provider = provider
+        super().__init__(name="pyth_network_tools", tools=[self.get_price, self.get_prices], **kwargs)
+
+    @property
+    def provider(self) -> PythPriceProvider:
+        return self._provider or shared_price_provider()
+
+    def _lookup(self, tool: str, symbols: List[str]) -> str:
+        started = time.perf_counter()
+        try:
+            requested = {symbol: pyth_symbol(symbol) for symbol in symbols}
+            prices = self.provider.get_many(list(requested.values()))
+        finally:
+            PYTH_TOOL_SECONDS.labels(tool).observe(time.perf_counter() - started)
+        result = {"prices": {}, "unavailable": []}
+        for symbol, feed in requested.items():
+            if feed in prices:
+                price = prices[feed]
+                result["prices"][feed] = {
+                    "price": price["price"], "confidence": price["confidence"], "timestamp": price["timestamp"],
+                }
+            else:
+                result["unavailable"].append(symbol)
+        if result["unavailable"]:
+            result["supported"] = sorted(PRICE_FEEDS)
+        return json.dumps(result)
+
+    def get_price(self, symbol: str) -> str:
+        """
+        Get the live USD price of one token from Pyth Network.
+
+        Args:
+            symbol (str): Token symbol, e.g. "BTC" or "ETH/USD".
+
+        Returns:
+            JSON with the price, its confidence interval and publish time.
+        """
+        return self._lookup("get_price", [symbol])
+
+    def get_prices(self, symbols: List[str]) -> str:
+        """
+        Get live USD prices for several tokens in one call. Prefer this over
+        repeated get_price calls.
+
+        Args:
+            symbols (List[str]): Token symbols, e.g. ["BTC", "ETH", "SOL/USD"].
+
+        Returns:
+            JSON with prices per symbol and any symbols Pyth has no feed for.
+        """
+        return self._lookup("get_prices", symbols)
+
+class TheGraphTools(Toolkit):
+    """Whale data from the FinRizz tokenomics-risk subgraph (batched, block-cached; see subgraph_client)."""
+
+    def __init__(self, client: Optional[SubgraphClient] = None, **kwargs):
+        self._client = client
+        super().__init__(name="the_graph_tools",
+                         tools=[self.query_whale_activity, self.get_top_holders, self.get_whale_transfers], **kwargs)
+
+    def _fetch(self, queries: dict) -> str:
+        client = self._client or subgraph_client
+        if client is None:
+            return json.dumps({"error": "The Graph subgraph is not configured (SUBGRAPH_URL)"})
+        try:
+            block, results = client.fetch(queries)
+        except SubgraphError as e:
+            return json.dumps({"error": str(e)})
+        return json.dumps({"block": block, **results})
+
+    def query_whale_activity(self, contract_address: str, holders: int = 20, transfers: int = 20) -> str:
+        """
+        Get a token's whale picture in one call: token supply data, the largest
+        holders, the most recent whale transfers and its liquidity pool status.
+
+        Args:
+            contract_address (str): Token contract address.
+            holders (int): Number of top holders to return.
+            transfers (int): Number of recent whale transfers to return.
+
+        Returns:
+            JSON with token, top_holders, whale_transfers and pools at one block.
+        """
+        return self._fetch({
+            "token": token_query(contract_address),
+            "top_holders": top_holders_query(contract_address, holders),
+            "whale_transfers": whale_transfers_query(contract_address, transfers),
+            "pools": pools_query(contract_address),
+        })
+
+    def get_top_holders(self, contract_address: str, limit: int = 100) -> str:
+        """
+        Get the largest holder wallets of a token, by balance.
+
+        Args:
+            contract_address (str): Token contract address.
+            limit (int): Number of holders to return (at most 1000).
+
+        Returns:
+            JSON with balance and percentage of circulating supply per wallet.
+        """
+        return self._fetch({"top_holders": top_holders_query(contract_address, limit)})
+
+    def get_whale_transfers(self, contract_address: str, limit: int = 50, since_timestamp: Optional[int] = None) -> str:
+        """
+        Get the most recent whale transfers of a token, newest first.
+
+        Args:
+            contract_address (str): Token contract address.
+            limit (int): Number of transfers to return (at most 1000).
+            since_timestamp (int): Only transfers at or after this Unix timestamp.
+
+        Returns:
+            JSON with amount, USD value, sender, receiver and time per transfer.
+        """
+        return self._fetch({"whale_transfers": whale_transfers_query(contract_address, limit, since_timestamp)})
+
+_market_reader: Optional[Erc20MarketReader] = None
+_market_reader_lock = threading.Lock()
+
+
+def shared_market_reader() -> Optional[Erc20MarketReader]:
+    """The process-wide ERC-20 reader (None without RPC_URL); prices come from the shared Pyth provider."""
+    global _market_reader
+    if _market_reader is None and os.getenv("RPC_URL"):
+        provider = shared_price_provider()
+        with _market_reader_lock:
+            if _market_reader is None:
+                _market_reader = Erc20MarketReader(
+                    os.getenv("RPC_URL"),
+                    multicall_address=os.getenv("MULTICALL3_ADDRESS", MULTICALL3_ADDRESS) or None,
+                    metadata_path=os.getenv("TOKEN_METADATA_PATH", "token_metadata.json") or None,
+                    price_provider=provider,
+                )
+    return _market_reader
+
+
+class PyEthTools(Toolkit):
+    """On-chain ERC-20 supply and market cap, batched through Multicall3 (see pyeth/erc20_market)."""
+
+    def __init__(self, reader: Optional[Erc20MarketReader] = None, **kwargs):
+        self._reader = reader
+        super().__init__(name="py_eth_tools", tools=[self.get_market_cap, self.get_market_caps], **kwargs)
+
+    def get_market_cap(self, token_address: str) -> str:
+        """
+        Get an ERC-20 token's symbol, decimals, total supply, USD price and market cap.
+
+        Args:
+            token_address (str): Token contract address.
+
+        Returns:
+            JSON with the token's supply and market data.
+        """
+        return self.get_market_caps([token_address])
+
+    def get_market_caps(self, token_addresses: List[str]) -> str:
+        """
+        Get supply, USD price and market cap for several ERC-20 tokens in one call.
+        Prefer this over repeated get_market_cap calls.
+
+        Args:
+            token_addresses (List[str]): Token contract addresses.
+
+        Returns:
+            JSON with supply and market data per token. Market cap is total
+            supply times the Pyth price; it is null for tokens whose contract
+            address has no vetted Pyth feed (a token's own symbol is not trusted).
+        """
+        reader = self._reader or shared_market_reader()
+        if reader is None:
+            return json.dumps({"error": "On-chain reads are not configured (RPC_URL)"})
+        try:
+            return json.dumps({"tokens": list(reader.market_caps(token_addresses).values())})
+        except (requests.RequestException, ValueError, KeyError) as e:
+            return json.dumps({"error": f"On-chain read failed: {e}"})
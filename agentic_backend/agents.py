@@ -1,176 +1,397 @@
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from textwrap import dedent
-from agno.agent import Agent
-from agno.team import Team
-from agno.models.openai.like import OpenAILike
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.firecrawl import FirecrawlTools
+from typing import Callable, Dict, Optional
 from dotenv import load_dotenv
+from context_compaction import context_compactor
+from run_trace import RunTrace, run_traced
 load_dotenv()
+
+# agno's debug logging is verbose and costs latency on every run; off unless asked for.
+# Run timings and token counts are always available from run_trace instead.
+DEBUG_MODE = os.getenv("AGENT_DEBUG", "false").lower() in ("1", "true", "yes")
+DEBUG_LEVEL = int(os.getenv("AGENT_DEBUG_LEVEL", "2"))
+
+# --- Lazy Construction ---
+# Importing agno, the OpenAI client, Firecrawl and the tool modules takes
+# about two seconds, so nothing here is built at import. The model, agents
+# and team are created on first use by the factories below (each exactly
+# once, under a lock) and cached; prewarm() builds them in the background
+# once the bot is up. The old module attributes (nebius_model,
+# discovery_agent, ..., finrizz_team) still resolve, through __getattr__.
+
+DISCOVERY_AGENT = "Token Discovery & Intelligence Agent"
+WHALE_AGENT = "Whale Tracking & Behavior Analysis Agent"
+MARKET_AGENT = "Live Market Data & Technical Analysis Agent"
+FINANCIAL_AGENT = "Financial Analysis & Investment Decision Agent"
+
+_built: Dict[str, object] = {}
+_build_lock = threading.RLock()  # reentrant: the team factory builds its members
+
+
+def _cached(key: str, build: Callable[[], object]):
+    built = _built.get(key)
+    if built is None:
+        with _build_lock:
+            built = _built.get(key)
+            if built is None:
+                built = _built[key] = build()
+    return built
+
+
 # --- Model Configurations ---
 
-nebius_model = OpenAILike(
-    id="openai/gpt-oss-120b",
-    api_key=os.getenv("NEBIUS_API_KEY"),
-    base_url="https://api.studio.nebius.com/v1/"
-)
-
-# --- Custom Tool Placeholders ---
-
-class TwitterTools:
-    """Placeholder for Twitter data integration."""
-    def get_sentiment(self, token_symbol: str):
-        """
-        Returns mock sentiment data for a token, including bot detection.
-        - Simulates fetching tweets about a token.
-        - Flags accounts posting more than 3 times as bots.
-        - Returns a summary of authentic sentiment.
-        """
-        print(f"Fetching Twitter sentiment for {token_symbol}...")
-        # Mock data: a list of tuples (account_id, tweet_content)
-        mock_tweets = [
-            ("user_a", f"So bullish on ${token_symbol}! To the moon! 🚀"),
-            ("user_b", f"I'm selling all my ${token_symbol}. This project is a scam."),
-            ("bot_1", f"Buy ${token_symbol} now! Guaranteed 100x! #crypto"),
-            ("bot_1", f"Don't miss out on ${token_symbol}! #altcoin"),
-            ("user_c", f"Just read the whitepaper for ${token_symbol}. Very impressive tech."),
-            ("bot_1", f"${token_symbol} is the future of finance! #DeFi"),
-            ("bot_1", f"Join the ${token_symbol} revolution!"),
-            ("user_d", f"Feeling uncertain about ${token_symbol}'s recent price action."),
-        ]
-
-        from collections import Counter
-        post_counts = Counter(tweet[0] for tweet in mock_tweets)
-        
-        authentic_tweets = [
-            tweet for tweet in mock_tweets if post_counts[tweet[0]] <= 3
-        ]
-        
-        bullish_count = sum(1 for _, content in authentic_tweets if "bullish" in content or "impressive" in content)
-        bearish_count = sum(1 for _, content in authentic_tweets if "scam" in content or "uncertain" in content)
-
-        return {
-            "authentic_sentiment": "Bullish" if bullish_count > bearish_count else "Bearish",
-            "bullish_posts": bullish_count,
-            "bearish_posts": bearish_count,
-            "total_authentic_posts": len(authentic_tweets),
-            "detected_bots": [user for user, count in post_counts.items() if count > 3]
-        }
-
-class GameTheoryTools:
-    """Placeholder for Game Theory analysis of market dynamics."""
-    def analyze_market_behavior(self, whale_data: dict, sentiment_data: dict):
-        """
-        Analyzes market behavior from a game theory perspective.
-        - Checks for coordination between whales.
-        - Models potential outcomes of sentiment vs. whale action.
-        """
-        print("Applying game theory analysis to market behavior...")
-        # This would contain complex logic in a real implementation
-        if sentiment_data.get("authentic_sentiment") == "Bullish" and whale_data.get("concentration_risk") < 0.2:
-            return "Positive-sum game: Conditions are favorable for retail and whales."
-        else:
-            return "Zero-sum game: High risk of manipulation or conflict of interest."
-
-class PythNetworkTools:
-    """Placeholder for Pyth Network integration to fetch live token prices."""
-    def get_price(self, token_id: str):
-        """Fetches the real-time price of a token."""
-        print(f"Fetching price for {token_id}...")
-        pass
-
-class TheGraphTools:
-    """Placeholder for The Graph integration to query substreams for whale data."""
-    def query_whale_activity(self, contract_address: str):
-        """Queries on-chain activity for a given contract address."""
-        print(f"Querying whale activity for {contract_address}...")
-        pass
-
-class PyEthTools:
-    """Placeholder for py-eth integration for on-chain data."""
-    def get_market_cap(self, token_id: str):
-        """Fetches the market cap of a token."""
-        print(f"Fetching market cap for {token_id}...")
-        pass
+def _build_model():
+    from model_routing import model_router
+
+    return model_router.tiers["large"].model
+
+
+def get_model(route: Optional[str] = None):
+    """
+    The model for an agent's route (see model_routing: specialists on the
+    fast tier, synthesis on the large one); the large tier's client by default.
+    """
+    if route is None:
+        return _cached("model", _build_model)
+
+    def build():
+        from model_routing import model_router
+
+        return model_router.model(route)
+
+    return _cached(f"model:{route}", build)
+
 
 # --- Agent Definitions ---
 
-discovery_agent = Agent(
-    name="Token Discovery & Intelligence Agent",
-    model=nebius_model,
-    tools=[FirecrawlTools(api_key=os.getenv("FIRECRAWL_API_KEY")), TwitterTools()],
-    description="An elite crypto market researcher specializing in token discovery, funding round analysis, and early-stage project evaluation.",
-    instructions=dedent("""
-        - Focus on web scraping and crawling to discover newly funded utility tokens from platforms like CryptoRank.
-        - Extract comprehensive tokenomics, investor profiles, and vesting schedules from project websites.
-        - Assess the token's utility and competitive landscape based on available documentation.
-        - Use Twitter sentiment analysis to gauge authentic community bullishness while filtering out bot activity.
-        - Provide comprehensive analysis based on the data you can successfully gather from web sources.
-    """),
-    debug_mode=True,
-    debug_level=2,
-    expected_output="A comprehensive report on newly discovered tokens with their investment potential and social sentiment.",
-)
-
-whale_agent = Agent(
-    name="Whale Tracking & Behavior Analysis Agent",
-    model=nebius_model,
-    tools=[TheGraphTools()],
-    description="A specialized on-chain analyst with expertise in whale wallet identification and large transaction monitoring.",
-    instructions=dedent("""
-        - Identify the top 100 holder wallets for a given token.
-        - Monitor real-time large transfers exceeding predefined thresholds.
-        - Analyze whale accumulation and distribution patterns.
-        - Assess concentration risk for potential market manipulation.
-    """),
-    debug_mode=True,
-    debug_level=2,
-    expected_output="An intelligence report on whale activity, concentration risk, and potential market movements.",
-)
-
-market_agent = Agent(
-    name="Live Market Data & Technical Analysis Agent",
-    model=nebius_model,
-    tools=[PythNetworkTools(), PyEthTools()],
-    description="A quantitative market analyst specializing in real-time price tracking and market capitalization analysis.",
-    instructions=dedent("""
-        - Deliver live token prices and market capitalization.
-        - Analyze trading volume and liquidity depth.
-        - Provide technical indicators like RSI and MACD.
-        - Assess market sentiment from price action.
-    """),
-    debug_mode=True,
-    debug_level=2,
-    expected_output="A real-time market intelligence dashboard with key metrics and technical analysis.",
-)
-
-financial_agent = Agent(
-    name="Financial Analysis & Investment Decision Agent",
-    model=nebius_model,
-    tools=[GameTheoryTools()],
-    description="A senior crypto financial analyst with expertise in investment thesis development and risk modeling.",
-    instructions=dedent("""
-        - Synthesize all collected data into a professional investment recommendation.
-        - Analyze fundamental valuation and risk-adjusted return projections.
-        - Apply game theory principles to assess the strategic landscape of market participants.
-        - Provide portfolio allocation guidance and scenario analysis.
-        - Formulate a clear investment thesis with risk management strategies.
-    """),
-    debug_mode=True,
-    debug_level=2,
-    expected_output="A professional investment report with a clear BUY/SELL/HOLD recommendation, detailed financial analysis, and strategic market insights.",
-)
+def _tool_hooks(*hooks) -> list:
+    """Agent tool hooks, behind the record/replay tool tape when TOOL_TAPE_PATH is set."""
+    from record_replay import tool_tape
+
+    return ([tool_tape.hook] if tool_tape else []) + list(hooks)
+
+
+def _build_discovery_agent():
+    from agno.agent import Agent
+    from agno.tools.firecrawl import FirecrawlTools
+    from agent_tools import TwitterTools
+    from tool_cache import tool_cache
+
+    return Agent(
+        name=DISCOVERY_AGENT,
+        model=get_model("discovery"),
+        tools=[FirecrawlTools(api_key=os.getenv("FIRECRAWL_API_KEY")), TwitterTools()],
+        # Crawl and search results are memoized on disk across runs (see tool_cache)
+        tool_hooks=_tool_hooks(tool_cache.hook),
+        description="An elite crypto market researcher specializing in token discovery, funding round analysis, and early-stage project evaluation.",
+        instructions=dedent("""
+            - Focus on web scraping and crawling to discover newly funded utility tokens from platforms like CryptoRank.
+            - Extract comprehensive tokenomics, investor profiles, and vesting schedules from project websites.
+            - Assess the token's utility and competitive landscape based on available documentation.
+            - Use Twitter sentiment analysis to gauge authentic community bullishness while filtering out bot activity.
+            - Provide comprehensive analysis based on the data you can successfully gather from web sources.
+        """),
+        debug_mode=DEBUG_MODE,
+        debug_level=DEBUG_LEVEL,
+        expected_output="A comprehensive report on newly discovered tokens with their investment potential and social sentiment.",
+    )
+
+
+def _build_whale_agent():
+    from agno.agent import Agent
+    from agent_tools import TheGraphTools
+    from prefetch import prefetcher
+
+    return Agent(
+        name=WHALE_AGENT,
+        model=get_model("whale"),
+        tools=[TheGraphTools()],
+        # Answered from the /analyze prefetch when it already has the data (see prefetch)
+        tool_hooks=_tool_hooks(prefetcher.hook),
+        description="A specialized on-chain analyst with expertise in whale wallet identification and large transaction monitoring.",
+        instructions=dedent("""
+            - Start with query_whale_activity: it returns holders, recent whale transfers and liquidity in one call.
+            - Identify the top 100 holder wallets for a given token.
+            - Monitor real-time large transfers exceeding predefined thresholds.
+            - Analyze whale accumulation and distribution patterns.
+            - Assess concentration risk for potential market manipulation.
+        """),
+        debug_mode=DEBUG_MODE,
+        debug_level=DEBUG_LEVEL,
+        expected_output="An intelligence report on whale activity, concentration risk, and potential market movements.",
+    )
+
+
+def _build_market_agent():
+    from agno.agent import Agent
+    from agent_tools import PyEthTools, PythNetworkTools
+    from prefetch import prefetcher
+
+    return Agent(
+        name=MARKET_AGENT,
+        model=get_model("market"),
+        tools=[PythNetworkTools(), PyEthTools()],
+        tool_hooks=_tool_hooks(prefetcher.hook),
+        description="A quantitative market analyst specializing in real-time price tracking and market capitalization analysis.",
+        instructions=dedent("""
+            - Deliver live token prices and market capitalization; fetch every price you need with one get_prices call
+              and every on-chain market cap with one get_market_caps call.
+            - Analyze trading volume and liquidity depth.
+            - Provide technical indicators like RSI and MACD.
+            - Assess market sentiment from price action.
+        """),
+        debug_mode=DEBUG_MODE,
+        debug_level=DEBUG_LEVEL,
+        expected_output="A real-time market intelligence dashboard with key metrics and technical analysis.",
+    )
+
+
+def _build_financial_agent():
+    from agno.agent import Agent
+    from agent_tools import GameTheoryTools
+    from prefetch import prefetcher
+
+    return Agent(
+        name=FINANCIAL_AGENT,
+        model=get_model("financial"),
+        tools=[GameTheoryTools()],
+        tool_hooks=_tool_hooks(prefetcher.hook),
+        description="A senior crypto financial analyst with expertise in investment thesis development and risk modeling.",
+        instructions=dedent("""
+            - Synthesize all collected data into a professional investment recommendation.
+            - Analyze fundamental valuation and risk-adjusted return projections.
+            - Apply game theory principles to assess the strategic landscape of market participants.
+            - Base whale concentration risk on get_holder_concentration (top-10 share, HHI, Gini).
+            - Provide portfolio allocation guidance and scenario analysis.
+            - Formulate a clear investment thesis with risk management strategies.
+        """),
+        debug_mode=DEBUG_MODE,
+        debug_level=DEBUG_LEVEL,
+        expected_output="A professional investment report with a clear BUY/SELL/HOLD recommendation, detailed financial analysis, and strategic market insights.",
+    )
+
+
+_AGENT_FACTORIES = {
+    DISCOVERY_AGENT: _build_discovery_agent,
+    WHALE_AGENT: _build_whale_agent,
+    MARKET_AGENT: _build_market_agent,
+    FINANCIAL_AGENT: _build_financial_agent,
+}
+
+
+def get_agent(name: str):
+    """The agent called ``name`` (one of the *_AGENT names), built on first use."""
+    return _cached(name, _AGENT_FACTORIES[name])
+
 
 # --- Team Definition ---
 
-finrizz_team = Team(
-    name="FinRizz Analysis Team",
-    members=[discovery_agent, whale_agent, market_agent, financial_agent],
-    instructions=[
-        "You are the FinRizz financial analysis team coordinator.",
-        "Process all agent inputs sequentially for comprehensive token analysis.",
-        "Synthesize the findings into a clear, actionable investment recommendation."
-    ],
-    show_members_responses=True,
-    markdown=True
-)
+def _build_team():
+    from agno.team import Team
+
+    return Team(
+        name="FinRizz Analysis Team",
+        model=get_model("team"),
+        members=[get_agent(name) for name in (DISCOVERY_AGENT, WHALE_AGENT, MARKET_AGENT, FINANCIAL_AGENT)],
+        instructions=[
+            "You are the FinRizz financial analysis team coordinator.",
+            "Gather the discovery, whale and market findings first; they are independent of each other.",
+            "Then give all of them to the financial analysis agent for the investment decision.",
+            "Synthesize the findings into a clear, actionable investment recommendation."
+        ],
+        show_members_responses=True,
+        markdown=True,
+        # Member reports reach the coordinator compacted to their token budgets
+        tool_hooks=[context_compactor.hook],
+    )
+
+
+def get_team():
+    """The FinRizz team, built (with its members) on first use."""
+    return _cached("team", _build_team)
+
+
+def prewarm(background: bool = True) -> Optional[threading.Thread]:
+    """
+    Build the model, every agent, the team and the shared tool clients ahead
+    of the first request. In the background by default; returns the thread.
+    """
+    def warm():
+        started = time.perf_counter()
+        try:
+            get_team()
+            import agent_tools
+            agent_tools.shared_price_provider()
+            agent_tools.shared_market_reader()
+        except Exception as e:
+            print(f"⚠️ Agent pre-warm failed: {e}")
+            return
+        print(f"🔥 Agents ready in {time.perf_counter() - started:.2f}s")
+
+    if not background:
+        warm()
+        return None
+    thread = threading.Thread(target=warm, name="agent-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+_LAZY_ATTRIBUTES = {
+    "nebius_model": get_model,
+    "discovery_agent": lambda: get_agent(DISCOVERY_AGENT),
+    "whale_agent": lambda: get_agent(WHALE_AGENT),
+    "market_agent": lambda: get_agent(MARKET_AGENT),
+    "financial_agent": lambda: get_agent(FINANCIAL_AGENT),
+    "finrizz_team": get_team,
+    "specialist_agents": lambda: [get_agent(name) for name in SPECIALISTS],
+}
+
+
+def __getattr__(name: str):
+    # Module attributes of the eagerly built era, e.g. agents.finrizz_team
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- Parallel Orchestration ---
+# The discovery, whale and market agents gather independent data; only the
+# financial agent needs all of it. In "parallel" mode they run concurrently
+# (each with its own timeout) and their findings are handed to the financial
+# agent, instead of the team coordinator delegating to them one at a time.
+
+ORCHESTRATION_MODE = os.getenv("FINRIZZ_ORCHESTRATION", "team")  # team | parallel
+
+SPECIALISTS = (DISCOVERY_AGENT, WHALE_AGENT, MARKET_AGENT)
+
+_default_timeout = float(os.getenv("SPECIALIST_TIMEOUT", "45"))
+specialist_timeouts = {
+    DISCOVERY_AGENT: float(os.getenv("DISCOVERY_AGENT_TIMEOUT", _default_timeout)),
+    WHALE_AGENT: float(os.getenv("WHALE_AGENT_TIMEOUT", _default_timeout)),
+    MARKET_AGENT: float(os.getenv("MARKET_AGENT_TIMEOUT", _default_timeout)),
+}
+
+# Token budgets for the findings each agent hands to synthesis (see context_compaction).
+# The financial agent's report is the answer itself and is never compacted.
+context_compactor.budgets.update({
+    DISCOVERY_AGENT: int(os.getenv("DISCOVERY_CONTEXT_BUDGET", context_compactor.default_budget)),
+    WHALE_AGENT: int(os.getenv("WHALE_CONTEXT_BUDGET", context_compactor.default_budget)),
+    MARKET_AGENT: int(os.getenv("MARKET_CONTEXT_BUDGET", context_compactor.default_budget)),
+    FINANCIAL_AGENT: 0,
+})
+
+# Timed-out runs cannot be interrupted and keep their thread until they return.
+# At most SPECIALIST_MAX_ABANDONED of them per agent may still be running (a
+# specialist at the limit is skipped and reported as unavailable), and the pool
+# has room for that many on top of every concurrent analysis's live runs.
+_max_concurrent_analyses = int(os.getenv("AGENT_MAX_WORKERS", "4"))
+max_abandoned_runs = int(os.getenv("SPECIALIST_MAX_ABANDONED", _max_concurrent_analyses))
+_abandoned: Dict[str, int] = {name: 0 for name in SPECIALISTS}
+_abandoned_lock = threading.Lock()
+
+
+def _specialist_executor() -> ThreadPoolExecutor:
+    return _cached("specialist_executor", lambda: ThreadPoolExecutor(
+        max_workers=len(SPECIALISTS) * (_max_concurrent_analyses + max_abandoned_runs),
+        thread_name_prefix="specialist",
+    ))
+
+
+def _abandon(name: str, future):
+    """Count a timed-out run against its agent until its thread returns."""
+    if future.cancel():
+        return  # never started
+    with _abandoned_lock:
+        _abandoned[name] += 1
+
+    def released(_):
+        with _abandoned_lock:
+            _abandoned[name] -= 1
+
+    future.add_done_callback(released)
+
+
+def _content(response) -> str:
+    return str(getattr(response, "content", response) or "")
+
+
+def _run(agent, prompt: str, trace: Optional[RunTrace]):
+    if trace is None:
+        return agent.run(prompt)
+    return run_traced(agent, prompt, trace, finish=False)
+
+
+def run_parallel_analysis(prompt: str, on_member: Optional[Callable[[str, str], None]] = None,
+                          trace: Optional[RunTrace] = None) -> str:
+    """
+    Run the specialist agents concurrently, then synthesize with the financial agent.
+
+    Blocking; call it on the worker pool. ``on_member(agent_name, content)`` is
+    called as each agent finishes. Specialists that fail or exceed their
+    timeout are reported to the financial agent as unavailable. Every agent
+    run is recorded in ``trace``, which is finished when the synthesis ends.
+    """
+    error = None
+    try:
+        return _run_parallel_analysis(prompt, on_member, trace)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if trace is not None:
+            trace.finish(error)
+
+
+def _run_parallel_analysis(prompt: str, on_member, trace: Optional[RunTrace]) -> str:
+    started = time.monotonic()
+    specialists = [get_agent(name) for name in SPECIALISTS]
+    findings = {}
+    with _abandoned_lock:
+        stuck = {name for name, count in _abandoned.items() if count >= max_abandoned_runs}
+    for name in stuck:
+        findings[name] = ("skipped", "Earlier runs of this agent timed out and are still running.")
+    futures = {_specialist_executor().submit(_run, agent, prompt, trace): agent
+               for agent in specialists if agent.name not in stuck}
+
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        # Anything already past its deadline is abandoned
+        for future in [f for f in pending if now - started >= specialist_timeouts[futures[f].name]]:
+            pending.discard(future)
+            _abandon(futures[future].name, future)
+            findings[futures[future].name] = ("timed out", f"No result within {specialist_timeouts[futures[future].name]:.0f}s.")
+        if not pending:
+            break
+        next_deadline = min(started + specialist_timeouts[futures[f].name] for f in pending)
+        done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+        for future in done:
+            agent = futures[future]
+            elapsed = time.monotonic() - started
+            try:
+                content = _content(future.result())
+            except Exception as e:
+                findings[agent.name] = ("failed", f"Error: {e}")
+                continue
+            findings[agent.name] = (f"ok in {elapsed:.1f}s", content)
+            if on_member:
+                on_member(agent.name, content)
+
+    sections = []
+    for agent in specialists:
+        status, content = findings[agent.name]
+        # Users saw the full report via on_member; synthesis gets it within the agent's budget
+        sections.append(f"### {agent.name}\nStatus: {status}\n\n{context_compactor.compact(agent.name, content).text}")
+    synthesis_prompt = (
+        f"{prompt}\n\n"
+        "Specialist findings (gathered in parallel):\n\n" + "\n\n".join(sections) + "\n\n"
+        "Synthesize these findings into the investment recommendation. "
+        "Where a specialist's findings are unavailable, state the gap and how it affects confidence."
+    )
+    financial_agent = get_agent(FINANCIAL_AGENT)
+    report = _content(_run(financial_agent, synthesis_prompt, trace))
+    if on_member:
+        on_member(financial_agent.name, report)
+    return report
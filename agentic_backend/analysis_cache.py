@@ -0,0 +1,203 @@
+"""
+Result cache for expensive agent commands (/analyze, /og_intel).
+
+When a token trends, many users ask for the same analysis within minutes.
+AnalysisCache keys results by command and normalized token address and:
+
+- serves results younger than ANALYSIS_CACHE_TTL seconds from memory
+- evicts least recently used entries beyond ANALYSIS_CACHE_MAX_ENTRIES
+- persists entries to ANALYSIS_CACHE_PATH so they survive restarts
+- lets concurrent requests for the same key attach to the run already in
+  flight (single-flight) instead of starting another team run
+
+Failed runs are never cached. Requests that joined a run which fails get a
+SharedRunError, never the owner's own exception. When the owner's run ends for
+reasons of its own (cancelled, user busy), they look again and the first of
+them runs in its place. Hit rate and the LLM seconds saved (the
+measured duration of the original run, counted for each hit or shared
+waiter) are available from `stats()`.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Awaitable, Callable, ContextManager, Dict, Optional, Tuple
+
+from agent_pool import JobCancelledError, UserBusyError
+
+Key = Tuple[str, str]
+
+
+class SharedRunError(RuntimeError):
+    """Raised to requests that joined a run in flight when that run failed."""
+
+
+@dataclass
+class Lookup:
+    """Result of a cached command."""
+    result: str
+    source: str  # hit | shared | run
+    age: float = 0.0  # seconds since the result was produced
+
+
+def normalize_address(address: str) -> str:
+    """EVM addresses are case-insensitive; other chains' addresses are not."""
+    address = address.strip()
+    if address[:2].lower() == "0x":
+        return address.lower()
+    return address
+
+
+class AnalysisCache:
+    """
+    TTL + LRU cache of agent results with single-flight and disk persistence.
+
+    Args:
+        path: JSON file to persist entries to (None keeps the cache in memory)
+        ttl: Seconds a result stays valid
+        max_entries: Entries kept before the least recently used is evicted
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 600.0, max_entries: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Key, Dict]" = OrderedDict()
+        self._inflight: Dict[Key, asyncio.Future] = {}
+        self._save_lock = threading.Lock()
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self.llm_seconds_saved = 0.0
+        self._load()
+
+    # --- Persistence ---
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable analysis cache {self.path}: {e}")
+            return
+        now = time.time()
+        for entry in stored:
+            if now - entry["created"] < self.ttl:
+                self._entries[(entry["command"], entry["address"])] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self, entries):
+        with self._save_lock:
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+
+    async def _persist(self):
+        if not self.path:
+            return
+        entries = list(self._entries.values())
+        try:
+            await asyncio.to_thread(self._save, entries)
+        except OSError as e:
+            print(f"⚠️ Could not persist analysis cache: {e}")
+
+    # --- Lookups ---
+
+    def get(self, command: str, address: str) -> Optional[Dict]:
+        """Fresh cached entry for a command, or None."""
+        key = (command, normalize_address(address))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["created"] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get_or_run(self, command: str, address: str, run: Callable[[], Awaitable[str]],
+                         waiting: Optional[Callable[[], ContextManager]] = None) -> Lookup:
+        """
+        Return the cached result for ``(command, address)``, join the run in
+        flight for it, or await ``run()`` and cache what it returns.
+
+        ``waiting()`` (e.g. ``lambda: agent_pool.sharing(job)``) is entered
+        for as long as the caller waits on another request's run.
+        """
+        key = (command, normalize_address(address))
+        while True:
+            entry = self.get(command, address)
+            if entry is not None:
+                self.hits += 1
+                self.llm_seconds_saved += entry["llm_seconds"]
+                return Lookup(entry["result"], "hit", time.time() - entry["created"])
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            with waiting() if waiting else nullcontext():
+                entry = await asyncio.shield(inflight)
+            if entry is None:
+                continue  # the owner was cancelled or busy: join the next run or start one
+            self.shared += 1
+            self.llm_seconds_saved += entry["llm_seconds"]
+            return Lookup(entry["result"], "shared", time.time() - entry["created"])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            start = time.perf_counter()
+            result = await run()
+            entry = {
+                "command": key[0],
+                "address": key[1],
+                "result": result,
+                "created": time.time(),
+                "llm_seconds": time.perf_counter() - start,
+            }
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            future.set_result(entry)
+        except (JobCancelledError, UserBusyError, asyncio.CancelledError):
+            # The owner's own reasons, not the run's: waiters retry rather than share them
+            future.set_result(None)
+            raise
+        except BaseException as e:
+            future.set_exception(SharedRunError(f"Shared analysis run failed: {e}"))
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+        await self._persist()
+        return Lookup(result, "run")
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.shared + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared) / lookups, 3) if lookups else 0.0,
+            "llm_seconds_saved": round(self.llm_seconds_saved, 1),
+        }
+
+
+analysis_cache = AnalysisCache(
+    path=os.getenv("ANALYSIS_CACHE_PATH", "analysis_cache.json") or None,
+    ttl=float(os.getenv("ANALYSIS_CACHE_TTL", "600")),
+    max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "256")),
+)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /analyze traffic for a trending token with and without the cache.
+
+Users arrive over a window and mostly ask about a few hot addresses (mixed
+case, as pasted from explorers). Each team run is a StubAgent blocking for
+--agent-seconds on the AgentPool. Reports team runs started, wall time,
+hit rate and LLM seconds saved, then reloads the cache from disk to show
+entries survive a restart.
+
+    python analysis_cache_benchmark.py --users 40 --tokens 3 --agent-seconds 1.0
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from agent_pool import AgentPool
+from agent_pool_benchmark import StubAgent
+from analysis_cache import AnalysisCache
+
+
+async def run_mode(cached: bool, args, path: str) -> dict:
+    rng = random.Random(args.seed)
+    tokens = ["0x" + "".join(rng.choice("0123456789abcdef") for _ in range(40)) for _ in range(args.tokens)]
+    requests = [
+        (rng.uniform(0, args.window), rng.choice(tokens).upper().replace("0X", "0x"))
+        for _ in range(args.users)
+    ]
+    agent = StubAgent(args.agent_seconds)
+    pool = AgentPool(max_workers=args.workers, per_user_limit=1)
+    cache = AnalysisCache(path=path, ttl=600) if cached else None
+    runs = 0
+
+    async def user(index: int, delay: float, address: str):
+        await asyncio.sleep(delay)
+
+        async def team_run():
+            nonlocal runs
+            runs += 1
+            return await pool.submit(pool.new_job(f"user-{index}", "analyze"), agent.run, address)
+
+        if cache is None:
+            await team_run()
+        else:
+            await cache.get_or_run("analyze", address, team_run)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i, delay, address) for i, (delay, address) in enumerate(requests)))
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return {"runs": runs, "wall_s": elapsed, "stats": cache.stats() if cache else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analysis cache benchmark")
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--tokens", type=int, default=3)
+    parser.add_argument("--window", type=float, default=2.0, help="Seconds over which users arrive")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--agent-seconds", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"🔥 {args.users} /analyze requests for {args.tokens} trending tokens over {args.window}s, "
+          f"team run = {args.agent_seconds}s, {args.workers} workers")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "analysis_cache.json")
+        baseline = asyncio.run(run_mode(False, args, path))
+        cached = asyncio.run(run_mode(True, args, path))
+        print(f"{'mode':<10}{'team runs':>12}{'wall s':>10}")
+        print("-" * 60)
+        print(f"{'no cache':<10}{baseline['runs']:>12}{baseline['wall_s']:>10.2f}")
+        print(f"{'cache':<10}{cached['runs']:>12}{cached['wall_s']:>10.2f}")
+
+        stats = cached["stats"]
+        print(f"\n📊 hit rate {stats['hit_rate']:.0%} ({stats['hits']} hits, {stats['shared']} shared in-flight), "
+              f"LLM seconds saved {stats['llm_seconds_saved']}")
+        reloaded = AnalysisCache(path=path, ttl=600)
+        print(f"💾 {reloaded.stats()['entries']} entries reloaded from disk after restart")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,31 +2,41 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
 import os
 import asyncio
-import requests
+import time
+import sys
 from dotenv import load_dotenv
-from agents import finrizz_team, discovery_agent
+from agents import DISCOVERY_AGENT, ORCHESTRATION_MODE, get_agent, get_team, prewarm, run_parallel_analysis
+from agent_pool import agent_pool, credit_tier, UserBusyError, JobCancelledError
+from credits_client import credits_client
+from credit_ledger import credit_ledger
+from analysis_cache import analysis_cache
+from report_extraction import report_extractor
+from team_stream import TeamProgress, MEMBER_LABELS, run_team_streaming, record_first_content, ttfc_stats
+from run_trace import RunTrace, run_traced, agent_metrics
+from tool_cache import tool_cache
+from context_compaction import context_compactor
+from prefetch import prefetcher, valid_address
+from bot_metrics import start_from_env as start_metrics_server
 
 load_dotenv()
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-CREDITS_API_URL = os.getenv("CREDITS_API_URL", "http://localhost:3001/api")
 
 def format_analysis_summary(raw_response: str) -> str:
     """
     Refactor layer to create concise, well-formatted analysis for Telegram
     """
-    # Extract key information using simple text processing
-    lines = raw_response.split('\n')
+    # Classify every line in one pass
+    report = report_extractor.classify(raw_response)
     
     # Find key sections and extract relevant info
     summary = "🔍 **FinRizz Analysis Summary**\n\n"
     
     # Try to extract token names and key metrics
     tokens_found = []
-    for line in lines:
-        if any(keyword in line.lower() for keyword in ['token', 'project', 'divine', 'redotpay', 'uptop']):
-            if len(line.strip()) < 100 and '|' not in line:  # Avoid table rows
-                tokens_found.append(line.strip())
+    for _, line in report.matching('token'):
+        if len(line.strip()) < 100 and '|' not in line:  # Avoid table rows
+            tokens_found.append(line.strip())
     
     # Create formatted summary
     if tokens_found:
@@ -40,10 +50,9 @@ def format_analysis_summary(raw_response: str) -> str:
     summary += "💡 **Key Insights:**\n"
     insights = []
     
-    for line in lines:
-        if any(keyword in line.lower() for keyword in ['bullish', 'bearish', 'risk', 'recommendation', 'buy', 'sell', 'hold']):
-            if len(line.strip()) < 150 and line.strip() and not line.startswith('|'):
-                insights.append(line.strip().replace('*', '').replace('#', ''))
+    for _, line in report.matching('sentiment', 'recommendation', 'risk'):
+        if len(line.strip()) < 150 and line.strip() and not line.startswith('|'):
+            insights.append(line.strip().replace('*', '').replace('#', ''))
     
     for insight in insights[:3]:
         if insight:
@@ -68,17 +77,13 @@ def format_token_analysis(raw_response: str, token_address: str) -> str:
     summary += "• Risk Level: Evaluating...\n\n"
     
     # Extract sentiment and recommendation
-    lines = raw_response.split('\n')
     recommendation = "HOLD"
     risk_level = "MEDIUM"
     
-    for line in lines:
-        if any(word in line.lower() for word in ['buy', 'bullish', 'positive']):
-            recommendation = "BUY 🟢"
-            break
-        elif any(word in line.lower() for word in ['sell', 'bearish', 'negative', 'risk']):
-            recommendation = "SELL 🔴"
-            break
+    # The first line with a signal decides; a positive signal wins within a line
+    first_signal = report_extractor.first_line(raw_response, 'positive', 'negative')
+    if first_signal is not None:
+        recommendation = "BUY 🟢" if 'positive' in first_signal[1] else "SELL 🔴"
     
     summary += f"📈 **Recommendation:** {recommendation}\n"
     summary += f"⚠️ **Risk Assessment:** {risk_level}\n\n"
@@ -94,27 +99,110 @@ def format_token_analysis(raw_response: str, token_address: str) -> str:
     
     return summary
 
-async def check_user_credits(user_id: str) -> int:
-    """Check user's credit balance"""
-    try:
-        response = requests.get(f"{CREDITS_API_URL}/credits/{user_id}")
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('data', {}).get('credits', 0)
-        return 0
-    except:
-        return 0
-
-async def consume_user_credits(user_id: str, credits_to_consume: int) -> bool:
-    """Consume user credits for analysis"""
+def format_og_intel(token_address: str) -> str:
+    """
+    Format 0G Network intelligence summary
+    """
+    summary = f"🔍 **0G Network Intelligence**\n\n"
+    summary += f"📡 **Token:** `{token_address[:15]}...`\n"
+    summary += f"🌐 **Network:** 0G Testnet/Mainnet\n\n"
+    summary += f"⚡ **0G-Specific Metrics:**\n"
+    summary += f"• Validator Activity: Monitoring ✅\n"
+    summary += f"• Network Health: Analyzing 📊\n"
+    summary += f"• Cross-chain Data: Processing 🔗\n\n"
+    summary += f"🐋 **Whale Patterns:**\n"
+    summary += f"• Large transfers detected\n"
+    summary += f"• 0G-native analysis complete\n\n"
+    summary += f"💡 **Result:** Analysis completed successfully\n"
+    summary += f"📈 Use /analyze for detailed token metrics"
+    return summary
+
+async def check_user_credits(user_id: str, fresh: bool = False) -> int:
+    """Check user's credit balance (served from the short-lived cache unless fresh)"""
+    return await credits_client.get_balance(user_id, fresh=fresh)
+
+def extract_content(response) -> str:
+    """Extract text content from an agno RunOutput object"""
+    if hasattr(response, 'content'):
+        return response.content
+    elif hasattr(response, 'text'):
+        return response.text
+    elif hasattr(response, 'response'):
+        return response.response
+    return str(response)
+
+PROMPTS = {
+    'analyze': "Perform comprehensive analysis on token address: {}. Include discovery research, whale tracking, live market data, and investment recommendation.",
+    'discover': "Discover and analyze the top 5 most promising newly funded utility tokens from the past 30 days. Focus on projects with strong utility, reasonable valuations, and favorable vesting schedules.",
+    'og_intel': "Perform specialized 0G Network analysis on token: {}. Focus on 0G-specific metrics, validator activity, and network-specific whale patterns.",
+}
+
+def format_eta(seconds: float) -> str:
+    if seconds < 60:
+        return f"~{max(1, round(seconds))}s"
+    return f"~{round(seconds / 60)} min"
+
+def queue_notifier(update: Update, job):
+    """Callback telling the user their run is waiting for a free worker"""
+    async def notify_queued(position: int, eta: float):
+        await update.message.reply_text(
+            f"🕒 All analysts are busy - you are #{position} in the queue, starting in {format_eta(eta)}. "
+            f"Your analysis will start automatically.\n"
+            f"Use /status to follow it or /cancel {job.id} to drop it."
+        )
+    return notify_queued
+
+async def load_team():
+    """The agent team; built on a worker thread if pre-warm has not finished, so the event loop never waits"""
+    return await asyncio.to_thread(get_team)
+
+async def load_agent(name: str):
+    """One agent, built off the event loop like load_team"""
+    return await asyncio.to_thread(get_agent, name)
+
+def team_work(team, prompt: str, job, on_member=None) -> tuple:
+    """Callable and arguments for one traced team analysis in the configured orchestration mode"""
+    trace = RunTrace(job.command, job.id, ORCHESTRATION_MODE)
+    # "parallel" mode fans the data-gathering agents out instead of delegating one at a time
+    if ORCHESTRATION_MODE == "parallel":
+        return (run_parallel_analysis, prompt, on_member, trace)
+    return (run_team_streaming, team, prompt, on_member, trace)
+
+async def run_agent(update: Update, job, runner, prompt: str) -> str:
+    """Run an agent on the worker pool so the event loop stays responsive"""
+    response = await agent_pool.submit(job, run_traced, runner, prompt, RunTrace(job.command, job.id),
+                                       on_queued=queue_notifier(update, job))
+    return extract_content(response)
+
+async def run_team_streamed(update: Update, job, team, prompt: str, progress: TeamProgress) -> str:
+    """Run a team on the worker pool, editing progress as each member finishes"""
+    loop = asyncio.get_running_loop()
+    member_outputs = asyncio.Queue()
+    
+    def on_member(agent_name: str, content):
+        # Called from the worker thread
+        loop.call_soon_threadsafe(member_outputs.put_nowait, (agent_name, content))
+    
+    async def render():
+        while (item := await member_outputs.get()) is not None:
+            await progress.add(*item)
+        await progress.flush()
+    
+    renderer = asyncio.create_task(render())
     try:
-        response = requests.post(f"{CREDITS_API_URL}/consume-credits", json={
-            'telegramUserId': user_id,
-            'creditsToConsume': credits_to_consume
-        })
-        return response.status_code == 200
-    except:
-        return False
+        return await agent_pool.submit(job, *team_work(team, prompt, job, on_member), on_queued=queue_notifier(update, job))
+    finally:
+        member_outputs.put_nowait(None)
+        await renderer
+
+def cache_note(lookup) -> str:
+    """Footer telling the user their result came from a recent run"""
+    if lookup.source == "run":
+        return ""
+    return f"\n\n⚡ _Recent analysis ({int(lookup.age // 60)} min old)_"
+
+BUSY_MESSAGE = "⏳ You already have an analysis running. Please wait for it to finish (/status, /cancel)."
+CANCELLED_MESSAGE = "🚫 Analysis cancelled."
 
 def get_payment_keyboard(user_id: str):
     """Create payment options keyboard"""
@@ -130,132 +218,154 @@ def get_payment_keyboard(user_id: str):
     return InlineKeyboardMarkup(keyboard)
 
 async def analyze_token(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    with credits_client.track('analyze'):
+        await _analyze_token(update, context)
+
+async def _analyze_token(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    started_at = time.perf_counter()
     user_id = str(update.effective_user.id)
     credits_required = 1  # Each analysis costs 1 credit
     
-    # Check if user has enough credits
-    user_credits = await check_user_credits(user_id)
+    if not context.args:
+        await update.message.reply_text("Please provide a token address: `/analyze <token_address>`")
+        return
+    
+    token_address = context.args[0]
+    if not valid_address(token_address):
+        await update.message.reply_text("❌ That doesn't look like a token address. Usage: `/analyze <token_address>`")
+        return
     
-    if user_credits < credits_required:
+    # One run per user at a time; check before charging
+    if agent_pool.user_busy(user_id):
+        await update.message.reply_text(BUSY_MESSAGE)
+        return
+    
+    # Reserve credits: one round trip that checks and deducts the balance together
+    reservation = await credit_ledger.reserve(user_id, credits_required)
+    if not reservation.accepted:
+        if reservation.reason == "unavailable":
+            await update.message.reply_text("❌ Failed to process payment. Please try again.")
+            return
         await update.message.reply_text(
             f"❌ Insufficient credits!\n\n"
-            f"💰 Your balance: {user_credits} credits\n"
+            f"💰 Your balance: {reservation.balance} credits\n"
             f"💡 Required: {credits_required} credit\n\n"
             f"Purchase credits to unlock FinRizz premium analysis:",
             reply_markup=get_payment_keyboard(user_id)
         )
         return
     
-    if not context.args:
-        await update.message.reply_text("Please provide a token address: `/analyze <token_address>`")
-        return
-    
-    token_address = context.args[0]
-    
-    # Consume credits first
-    if not await consume_user_credits(user_id, credits_required):
-        await update.message.reply_text("❌ Failed to process payment. Please try again.")
-        return
+    # Only a paid, admitted run prefetches: fetch the on-chain and price data the team will ask for
+    # while the job queues and the first model turns run
+    prefetch = prefetcher.start(token_address) if analysis_cache.get('analyze', token_address) is None else None
     
     # Update user about credit deduction
-    remaining_credits = user_credits - credits_required
-    await update.message.reply_text(f"✅ Analysis started! (-{credits_required} credit, {remaining_credits} remaining)")
-    
-    await update.message.reply_text(f"🔍 Analyzing token: {token_address}\n⏳ This may take up to 60 seconds...")
+    await update.message.reply_text(f"✅ Analysis started! (-{credits_required} credit, {reservation.balance} remaining)")
+    
+    status = await update.message.reply_text(f"🔍 Analyzing token: {token_address}\n⏳ This may take up to 60 seconds...")
+    progress = TeamProgress(status, 'analyze', started_at, f"🔍 Analyzing token: {token_address}")
+    
+    # Queue priority follows the balance the user held before this charge
+    job = agent_pool.new_job(
+        user_id, 'analyze', [token_address],
+        chat_id=update.effective_chat.id,
+        tier=credit_tier(reservation.balance + credits_required),
+        # Deferred consumptions are dropped if the bot dies before the batch flush; nothing to refund then
+        credits=0 if reservation.deferred else credits_required,
+        consumption_id=reservation.consumption_id,
+    )
     
     try:
-        # Use synchronous run instead of arun to avoid async pooling issues
-        response = finrizz_team.run(
-            f"Perform comprehensive analysis on token address: {token_address}. Include discovery research, whale tracking, live market data, and investment recommendation."
-        )
-        # Extract content from RunOutput object
-        if hasattr(response, 'content'):
-            raw_response = response.content
-        elif hasattr(response, 'text'):
-            raw_response = response.text
-        elif hasattr(response, 'response'):
-            raw_response = response.response
-        else:
-            raw_response = str(response)
+        # Synchronous run (avoids async pooling issues) on the worker pool, off the event loop
+        # Identical requests within the cache TTL reuse (or join) one team run
+        team = await load_team()
+        lookup = await analysis_cache.get_or_run('analyze', token_address, lambda: run_team_streamed(
+            update, job, team, PROMPTS['analyze'].format(token_address), progress
+        ), waiting=lambda: agent_pool.sharing(job))
+        await credit_ledger.commit(reservation)
         
         # Format the response using refactor layer
-        formatted_response = format_token_analysis(raw_response, token_address)
+        formatted_response = format_token_analysis(lookup.result, token_address) + cache_note(lookup)
         await update.message.reply_text(formatted_response, parse_mode='Markdown')
+        if progress.first_content_at is None:
+            record_first_content('analyze', time.perf_counter() - started_at)
+        if prefetch is not None and lookup.source == "run":
+            print(f"⚡ Prefetch saved {prefetch.saved:.2f}s of tool wait: {prefetch.report()}")
         
+    except UserBusyError:
+        await credit_ledger.refund(reservation)
+        await update.message.reply_text(BUSY_MESSAGE)
+    except JobCancelledError:
+        await credit_ledger.refund(reservation)
+        await update.message.reply_text(f"{CANCELLED_MESSAGE}\n💰 Your {credits_required} credit has been refunded.")
     except Exception as e:
-        await update.message.reply_text(f"❌ Analysis failed: {str(e)}")
+        if await credit_ledger.refund(reservation):
+            await update.message.reply_text(f"❌ Analysis failed: {str(e)}\n💰 Your {credits_required} credit has been refunded.")
+        else:
+            await update.message.reply_text(f"❌ Analysis failed: {str(e)}")
 
 async def discover_tokens(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    started_at = time.perf_counter()
     await update.message.reply_text("🔍 Discovering newly funded tokens...\n⏳ Scanning funding platforms...")
     
+    user_id = str(update.effective_user.id)
+    job = agent_pool.new_job(user_id, 'discover', chat_id=update.effective_chat.id,
+                             tier=credit_tier(credits_client.cached_balance(user_id)))
+    
     try:
-        # Use synchronous run instead of arun to avoid async pooling issues
-        response = discovery_agent.run(
-            "Discover and analyze the top 5 most promising newly funded utility tokens from the past 30 days. Focus on projects with strong utility, reasonable valuations, and favorable vesting schedules."
-        )
-        # Extract content from RunOutput object
-        if hasattr(response, 'content'):
-            raw_response = response.content
-        elif hasattr(response, 'text'):
-            raw_response = response.text
-        elif hasattr(response, 'response'):
-            raw_response = response.response
-        else:
-            raw_response = str(response)
+        # Synchronous run (avoids async pooling issues) on the worker pool, off the event loop
+        raw_response = await run_agent(update, job, await load_agent(DISCOVERY_AGENT), PROMPTS['discover'])
         
         # Format the response using refactor layer
         formatted_response = format_analysis_summary(raw_response)
         await update.message.reply_text(formatted_response, parse_mode='Markdown')
+        record_first_content('discover', time.perf_counter() - started_at)
         
+    except UserBusyError:
+        await update.message.reply_text(BUSY_MESSAGE)
+    except JobCancelledError:
+        await update.message.reply_text(CANCELLED_MESSAGE)
     except Exception as e:
         await update.message.reply_text(f"❌ Discovery failed: {str(e)}")
 
 async def og_intel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    started_at = time.perf_counter()
     if not context.args:
         await update.message.reply_text("Please provide a token address: `/og_intel <token_address>`")
         return
     
     token_address = context.args[0]
-    await update.message.reply_text(f"🔍 0G Network Intelligence for: {token_address}")
+    user_id = str(update.effective_user.id)
+    job = agent_pool.new_job(user_id, 'og_intel', [token_address], chat_id=update.effective_chat.id,
+                             tier=credit_tier(credits_client.cached_balance(user_id)))
+    status = await update.message.reply_text(f"🔍 0G Network Intelligence for: {token_address}")
+    progress = TeamProgress(status, 'og_intel', started_at, f"🔍 0G Network Intelligence for: {token_address}")
     
     try:
-        # Use synchronous run instead of arun to avoid async pooling issues
-        response = finrizz_team.run(
-            f"Perform specialized 0G Network analysis on token: {token_address}. Focus on 0G-specific metrics, validator activity, and network-specific whale patterns."
-        )
-        # Extract content from RunOutput object
-        if hasattr(response, 'content'):
-            raw_response = response.content
-        elif hasattr(response, 'text'):
-            raw_response = response.text
-        elif hasattr(response, 'response'):
-            raw_response = response.response
-        else:
-            raw_response = str(response)
+        # Synchronous run (avoids async pooling issues) on the worker pool, off the event loop
+        team = await load_team()
+        lookup = await analysis_cache.get_or_run('og_intel', token_address, lambda: run_team_streamed(
+            update, job, team, PROMPTS['og_intel'].format(token_address), progress
+        ), waiting=lambda: agent_pool.sharing(job))
         
-        # Format as 0G-specific analysis
-        formatted_response = f"🔍 **0G Network Intelligence**\n\n"
-        formatted_response += f"📡 **Token:** `{token_address[:15]}...`\n"
-        formatted_response += f"🌐 **Network:** 0G Testnet/Mainnet\n\n"
-        formatted_response += f"⚡ **0G-Specific Metrics:**\n"
-        formatted_response += f"• Validator Activity: Monitoring ✅\n"
-        formatted_response += f"• Network Health: Analyzing 📊\n"
-        formatted_response += f"• Cross-chain Data: Processing 🔗\n\n"
-        formatted_response += f"🐋 **Whale Patterns:**\n"
-        formatted_response += f"• Large transfers detected\n"
-        formatted_response += f"• 0G-native analysis complete\n\n"
-        formatted_response += f"💡 **Result:** Analysis completed successfully\n"
-        formatted_response += f"📈 Use /analyze for detailed token metrics"
+        formatted_response = format_og_intel(token_address) + cache_note(lookup)
         
         await update.message.reply_text(formatted_response, parse_mode='Markdown')
+        if progress.first_content_at is None:
+            record_first_content('og_intel', time.perf_counter() - started_at)
         
+    except UserBusyError:
+        await update.message.reply_text(BUSY_MESSAGE)
+    except JobCancelledError:
+        await update.message.reply_text(CANCELLED_MESSAGE)
     except Exception as e:
         await update.message.reply_text(f"❌ 0G Intel failed: {str(e)}")
 
 async def credits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show user's credit balance and payment options"""
     user_id = str(update.effective_user.id)
-    credits = await check_user_credits(user_id)
+    with credits_client.track('credits'):
+        credits = await check_user_credits(user_id, fresh=True)
     
     message = f"💰 **Your FinRizz Credits**\n\n"
     message += f"🪙 Balance: {credits} credits\n\n"
@@ -271,6 +381,132 @@ async def credits_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         reply_markup=get_payment_keyboard(user_id)
     )
 
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Report cache effectiveness, time to first content and agent run metrics"""
+    stats = analysis_cache.stats()
+    message = (
+        f"🗄️ Analysis cache\n\n"
+        f"Entries: {stats['entries']}\n"
+        f"Hits: {stats['hits']} (+{stats['shared']} shared in-flight)\n"
+        f"Misses: {stats['misses']}\n"
+        f"Hit rate: {stats['hit_rate']:.0%}\n"
+        f"LLM time saved: {stats['llm_seconds_saved']}s\n"
+    )
+    ttfc = ttfc_stats()
+    if ttfc:
+        message += "\n⏱️ Time to first content\n\n"
+        for command, values in ttfc.items():
+            message += f"/{command}: p50 {values['p50_s']}s, max {values['max_s']}s ({values['count']} runs)\n"
+    tools = tool_cache.stats()
+    message += (
+        f"\n🧰 Tool cache{'' if tools['enabled'] else ' (bypassed)'}\n\n"
+        f"Entries: {tools['entries']} ({tools['mb']} MB, {tools['evictions']} evicted)\n"
+        f"Hit rate: {tools['hit_rate']:.0%}\n"
+        f"Tool time saved: {tools['tool_seconds_saved']}s\n"
+    )
+    runs = agent_metrics.snapshot()
+    if runs['agents']:
+        message += f"\n🤖 Agents ({runs['runs']} runs, {runs['failed_runs']} failed)\n\n"
+        for name, values in runs['agents'].items():
+            message += (f"{MEMBER_LABELS.get(name, name)}: p50 {values['p50_s']}s, TTFT {values['ttft_p50_s']}s, "
+                        f"{values['tokens_per_s']} tok/s, {values['input_tokens']}/{values['output_tokens']} tokens in/out\n")
+    if runs['tools']:
+        message += "\n🔧 Tools\n\n"
+        for name, values in runs['tools'].items():
+            message += f"{name}: {values['calls']} calls, {values['errors']} errors, p50 {values['p50_s']}s, p95 {values['p95_s']}s\n"
+    await update.message.reply_text(message)
+
+async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show the user's queued and running analyses with ETAs"""
+    user_id = str(update.effective_user.id)
+    jobs = agent_pool.user_jobs(user_id)
+    if not jobs:
+        await update.message.reply_text(f"✅ No analyses in progress. ({agent_pool.queued} queued overall)")
+        return
+    message = "📋 Your analyses\n\n"
+    for job in jobs:
+        start, finish = agent_pool.eta(job)
+        target = f" {job.args[0][:12]}..." if job.args else ""
+        if job.state == "running":
+            message += f"⚙️ {job.id} /{job.command}{target} - running, done in {format_eta(finish)}\n"
+        elif job.state == "shared":
+            message += (f"🤝 {job.id} /{job.command}{target} - waiting on another user's run of the same "
+                        f"analysis, done in {format_eta(finish)}\n")
+        else:
+            message += (f"🕒 {job.id} /{job.command}{target} - #{agent_pool.queue_position(job)} in queue, "
+                        f"starts in {format_eta(start)}, done in {format_eta(finish)}\n")
+    message += f"\n{agent_pool.running}/{agent_pool.max_workers} analysts busy, {agent_pool.queued} queued"
+    message += "\nUse /cancel <id> to drop one."
+    await update.message.reply_text(message)
+
+async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Cancel one of the user's analyses (the only one if no id is given)"""
+    user_id = str(update.effective_user.id)
+    jobs = agent_pool.user_jobs(user_id)
+    if context.args:
+        jobs = [job for job in jobs if job.id == context.args[0]]
+    if not jobs:
+        await update.message.reply_text("Nothing to cancel. Use /status to list your analyses.")
+        return
+    if len(jobs) > 1:
+        await update.message.reply_text("You have several analyses in progress: `/cancel <id>` (see /status)")
+        return
+    if jobs[0].state == "shared":
+        await update.message.reply_text("🤝 That analysis is shared with another user's identical run, so it can't be "
+                                        "cancelled; any credit is refunded if the run fails.")
+        return
+    agent_pool.cancel(jobs[0].id)
+
+async def resume_job(app: Application, job):
+    """Rerun a job recovered from the journal and send the result to its chat"""
+    try:
+        if job.command == 'discover':
+            response = await agent_pool.submit(job, run_traced, await load_agent(DISCOVERY_AGENT), PROMPTS['discover'], RunTrace(job.command, job.id))
+            formatted_response = format_analysis_summary(extract_content(response))
+        else:
+            token_address = job.args[0]
+            team = await load_team()
+            lookup = await analysis_cache.get_or_run(job.command, token_address, lambda: agent_pool.submit(
+                job, *team_work(team, PROMPTS[job.command].format(token_address), job)
+            ), waiting=lambda: agent_pool.sharing(job))
+            if job.command == 'analyze':
+                formatted_response = format_token_analysis(lookup.result, token_address) + cache_note(lookup)
+            else:
+                formatted_response = format_og_intel(token_address) + cache_note(lookup)
+        await app.bot.send_message(job.chat_id, formatted_response, parse_mode='Markdown')
+    except Exception as e:
+        refunded = job.credits and await credits_client.refund(job.user_id, job.credits, job.consumption_id)
+        note = f"\n💰 Your {job.credits} credit has been refunded." if refunded else ""
+        if isinstance(e, JobCancelledError):
+            message = f"{CANCELLED_MESSAGE}{note}"
+        else:
+            message = f"❌ Resumed /{job.command} failed: {str(e)}{note}"
+        try:
+            await app.bot.send_message(job.chat_id, message)
+        except Exception as send_error:
+            print(f"⚠️ Could not report resumed job {job.id} to chat {job.chat_id}: {send_error}")
+
+async def post_init(app: Application):
+    """Start building the agents in the background, serve /metrics, then pick up interrupted work"""
+    # Agents are built lazily; pre-warm so the first analysis doesn't pay for it
+    if os.getenv("AGENT_PREWARM", "true").lower() in ("1", "true", "yes"):
+        prewarm()
+    # Agent, tool and Pyth latency metrics for Prometheus (METRICS_PORT, 0 disables)
+    start_metrics_server()
+    await resume_interrupted_jobs(app)
+
+async def resume_interrupted_jobs(app: Application):
+    """Resume analyses that were queued or running when the bot last stopped"""
+    for job in agent_pool.recover():
+        if job.chat_id is None:
+            continue
+        print(f"♻️ Resuming /{job.command} job {job.id} for user {job.user_id}")
+        try:
+            await app.bot.send_message(job.chat_id, f"♻️ The bot restarted - resuming your /{job.command} analysis.")
+        except Exception as e:
+            print(f"⚠️ Could not notify chat {job.chat_id}: {e}")
+        app.create_task(resume_job(app, job))
+
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show help information"""
     help_text = """
@@ -281,6 +517,8 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • `/discover` - Find new funded opportunities (1 credit)  
 • `/og_intel <token_address>` - 0G Network specific analysis (1 credit)
 • `/credits` - Check your credit balance and buy more
+• `/status` - Queue position and ETA of your analyses
+• `/cancel [id]` - Cancel a queued or running analysis
 • `/help` - Show this help message
 
 **Features:**
@@ -303,6 +541,9 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
     
+    # The user is in the purchase flow; don't trust a cached balance afterwards
+    credits_client.invalidate(str(query.from_user.id))
+    
     if query.data == "learn_more":
         learn_more_text = """
 💎 **FinRizz Premium Credits**
@@ -343,8 +584,36 @@ Powered by Thirdweb infrastructure
             reply_markup=get_payment_keyboard(user_id)
         )
 
-def main():
-    app = Application.builder().token(TELEGRAM_TOKEN).build()
+async def shutdown(app: Application):
+    """Flush deferred credit consumptions, then release pooled connections and workers"""
+    await credit_ledger.close()
+    await credits_client.aclose()
+    print(f"🗄️ Analysis cache: {analysis_cache.stats()}")
+    print(f"⏱️ Time to first content: {ttfc_stats()}")
+    print(f"🤖 Agent runs: {agent_metrics.snapshot()}")
+    print(f"🧰 Tool cache: {tool_cache.stats()}")
+    print(f"🗜️ Context compaction: {context_compactor.stats()}")
+    print(f"⚡ Prefetch: {prefetcher.stats()}")
+    if "model_routing" in sys.modules:
+        print(f"🔀 Model routing: {sys.modules['model_routing'].model_router.stats()}")
+    tool_cache.close()
+    agent_pool.shutdown()
+
+def build_application(token: str = TELEGRAM_TOKEN, base_url: str = None, concurrency: int = None) -> Application:
+    """Create the bot application with all handlers registered"""
+    # Process updates concurrently so one long analysis doesn't hold up other users
+    if concurrency is None:
+        concurrency = int(os.getenv("BOT_CONCURRENT_UPDATES", "256"))
+    builder = (
+        Application.builder()
+        .token(token)
+        .concurrent_updates(concurrency)
+        .post_init(post_init)
+        .post_shutdown(shutdown)
+    )
+    if base_url:
+        builder = builder.base_url(base_url)
+    app = builder.build()
     
     # Command handlers
     app.add_handler(CommandHandler('start', help_command))
@@ -353,11 +622,34 @@ def main():
     app.add_handler(CommandHandler('discover', discover_tokens))
     app.add_handler(CommandHandler('og_intel', og_intel))
     app.add_handler(CommandHandler('credits', credits_command))
+    app.add_handler(CommandHandler('stats', stats_command))
+    app.add_handler(CommandHandler('status', status_command))
+    app.add_handler(CommandHandler('cancel', cancel_command))
     
     # Callback query handler for buttons
     app.add_handler(CallbackQueryHandler(button_callback))
     
-    app.run_polling()
+    return app
+
+def main():
+    app = build_application()
+    
+    # Webhook mode: Telegram pushes updates to an embedded HTTP server instead of being polled
+    if os.getenv("BOT_MODE", "polling") == "webhook":
+        webhook_url = os.getenv("WEBHOOK_URL")
+        if not webhook_url:
+            raise SystemExit("❌ WEBHOOK_URL (public https base URL of this bot) is required in webhook mode")
+        url_path = os.getenv("WEBHOOK_PATH", "telegram")
+        app.run_webhook(
+            listen=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"),
+            port=int(os.getenv("WEBHOOK_PORT", "8443")),
+            url_path=url_path,
+            webhook_url=f"{webhook_url.rstrip('/')}/{url_path}",
+            secret_token=os.getenv("WEBHOOK_SECRET"),
+            max_connections=int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40")),
+        )
+    else:
+        app.run_polling()
 
 if __name__ == "__main__":
     main()
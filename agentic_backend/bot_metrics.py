@@ -0,0 +1,89 @@
+"""
+Prometheus /metrics for the bot process.
+
+The bot records agent runs (run_trace), Pyth tool latency (agent_tools) and
+other metric families into pyeth's dependency-free MetricsRegistry, the same
+one pyeth's web_api serves. The bot has no web server of its own, so
+`start_metrics_server()` serves that registry at /metrics from a small
+background HTTP server:
+
+    METRICS_PORT [9464]     METRICS_HOST [127.0.0.1]     (METRICS_PORT=0 disables)
+
+The default host keeps /metrics local to the machine; set METRICS_HOST=0.0.0.0
+to let a remote Prometheus scrape it.
+
+Run this file directly to serve the registry on its own (e.g. to check a
+scrape config).
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# The metrics registry lives in ../pyeth
+PYETH_PATH = os.getenv("PYETH_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pyeth"))
+if PYETH_PATH not in sys.path:
+    sys.path.append(PYETH_PATH)
+
+from metrics import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, MetricsRegistry, generate_latest  # noqa: E402,F401  (pyeth)
+
+# Agent runs take seconds to minutes, far past the HTTP-tuned default buckets
+RUN_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``registry`` at /metrics on a daemon thread; returns the server (port 0 picks a free one)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            data = generate_latest(registry).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE_LATEST)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = _Server((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def start_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the /metrics server unless METRICS_PORT is 0 or empty."""
+    port = int(os.getenv("METRICS_PORT", "9464") or 0)
+    if not port:
+        return None
+    try:
+        server = start_metrics_server(port, os.getenv("METRICS_HOST", "127.0.0.1"))
+    except OSError as e:
+        print(f"⚠️ Could not start the metrics server on port {port}: {e}")
+        return None
+    print(f"📈 Metrics at http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    return server
+
+
+if __name__ == "__main__":
+    import time
+
+    import run_trace  # noqa: F401  (registers the agent run families)
+
+    server = start_metrics_server(int(os.getenv("METRICS_PORT", "9464") or 9464), os.getenv("METRICS_HOST", "127.0.0.1"))
+    print(f"📈 Serving /metrics on port {server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
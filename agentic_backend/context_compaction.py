@@ -0,0 +1,270 @@
+"""
+Token-budgeted compaction of specialist findings.
+
+The specialists' reports reach the financial agent (directly in parallel
+mode, through the team coordinator's delegate tool in team mode) with
+whatever raw tool output the model pasted in: scraped pages, tweet dumps,
+JSON. ContextCompactor passes a report through unchanged while it fits its
+agent's token budget. Past the budget, the report is reduced to structured
+facts:
+
+- JSON in the text is flattened to `path: value` lines
+- every line (long paragraphs are split into sentences) is classified by a
+  KeywordExtractor into tokenomics, holders, prices, sentiment, risk and
+  recommendation; unclassified text is dropped
+- report lines with figures rank first, then JSON values, then the rest
+  (by position within each tier)
+- facts are taken by rank until the budget is spent and printed grouped by
+  category, in their original order
+
+Tokens are estimated at four characters per token, which is close enough
+for budgeting and needs no tokenizer.
+
+CONTEXT_TOKEN_BUDGET sets the default budget per report (0 keeps reports
+verbatim); agents.py sets per-agent overrides.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from report_extraction import KeywordExtractor
+
+FACT_KEYWORDS: Dict[str, List[str]] = {
+    "tokenomics": ["supply", "market cap", "fdv", "valuation", "vesting", "unlock", "allocation", "emission",
+                   "inflation", "raised", "funding", "seed round", "series a", "investor", "backed by", "tge",
+                   "circulating", "burn", "treasury", "tokenomics"],
+    "holders": ["holder", "whale", "wallet", "top 10", "top-10", "top10", "concentration", "hhi", "gini",
+                "transfer", "accumulat", "distribut"],
+    "prices": ["price", "usd", "volume", "liquidity", "rsi", "macd", "support", "resistance", "24h", "7d", "tvl"],
+    "sentiment": ["sentiment", "bullish", "bearish", "neutral", "bot account", "bots", "tweet", "mentions",
+                  "community"],
+    "risk": ["risk", "rug", "scam", "exploit", "audit", "manipulat", "red flag", "warning"],
+    "recommendation": ["recommend", "buy", "sell", "hold", "verdict", "thesis", "outlook", "confidence"],
+}
+CATEGORY_TITLES = {category: category.capitalize() for category in FACT_KEYWORDS}
+# A line mentioning several categories is filed under the most specific one
+CATEGORY_PRIORITY = ["holders", "sentiment", "prices", "tokenomics", "risk", "recommendation"]
+
+MAX_FACT_CHARS = 240
+MAX_JSON_LEAVES = 40  # per JSON value
+MAX_ARRAY_ITEMS = 5  # long arrays are mostly raw rows; the rest is counted
+_FIGURE = re.compile(r"\d")
+_SENTENCE = re.compile(r"(?<=[.!?;])\s+")
+_MARKUP = "#>*-•|` \t"
+_JSON_START = re.compile(r"^\s*(?:```(?:json)?\s*)?([\[{])", re.M)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+@dataclass
+class Compaction:
+    """A report after compaction (``text`` is the original when it fit the budget)."""
+    agent: str
+    text: str
+    tokens_before: int
+    tokens_after: int
+    facts: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        return self.tokens_after < self.tokens_before
+
+
+class ContextCompactor:
+    """
+    Per-agent token budgets for findings handed to the synthesizing agent.
+
+    Args:
+        default_budget: Token budget for agents without an override (0: no compaction)
+        budgets: Agent name -> token budget (0 keeps that agent's reports verbatim)
+        extractor: Line classifier (defaults to FACT_KEYWORDS)
+    """
+
+    def __init__(self, default_budget: int = 600, budgets: Optional[Dict[str, int]] = None,
+                 extractor: Optional[KeywordExtractor] = None):
+        self.default_budget = default_budget
+        self.budgets: Dict[str, int] = dict(budgets or {})
+        self.extractor = extractor or KeywordExtractor(FACT_KEYWORDS)
+        self._categories = list(FACT_KEYWORDS)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"reports": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0})
+
+    def budget_for(self, agent: str) -> int:
+        """Budget for an agent, by name or team member id (the name's slug)."""
+        if agent in self.budgets:
+            return self.budgets[agent]
+        slug = _slug(agent)
+        for name, budget in self.budgets.items():
+            if _slug(name) == slug:
+                return budget
+        return self.default_budget
+
+    # --- Fact extraction ---
+
+    def _json_facts(self, text: str) -> Tuple[List[str], str]:
+        """Flatten JSON values found at line starts; return the facts and the text without them."""
+        decoder = json.JSONDecoder()
+        facts, kept, position = [], [], 0
+        for match in _JSON_START.finditer(text):
+            start = match.start(1)
+            if start < position:
+                continue
+            try:
+                value, end = decoder.raw_decode(text, start)
+            except ValueError:
+                continue
+            kept.append(text[position:match.start()])
+            facts.extend(line for _, line in zip(range(MAX_JSON_LEAVES), _flatten(value)))
+            position = end
+        kept.append(text[position:])
+        return facts, "".join(kept)
+
+    def _candidates(self, text: str) -> Tuple[List[str], int]:
+        """Fact candidates and how many of them (at the start) came from JSON."""
+        facts, text = self._json_facts(text)
+        from_json = len(facts)
+        for line in text.splitlines():
+            line = line.strip().strip(_MARKUP).replace("**", "").replace("`", "").strip()
+            if not line or line.startswith("```") or set(line) <= set("-=|_:. "):
+                continue
+            if "|" in line:  # table row
+                line = " | ".join(cell.strip() for cell in line.split("|") if cell.strip())
+            facts.extend(_SENTENCE.split(line) if len(line) > MAX_FACT_CHARS else [line])
+        return facts, from_json
+
+    def extract(self, text: str) -> List[Tuple[str, str, int]]:
+        """
+        (category, fact, rank) for every classified fact in ``text``, deduplicated,
+        in order. Rank 0: report line with figures, 1: JSON value, 2: other line.
+        """
+        facts, from_json = self._candidates(text)
+        report = self.extractor.classify("\n".join(fact.replace("\n", " ") for fact in facts))
+        extracted, seen = [], set()
+        for index, mask in enumerate(report.masks):
+            if not mask:
+                continue
+            fact = report.lines[index].strip()
+            key = fact.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            if len(fact) > MAX_FACT_CHARS:
+                fact = fact[:MAX_FACT_CHARS - 1].rstrip() + "…"
+            category = next(c for c in CATEGORY_PRIORITY if report.has(index, c))
+            rank = 1 if index < from_json else (0 if _FIGURE.search(fact) else 2)
+            extracted.append((category, fact, rank))
+        return extracted
+
+    # --- Compaction ---
+
+    def compact(self, agent: str, text: str) -> Compaction:
+        """Fit one agent's report into its budget."""
+        text = str(text or "")
+        before = estimate_tokens(text)
+        budget = self.budget_for(agent)
+        if budget <= 0 or before <= budget:
+            result = Compaction(agent, text, before, before)
+        else:
+            result = self._compact(agent, text, before, budget)
+        with self._lock:
+            stats = self._stats[agent]
+            stats["reports"] += 1
+            stats["compacted"] += result.compacted
+            stats["tokens_before"] += result.tokens_before
+            stats["tokens_after"] += result.tokens_after
+        return result
+
+    def _compact(self, agent: str, text: str, before: int, budget: int) -> Compaction:
+        facts = self.extract(text)
+        header = f"[Compacted from ~{before:,} tokens: key facts only, raw tool output dropped]"
+        spent = estimate_tokens(header) + 1
+        ranked = sorted(range(len(facts)), key=lambda i: (facts[i][2], i))
+        chosen, titled = set(), set()
+        for index in ranked:
+            category, fact, _ = facts[index]
+            cost = estimate_tokens(f"- {fact}\n") + (0 if category in titled else estimate_tokens(category) + 2)
+            if spent + cost > budget:
+                continue
+            spent += cost
+            chosen.add(index)
+            titled.add(category)
+
+        lines = [header]
+        for category in self._categories:
+            picked = [fact for index, (c, fact, _) in enumerate(facts) if c == category and index in chosen]
+            if picked:
+                lines.append(f"{CATEGORY_TITLES[category]}:")
+                lines.extend(f"- {fact}" for fact in picked)
+        compacted = "\n".join(lines)
+        return Compaction(agent, compacted, before, estimate_tokens(compacted), facts=len(chosen))
+
+    # --- Team integration ---
+
+    def hook(self, function_name: str, function_call, arguments: Dict):
+        """
+        agno team tool hook: compact what a member hands back to the coordinator.
+
+        Delegation results are generators of member events plus text. Member
+        content deltas (which only feed the coordinator's tool result) are
+        held back and replaced by the compacted report; every other event
+        (RunCompleted with the member's full output, tool and metrics events)
+        passes through.
+        """
+        result = function_call(**arguments)
+        if function_name != "delegate_task_to_member":
+            return result
+        member = arguments.get("member_id", "")
+        if isinstance(result, str):
+            return self.compact(member, result).text
+        if hasattr(result, "__aiter__"):
+            return result
+        return self._compact_delegation(result, member)
+
+    def _compact_delegation(self, items, member: str) -> Iterator:
+        raw = []
+        for item in items:
+            kind = getattr(item, "event", None)
+            if isinstance(item, str):
+                raw.append(item)
+                continue
+            if kind == "RunContent" and isinstance(item.content, str):
+                member = getattr(item, "agent_name", None) or member
+                raw.append(item.content)
+                continue
+            yield item
+        if raw:
+            yield self.compact(member, "".join(raw)).text
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-agent reports, reports compacted, and estimated tokens before/after."""
+        with self._lock:
+            return {agent: dict(values) for agent, values in self._stats.items()}
+
+
+def _flatten(value, path: str = "") -> Iterator[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{path}.{key}" if path else str(key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value[:MAX_ARRAY_ITEMS]):
+            yield from _flatten(item, f"{path}[{index}]")
+        if len(value) > MAX_ARRAY_ITEMS:
+            yield f"{path or 'value'}: {len(value)} items, first {MAX_ARRAY_ITEMS} shown"
+    elif value is not None and value != "":
+        yield f"{path or 'value'}: {value}"
+
+
+context_compactor = ContextCompactor(default_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "600")))
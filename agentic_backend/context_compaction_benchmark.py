@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: specialist findings handed to synthesis, raw vs compacted.
+
+Points the agents at a local ModelStandIn whose specialist reports carry
+--raw-words of raw tool output (scraped text, tweets, a JSON holder dump)
+and whose latency grows with the prompt (--prefill-tps prompt tokens per
+second). Runs one /analyze prompt through both orchestration modes with
+compaction off (budgets 0) and on (--budget tokens per specialist), and
+reports:
+
+- synthesis prompt tokens: the financial agent's input (parallel) or the
+  coordinator's input across its turns (team), as the model reported it
+- total prompt tokens of the run
+- end-to-end wall time
+
+    python context_compaction_benchmark.py --raw-words 3000 --budget 600 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+
+from model_stand_in import ModelStandIn
+
+PROMPT = ("Perform comprehensive analysis on token address: 0xabc. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context compaction benchmark")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--prefill-tps", type=float, default=5000.0, help="Prompt tokens per second")
+    parser.add_argument("--raw-words", type=int, default=3000, help="Raw tool output per specialist report")
+    parser.add_argument("--budget", type=int, default=600, help="Token budget per specialist when on")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with ModelStandIn(latency=args.latency_ms / 1000, raw_words=args.raw_words,
+                      prompt_tokens_per_second=args.prefill_tps) as model:
+        os.environ["NEBIUS_BASE_URL"] = model.url
+        os.environ["AGENT_TRACE_PATH"] = os.path.join(tempfile.mkdtemp(), "agent_traces.jsonl")
+        os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+        os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+        import agents
+        from context_compaction import context_compactor
+        from run_trace import RunTrace
+        from team_stream import run_team_streaming
+
+        team = agents.get_team()
+        for agent in team.members:
+            agent.debug_mode = False
+        for name in ("agno", "agno-team", "agno-workflow"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        model.raw_markers = [agents.get_agent(name).description for name in agents.SPECIALISTS]
+
+        def set_budget(budget: int):
+            for name in agents.SPECIALISTS:
+                context_compactor.budgets[name] = budget
+
+        def run(mode: str):
+            trace = RunTrace("analyze", mode=mode)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                if mode == "team":
+                    run_team_streaming(team, PROMPT, trace=trace)
+                else:
+                    agents.run_parallel_analysis(PROMPT, trace=trace)
+            record = trace.to_dict()
+            synthesis = [span for span in record["agents"]
+                         if (span["team"] if mode == "team" else span["agent"] == agents.FINANCIAL_AGENT)]
+            return sum(span["input_tokens"] for span in synthesis), record["input_tokens"], record["duration_s"]
+
+        print(f"🗜️ Model stand-in: {args.latency_ms:.0f}ms + prompt/{args.prefill_tps:.0f} tok/s per completion, "
+              f"{args.raw_words} raw words per specialist report, {args.runs} runs")
+        print("=" * 72)
+        print(f"{'mode':<10}{'compaction':<14}{'synthesis prompt':>18}{'run prompt':>12}{'wall s':>9}")
+        print("-" * 72)
+        results = {}
+        for mode in ("team", "parallel"):
+            for label, budget in (("off", 0), (f"{args.budget} tok", args.budget)):
+                set_budget(budget)
+                samples = [run(mode) for _ in range(args.runs)]
+                synthesis, total, wall = (sum(values) / len(values) for values in zip(*samples))
+                results[mode, budget] = (synthesis, total, wall)
+                print(f"{mode:<10}{label:<14}{synthesis:>18,.0f}{total:>12,.0f}{wall:>9.2f}")
+        print("-" * 72)
+        for mode in ("team", "parallel"):
+            (before, _, slow), (after, _, fast) = results[mode, 0], results[mode, args.budget]
+            print(f"⚡ {mode}: synthesis prompt {before / max(after, 1):.1f}x smaller, {slow - fast:.2f}s faster")
+        print(f"📊 {context_compactor.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Reserve -> commit/refund credit flow for bot commands.
+
+A command reserves its credits once, up front, and then either commits
+(the analysis ran) or refunds (it failed). A reservation costs at most one
+credits API round trip:
+
+- normally it is a `/consume-credits` call, which both checks and deducts
+  the balance atomically on the server
+- under high volume (CREDIT_BATCH_THRESHOLD reservations per second), users
+  whose cached balance covers the amount plus CREDIT_DEFER_HEADROOM credits
+  are reserved locally and their consumptions are coalesced per user and
+  flushed to `/consume-credits/batch` every CREDIT_FLUSH_INTERVAL seconds;
+  users closer to empty always go through `/consume-credits`
+
+Refunding a reservation that has not been flushed yet is free; otherwise it
+calls `/refund-credits` for the consumption the reservation was charged in.
+A reservation refunded while its batch is in flight is settled after the
+flush: refunded on the server if the batch consumed it, dropped if not. A
+deferred consumption the server rejects was never charged, so it cannot be
+refunded.
+
+Deferring trusts a cached balance up to CREDITS_CACHE_TTL seconds old, so a
+user who spends more than the headroom elsewhere inside that window (e.g. on
+another bot instance) can get a deferred command run for free: the flush is
+rejected after the analysis already ran. Those runs are counted in
+`rejected_after_flush` and finrizz_credit_rejected_after_flush_total.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from bot_metrics import Counter
+from credits_client import CreditsClient, credits_client
+
+REJECTED_AFTER_FLUSH = Counter("finrizz_credit_rejected_after_flush_total",
+                               "Deferred reservations the batch flush rejected (the command ran uncharged)")
+
+
+@dataclass(eq=False)
+class Reservation:
+    """Credits held for one command."""
+    user_id: str
+    amount: int
+    accepted: bool
+    balance: int  # remaining after reserving, or the current balance if refused
+    reason: str = ""  # why a reservation was refused: insufficient | unavailable
+    deferred: bool = False  # consumption is waiting for the next batch flush
+    state: str = "reserved"  # reserved | committed | refunded | rejected (deferred, never charged)
+    consumption_id: str = ""  # the server consumption that charged it
+
+
+class CreditLedger:
+    """
+    Reservation front-end over CreditsClient with batched consumption.
+
+    Args:
+        client: Credits API client
+        flush_interval: Seconds between batch flushes
+        batch_threshold: Reservations per second above which batching kicks in
+        max_batch: Pending reservations that trigger an early flush
+        defer_headroom: Credits a cached balance must have left after a
+            reservation for it to be deferred
+    """
+
+    def __init__(self, client: CreditsClient, flush_interval: float = 2.0,
+                 batch_threshold: float = 5.0, max_batch: int = 100, defer_headroom: int = 5):
+        self.client = client
+        self.flush_interval = flush_interval
+        self.batch_threshold = batch_threshold
+        self.max_batch = max_batch
+        self.defer_headroom = defer_headroom
+        self._pending: List[Reservation] = []
+        self._flushing: List[Reservation] = []  # the batch awaiting consume_batch
+        self._recent = deque()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.flushes = 0
+        self.rejected_after_flush = 0
+
+    def _high_volume(self, now: float) -> bool:
+        self._recent.append(now)
+        while self._recent and now - self._recent[0] > 1.0:
+            self._recent.popleft()
+        return len(self._recent) >= self.batch_threshold
+
+    async def reserve(self, user_id: str, amount: int) -> Reservation:
+        """Hold ``amount`` credits for a command (at most one round trip)."""
+        cached = self.client.cached_balance(user_id)
+        high_volume = self._high_volume(time.monotonic())
+        if high_volume and cached is not None and cached - amount >= self.defer_headroom:
+            self.client.adjust_cached(user_id, -amount)
+            reservation = Reservation(user_id, amount, True, cached - amount, deferred=True)
+            self._pending.append(reservation)
+            self._ensure_flusher()
+            if len(self._pending) >= self.max_batch:
+                asyncio.get_running_loop().create_task(self.flush())
+            return reservation
+
+        consumed = await self.client.consume(user_id, amount)
+        if consumed is None:
+            balance = self.client.cached_balance(user_id)
+            if balance is None:
+                return Reservation(user_id, amount, False, 0, reason="unavailable")
+            return Reservation(user_id, amount, False, balance, reason="insufficient")
+        return Reservation(user_id, amount, True, consumed.remaining, consumption_id=consumed.consumption_id)
+
+    async def commit(self, reservation: Reservation):
+        """The command completed; keep the credits."""
+        if reservation.state == "reserved":
+            reservation.state = "committed"
+
+    async def refund(self, reservation: Reservation) -> bool:
+        """The command failed; give the credits back."""
+        if not reservation.accepted or reservation.state != "reserved":
+            return False
+        reservation.state = "refunded"
+        if reservation in self._pending:
+            self._pending.remove(reservation)
+            self.client.adjust_cached(reservation.user_id, reservation.amount)
+            return True
+        if reservation in self._flushing:
+            # Its batch is in flight; flush() refunds it on the server if the batch consumed it
+            self.client.adjust_cached(reservation.user_id, reservation.amount)
+            return True
+        return await self.client.refund(reservation.user_id, reservation.amount, reservation.consumption_id)
+
+    # --- Batching ---
+
+    def _ensure_flusher(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Send every pending consumption in one batch request."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            totals: Dict[str, int] = {}
+            for reservation in batch:
+                totals[reservation.user_id] = totals.get(reservation.user_id, 0) + reservation.amount
+
+            self._flushing = batch
+            try:
+                results = await self.client.consume_batch(totals)
+            finally:
+                self._flushing = []
+            self.flushes += 1
+            if results is None:
+                # Nothing was consumed; keep the reservations for the next flush, less any refunded meanwhile
+                self._pending = [r for r in batch if r.state != "refunded"] + self._pending
+                return
+            for reservation in batch:
+                reservation.deferred = False
+                consumed = results.get(reservation.user_id)
+                if consumed is None:
+                    if reservation.state == "refunded":
+                        continue  # refunded in flight and never charged: nothing to give back
+                    # The server refused (balance changed elsewhere); the command already ran, uncharged
+                    reservation.state = "rejected"
+                    self.rejected_after_flush += 1
+                    REJECTED_AFTER_FLUSH.inc()
+                    print(f"⚠️ Deferred credit consumption rejected for user {reservation.user_id}")
+                    continue
+                reservation.consumption_id = consumed.consumption_id
+                if reservation.state == "refunded":
+                    # Refunded while the batch was in flight, and the batch charged it
+                    if not await self.client.refund(reservation.user_id, reservation.amount,
+                                                    reservation.consumption_id):
+                        print(f"⚠️ Refund of a flushed consumption failed for user {reservation.user_id}")
+
+    async def close(self):
+        """Flush outstanding consumptions and stop the flusher."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+
+credit_ledger = CreditLedger(
+    credits_client,
+    flush_interval=float(os.getenv("CREDIT_FLUSH_INTERVAL", "2.0")),
+    batch_threshold=float(os.getenv("CREDIT_BATCH_THRESHOLD", "5")),
+    defer_headroom=int(os.getenv("CREDIT_DEFER_HEADROOM", "5")),
+)
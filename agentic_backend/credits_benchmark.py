@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: credits API round trips per /analyze command.
+
+Runs the credit part of /analyze for many users against the credits API
+stand-in and compares:
+
+- legacy: check balance, then consume (the previous bot flow)
+- reserve: CreditLedger.reserve + commit/refund, at low volume (one
+  `/consume-credits` per command) and high volume (deferred, coalesced
+  `/consume-credits/batch` flushes)
+
+A fraction of commands "fail" and are refunded. Final balances are checked
+against the expected ledger so the batching never over- or under-charges.
+
+    python credits_benchmark.py --users 20 --commands 200 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from credit_ledger import CreditLedger
+from credits_client import CreditsClient
+from credits_stand_in import CreditsStandIn
+
+
+async def legacy_command(client: CreditsClient, user_id: str) -> bool:
+    # The previous bot had no balance cache: every command read the balance, then consumed
+    with client.track("analyze"):
+        if await client.get_balance(user_id, fresh=True) < 1:
+            return False
+        return await client.consume(user_id, 1) is not None
+
+
+async def reserve_command(ledger: CreditLedger, user_id: str, fail: bool) -> bool:
+    with ledger.client.track("analyze"):
+        reservation = await ledger.reserve(user_id, 1)
+        if not reservation.accepted:
+            return False
+        if fail:
+            await ledger.refund(reservation)
+            return False
+        await ledger.commit(reservation)
+        return True
+
+
+async def run_mode(mode: str, args) -> dict:
+    rng = random.Random(args.seed)
+    users = [f"user-{i}" for i in range(args.users)]
+    plan = [(rng.choice(users), rng.random() < args.failure_rate) for _ in range(args.commands)]
+    start_balance = args.commands  # enough that nobody runs dry
+
+    with CreditsStandIn({u: start_balance for u in users}, latency=args.latency_ms / 1000) as stand_in:
+        client = CreditsClient(stand_in.url, cache_ttl=30.0, api_secret=stand_in.api_secret)
+        threshold = 1e9 if mode == "reserve-low" else 1.0
+        ledger = CreditLedger(client, flush_interval=args.flush_interval, batch_threshold=threshold)
+
+        # Warm the balance cache the way /credits would
+        await asyncio.gather(*(client.get_balance(u) for u in users))
+        client.round_trips.clear()
+
+        charged = {u: 0 for u in users}
+        start = time.perf_counter()
+
+        async def command(user_id: str, fail: bool):
+            if mode == "legacy":
+                ok = await legacy_command(client, user_id)
+            else:
+                ok = await reserve_command(ledger, user_id, fail)
+            if ok:
+                charged[user_id] += 1
+
+        await asyncio.gather(*(command(u, fail) for u, fail in plan))
+        elapsed = time.perf_counter() - start
+        await ledger.close()
+        await client.aclose()
+
+        mismatched = [u for u in users if stand_in.balances[u] != start_balance - charged[u]]
+        trips = client.command_round_trips["analyze"]
+        return {
+            "wall_s": elapsed,
+            "round_trips": sum(client.round_trips.values()),
+            "per_command": sum(trips) / len(trips),
+            "flushes": ledger.flushes,
+            "balances_ok": not mismatched,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Credits round-trip benchmark")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--flush-interval", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"💰 {args.commands} /analyze commands from {args.users} users, "
+          f"API latency {args.latency_ms:.0f}ms, {args.failure_rate:.0%} refunded")
+    print("=" * 72)
+    print(f"{'mode':<14}{'wall s':>9}{'API calls':>11}{'calls/cmd':>11}{'flushes':>9}{'balances':>12}")
+    print("-" * 72)
+    for mode in ("legacy", "reserve-low", "reserve-high"):
+        r = asyncio.run(run_mode(mode, args))
+        print(f"{mode:<14}{r['wall_s']:>9.2f}{r['round_trips']:>11}{r['per_command']:>11.2f}"
+              f"{r['flushes']:>9}{'ok' if r['balances_ok'] else 'MISMATCH':>12}")
+
+
+if __name__ == "__main__":
+    main()
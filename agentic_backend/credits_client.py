@@ -0,0 +1,252 @@
+"""
+Async client for the FinRizz credits API.
+
+Replaces the blocking `requests` calls in the bot with a pooled
+`httpx.AsyncClient` (keep-alive connections, strict timeouts) and keeps a
+short-lived per-user balance cache:
+
+- balances are served from cache for CREDITS_CACHE_TTL seconds
+- a consume updates the cached balance optimistically and then settles it
+  from the API response (or drops it if the call fails)
+- purchases invalidate the cached balance so the next read is fresh
+
+Consumptions come back with the server's consumption id; a refund names
+the consumption it returns credits from and is sent with BOT_API_SECRET.
+
+Round trips are counted per endpoint and, via `track()`, per command.
+"""
+
+import contextvars
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+_command_round_trips: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "credits_command_round_trips", default=None
+)
+
+
+@dataclass
+class Consumption:
+    """A consumption the server accepted."""
+    remaining: int  # balance left after it
+    consumption_id: str = ""  # what a refund of it names
+
+
+class CreditsClient:
+    """
+    Pooled async credits API client with a per-user balance cache.
+
+    Args:
+        base_url: Credits API base URL (e.g. http://localhost:3001/api)
+        timeout: Total seconds allowed per request
+        cache_ttl: Seconds a cached balance stays valid
+        max_connections: Connection pool size
+        api_secret: Shared secret sent as X-Bot-Secret (required for refunds)
+    """
+
+    def __init__(self, base_url: str, timeout: float = 3.0, cache_ttl: float = 30.0, max_connections: int = 20,
+                 api_secret: Optional[str] = None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_connections = max_connections
+        self.api_secret = api_secret
+        self._client: Optional[httpx.AsyncClient] = None
+        self._balances: Dict[str, Tuple[float, int]] = {}  # user -> (expires_at, credits)
+        self.round_trips: Dict[str, int] = defaultdict(int)
+        self.cache_hits = 0
+        self.command_round_trips: Dict[str, List[int]] = defaultdict(list)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=min(1.0, self.timeout)),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                headers={"X-Bot-Secret": self.api_secret} if self.api_secret else None,
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # --- Round-trip accounting ---
+
+    def _count(self, endpoint: str):
+        self.round_trips[endpoint] += 1
+        counter = _command_round_trips.get()
+        if counter is not None:
+            counter[0] += 1
+
+    @contextmanager
+    def track(self, command: str):
+        """Count credits API round trips made while handling one command."""
+        counter = [0]
+        token = _command_round_trips.set(counter)
+        try:
+            yield counter
+        finally:
+            _command_round_trips.reset(token)
+            self.command_round_trips[command].append(counter[0])
+
+    def stats(self) -> Dict:
+        per_command = {
+            command: round(sum(trips) / len(trips), 2)
+            for command, trips in self.command_round_trips.items() if trips
+        }
+        return {
+            "round_trips": dict(self.round_trips),
+            "cache_hits": self.cache_hits,
+            "avg_round_trips_per_command": per_command,
+        }
+
+    # --- Balance cache ---
+
+    def cached_balance(self, user_id: str) -> Optional[int]:
+        entry = self._balances.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, user_id: str, credits: int):
+        self._balances[user_id] = (time.monotonic() + self.cache_ttl, credits)
+
+    def adjust_cached(self, user_id: str, delta: int):
+        """Apply a local change to a cached balance (no-op if not cached)."""
+        cached = self.cached_balance(user_id)
+        if cached is not None:
+            self._store(user_id, cached + delta)
+
+    def invalidate(self, user_id: str):
+        """Drop the cached balance (call after purchases)."""
+        self._balances.pop(user_id, None)
+
+    # --- API calls ---
+
+    async def get_balance(self, user_id: str, fresh: bool = False) -> int:
+        """User's credit balance (0 if the API is unavailable)."""
+        if not fresh:
+            cached = self.cached_balance(user_id)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+        self._count("credits")
+        try:
+            response = await self.client.get(f"/credits/{user_id}")
+        except httpx.HTTPError:
+            return 0
+        if response.status_code != 200:
+            return 0
+        credits = response.json().get('data', {}).get('credits', 0)
+        self._store(user_id, credits)
+        return credits
+
+    async def consume(self, user_id: str, amount: int) -> Optional[Consumption]:
+        """Consume credits; returns the consumption, or None if refused/failed."""
+        cached = self.cached_balance(user_id)
+        if cached is not None:
+            self._store(user_id, cached - amount)  # optimistic, settled below
+
+        self._count("consume-credits")
+        try:
+            response = await self.client.post("/consume-credits", json={
+                'telegramUserId': user_id,
+                'creditsToConsume': amount
+            })
+        except httpx.HTTPError:
+            self.invalidate(user_id)
+            return None
+
+        body = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+        if response.status_code == 200:
+            data = body.get('data', {})
+            remaining, consumption_id = data.get('remainingCredits'), data.get('consumptionId') or ""
+            if remaining is not None:
+                self._store(user_id, remaining)
+                return Consumption(remaining, consumption_id)
+            self.invalidate(user_id)
+            return Consumption(max(0, cached - amount) if cached is not None else 0, consumption_id)
+
+        if response.status_code == 402 and 'currentCredits' in body:
+            self._store(user_id, body['currentCredits'])
+        else:
+            self.invalidate(user_id)
+        return None
+
+    async def consume_batch(self, consumptions: Dict[str, int]) -> Optional[Dict[str, Optional[Consumption]]]:
+        """
+        Consume credits for several users in one request.
+
+        Returns user -> consumption (None where refused), or None if the
+        request itself failed and nothing was consumed.
+        """
+        self._count("consume-credits/batch")
+        try:
+            response = await self.client.post("/consume-credits/batch", json={
+                'consumptions': [
+                    {'telegramUserId': user_id, 'creditsToConsume': amount}
+                    for user_id, amount in consumptions.items()
+                ]
+            })
+            response.raise_for_status()
+            results = response.json().get('data', {}).get('results', [])
+        except (httpx.HTTPError, ValueError):
+            return None
+
+        consumed: Dict[str, Optional[Consumption]] = {user_id: None for user_id in consumptions}
+        for result in results:
+            user_id = result.get('telegramUserId')
+            if user_id not in consumed:
+                continue
+            if result.get('success'):
+                consumed[user_id] = Consumption(result.get('remainingCredits'), result.get('consumptionId') or "")
+            balance = result.get('remainingCredits', result.get('currentCredits'))
+            if balance is not None:
+                self._store(user_id, balance)
+        return consumed
+
+    async def refund(self, user_id: str, amount: int, consumption_id: str) -> bool:
+        """
+        Return credits of one consumption to a user; the cached balance is
+        updated from the response. False without a consumption id.
+        """
+        if not consumption_id:
+            return False
+        self._count("refund-credits")
+        try:
+            response = await self.client.post("/refund-credits", json={
+                'telegramUserId': user_id,
+                'consumptionId': consumption_id,
+                'creditsToRefund': amount
+            })
+        except httpx.HTTPError:
+            self.invalidate(user_id)
+            return False
+        if response.status_code != 200:
+            self.invalidate(user_id)
+            return False
+        total = response.json().get('data', {}).get('totalCredits')
+        if total is None:
+            self.invalidate(user_id)
+        else:
+            self._store(user_id, total)
+        return True
+
+
+credits_client = CreditsClient(
+    os.getenv("CREDITS_API_URL", "http://localhost:3001/api"),
+    timeout=float(os.getenv("CREDITS_API_TIMEOUT", "3.0")),
+    cache_ttl=float(os.getenv("CREDITS_CACHE_TTL", "30")),
+    api_secret=os.getenv("BOT_API_SECRET"),
+)
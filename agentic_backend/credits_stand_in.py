@@ -0,0 +1,235 @@
+"""
+In-process stand-in for the credits API (backend/credits-api.ts).
+
+Implements the same endpoints over an in-memory balance store so the bot's
+credit flow can be tested and benchmarked without Node or a chain:
+
+    GET  /api/credits/<userId>
+    POST /api/consume-credits
+    POST /api/consume-credits/batch
+    POST /api/refund-credits
+    POST /api/verify-payment
+    GET  /api/health
+
+Consumptions are recorded with an id; consumptions and refunds need the
+X-Bot-Secret header and positive integer amounts, and refunds are capped at
+what their consumption has left, as in the API.
+
+Supports injected latency per request and counts requests by endpoint.
+
+    python credits_stand_in.py --port 3001
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # accept bursts of concurrent connects without SYN retries
+
+
+class CreditsStandIn:
+    """
+    Threaded credits API stand-in.
+
+    Args:
+        balances: Initial user -> credits
+        latency: Seconds added to every request
+        api_secret: Shared secret consumptions and refunds must carry (None: they are refused)
+    """
+
+    def __init__(self, balances: Dict[str, int] = None, latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, api_secret: Optional[str] = "stand-in"):
+        self.balances: Dict[str, int] = dict(balances or {})
+        self.consumptions: Dict[str, dict] = {}  # consumption id -> user, credits, refunded
+        self.latency = latency
+        self.api_secret = api_secret
+        self.host = host
+        self.port = port
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[_Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/api"
+
+    def start(self) -> "CreditsStandIn":
+        self._httpd = _Server((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    # --- Credit operations (mirror credits-api.ts) ---
+
+    def _deduct(self, user_id: str, amount: int) -> bool:
+        if self.balances.get(user_id, 0) < amount:
+            return False
+        self.balances[user_id] = self.balances.get(user_id, 0) - amount
+        return True
+
+    def _record(self, user_id: str, amount: int) -> str:
+        consumption_id = uuid.uuid4().hex
+        self.consumptions[consumption_id] = {"user_id": user_id, "credits": amount, "refunded": 0}
+        return consumption_id
+
+    @staticmethod
+    def _is_amount(value) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+    def _unauthorized(self, secret: Optional[str]):
+        if not self.api_secret:
+            return 503, {"success": False, "error": "BOT_API_SECRET is not configured"}
+        if secret != self.api_secret:
+            return 401, {"success": False, "error": "Unauthorized"}
+        return None
+
+    def route(self, method: str, path: str, body: dict, secret: Optional[str] = None):
+        """Return (status, payload) for a request (``secret``: its X-Bot-Secret header)."""
+        with self._lock:
+            key = f"{method} /api/credits/:id" if path.startswith("/api/credits/") else f"{method} {path}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            if method == "GET" and path.startswith("/api/credits/"):
+                user_id = path.rsplit("/", 1)[1]
+                return 200, {"success": True, "data": {"userId": user_id, "credits": self.balances.get(user_id, 0)}}
+
+            if method == "GET" and path == "/api/health":
+                return 200, {"status": "healthy", "network": "stand-in"}
+
+            if method == "POST" and path in ("/api/consume-credits", "/api/consume-credits/batch",
+                                             "/api/refund-credits"):
+                denied = self._unauthorized(secret)
+                if denied:
+                    return denied
+
+            if method == "POST" and path == "/api/consume-credits":
+                user_id, amount = body.get("telegramUserId"), body.get("creditsToConsume")
+                if not user_id or not amount:
+                    return 400, {"success": False, "error": "Missing required fields"}
+                if not self._is_amount(amount):
+                    return 400, {"success": False, "error": "creditsToConsume must be a positive integer"}
+                if not self._deduct(user_id, amount):
+                    return 402, {"success": False, "error": "Insufficient credits",
+                                 "currentCredits": self.balances.get(user_id, 0)}
+                return 200, {"success": True, "data": {"consumptionId": self._record(user_id, amount),
+                                                       "creditsConsumed": amount,
+                                                       "remainingCredits": self.balances[user_id]}}
+
+            if method == "POST" and path == "/api/consume-credits/batch":
+                consumptions = body.get("consumptions")
+                if not isinstance(consumptions, list):
+                    return 400, {"success": False, "error": "consumptions must be an array"}
+                results = []
+                for item in consumptions:
+                    user_id, amount = item.get("telegramUserId"), item.get("creditsToConsume")
+                    if not user_id or not amount:
+                        results.append({"telegramUserId": user_id, "success": False, "error": "Missing required fields"})
+                    elif not self._is_amount(amount):
+                        results.append({"telegramUserId": user_id, "success": False,
+                                        "error": "creditsToConsume must be a positive integer"})
+                    elif self._deduct(user_id, amount):
+                        results.append({"telegramUserId": user_id, "success": True,
+                                        "consumptionId": self._record(user_id, amount), "creditsConsumed": amount,
+                                        "remainingCredits": self.balances[user_id]})
+                    else:
+                        results.append({"telegramUserId": user_id, "success": False, "error": "Insufficient credits",
+                                        "currentCredits": self.balances.get(user_id, 0)})
+                return 200, {"success": True, "data": {"results": results}}
+
+            if method == "POST" and path == "/api/refund-credits":
+                user_id, amount = body.get("telegramUserId"), body.get("creditsToRefund")
+                consumption_id = body.get("consumptionId")
+                if not user_id or not consumption_id or not self._is_amount(amount):
+                    return 400, {"success": False, "error": "Missing required fields"}
+                consumption = self.consumptions.get(consumption_id)
+                if consumption is None or consumption["user_id"] != user_id:
+                    return 404, {"success": False, "error": "Unknown consumption"}
+                amount = min(amount, consumption["credits"] - consumption["refunded"])
+                if amount <= 0:
+                    return 409, {"success": False, "error": "Consumption already refunded"}
+                consumption["refunded"] += amount
+                self.balances[user_id] = self.balances.get(user_id, 0) + amount
+                return 200, {"success": True, "data": {"creditsRefunded": amount,
+                                                       "totalCredits": self.balances[user_id]}}
+
+            if method == "POST" and path == "/api/verify-payment":
+                user_id, amount = body.get("telegramUserId"), body.get("creditsAmount")
+                if not user_id or not body.get("transactionHash") or not amount:
+                    return 400, {"success": False, "error": "Missing required fields"}
+                self.balances[user_id] = self.balances.get(user_id, 0) + amount
+                return 200, {"success": True, "data": {"creditsAdded": amount,
+                                                       "totalCredits": self.balances[user_id],
+                                                       "transactionHash": body["transactionHash"]}}
+
+            return 404, {"success": False, "error": "Not found"}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+                if server.latency:
+                    time.sleep(server.latency)
+                status, payload = server.route(method, self.path, body, self.headers.get("X-Bot-Secret"))
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Credits API stand-in")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--secret", default=os.getenv("BOT_API_SECRET", "stand-in"), help="Refund secret")
+    args = parser.parse_args()
+
+    stand_in = CreditsStandIn(latency=args.latency_ms / 1000, port=args.port, api_secret=args.secret).start()
+    print(f"💰 Credits API stand-in running at {stand_in.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_in.stop()
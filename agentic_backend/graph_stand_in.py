@@ -0,0 +1,428 @@
+"""
+In-process stand-in for the FinRizz tokenomics-risk subgraph.
+
+Serves a GraphQL endpoint over generated Token, Wallet, WhaleTransfer and
+LiquidityPool entities (graph/finrizz-tokenomics-risk-rust/schema.graphql), so the whale tools can be tested and benchmarked without a
+Graph deployment:
+
+    POST /subgraphs/finrizz   {"query": "{ ... }"}
+
+It understands the subset of GraphQL a Graph node accepts for entity
+queries: aliases, nested selections, `first`/`skip`/`orderBy`/
+`orderDirection`, `where` filters (`field`, `_gt`, `_gte`, `_lt`, `_lte`,
+`_in`, `_not`), `block: {number}` and `_meta`. Entities carry the block they
+appeared at, and `advance()` moves the head. Ids follow graph_out in the
+subgraph's lib.rs: Token and Wallet ids are bare lowercase hex addresses
+(no 0x), one Wallet per holder address; WhaleTransfer ids are
+"<tx hash>-<log index>". Latency is added per request
+and requests (and root fields) are counted.
+
+    python graph_stand_in.py --port 8200 --latency-ms 80
+    SUBGRAPH_URL=http://127.0.0.1:8200/subgraphs/finrizz python bot.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Collection field -> entity type, and singular field -> entity type
+COLLECTIONS = {"tokens": "Token", "wallets": "Wallet", "whaleTransfers": "WhaleTransfer",
+               "liquidityPools": "LiquidityPool", "liquidityLocks": "LiquidityLock"}
+SINGULAR = {"token": "Token", "wallet": "Wallet", "whaleTransfer": "WhaleTransfer",
+            "liquidityPool": "LiquidityPool", "liquidityLock": "LiquidityLock"}
+# Relationship fields -> entity type they reference by id
+RELATIONS = {"token": "Token", "fromWallet": "Wallet", "toWallet": "Wallet", "pool": "LiquidityPool"}
+# Int fields; every other number is a BigInt/BigDecimal and serialized as a string
+INT_FIELDS = {"decimals"}
+
+_TOKEN = re.compile(r'\s*(?:(\.\.\.)|([A-Za-z_][A-Za-z0-9_]*)|(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|("(?:[^"\\]|\\.)*")|([{}()\[\]:,!$]))')
+
+
+class GraphQLSyntaxError(ValueError):
+    pass
+
+
+def _tokenize(document: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    document = re.sub(r"#[^\n]*", "", document)
+    while position < len(document):
+        if document[position:].strip() == "":
+            break
+        match = _TOKEN.match(document, position)
+        if not match:
+            raise GraphQLSyntaxError(f"Unexpected character at {position}")
+        spread, name, number, string, punct = match.groups()
+        if name:
+            tokens.append(("name", name))
+        elif number:
+            tokens.append(("value", float(number) if any(c in number for c in ".eE") else int(number)))
+        elif string:
+            tokens.append(("value", json.loads(string)))
+        elif punct:
+            if punct != ",":
+                tokens.append(("punct", punct))
+        else:
+            raise GraphQLSyntaxError("Fragments are not supported")
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for anonymous queries (no variables or fragments)."""
+
+    def __init__(self, document: str):
+        self.tokens = _tokenize(document)
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value is not None and token[1] != value):
+            raise GraphQLSyntaxError(f"Expected {value or kind}, got {token[1]!r}")
+        self.position += 1
+        return token[1]
+
+    def document(self) -> List[Dict]:
+        if self._peek() == ("name", "query"):
+            self._take()
+            if self._peek()[0] == "name":
+                self._take()
+        selection = self.selection_set()
+        if self.position != len(self.tokens):
+            raise GraphQLSyntaxError("Unexpected tokens after query")
+        return selection
+
+    def selection_set(self) -> List[Dict]:
+        self._take("punct", "{")
+        fields = []
+        while self._peek() != ("punct", "}"):
+            fields.append(self.field())
+        self._take("punct", "}")
+        return fields
+
+    def field(self) -> Dict:
+        name = self._take("name")
+        alias = name
+        if self._peek() == ("punct", ":"):
+            self._take()
+            name = self._take("name")
+        arguments = {}
+        if self._peek() == ("punct", "("):
+            self._take()
+            while self._peek() != ("punct", ")"):
+                key = self._take("name")
+                self._take("punct", ":")
+                arguments[key] = self.value()
+            self._take("punct", ")")
+        selection = self.selection_set() if self._peek() == ("punct", "{") else None
+        return {"alias": alias, "name": name, "arguments": arguments, "selection": selection}
+
+    def value(self) -> Any:
+        kind, token = self._peek()
+        if kind == "value":
+            self._take()
+            return token
+        if kind == "name":
+            self._take()
+            return {"true": True, "false": False, "null": None}.get(token, token)  # enums stay names
+        if token == "{":
+            self._take()
+            result = {}
+            while self._peek() != ("punct", "}"):
+                key = self._take("name")
+                self._take("punct", ":")
+                result[key] = self.value()
+            self._take("punct", "}")
+            return result
+        if token == "[":
+            self._take()
+            items = []
+            while self._peek() != ("punct", "]"):
+                items.append(self.value())
+            self._take("punct", "]")
+            return items
+        raise GraphQLSyntaxError(f"Unexpected {token!r}")
+
+
+def parse(document: str) -> List[Dict]:
+    return _Parser(document).document()
+
+
+def _number(value: Any) -> Any:
+    """Filter literals for BigInt/BigDecimal fields arrive as strings."""
+    if isinstance(value, str):
+        try:
+            return float(value) if any(c in value for c in ".eE") else int(value)
+        except ValueError:
+            return value
+    return value
+
+
+class GraphStandIn:
+    """
+    Threaded GraphQL subgraph stand-in with generated whale data.
+
+    Args:
+        tokens: Number of tokens to generate
+        holders: Wallets per token
+        transfers: Whale transfers per token
+        latency: Seconds added to every request
+        seed: RNG seed for the generated data
+    """
+
+    def __init__(self, tokens: int = 3, holders: int = 2500, transfers: int = 300, latency: float = 0.0,
+                 seed: int = 7, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.head = 1000
+        self.entities: Dict[str, Dict[str, Dict]] = {kind: {} for kind in COLLECTIONS.values()}
+        self._by_token: Dict[Tuple[str, str], List[Dict]] = {}  # (entity type, token id) -> entities
+        self.requests = 0
+        self.root_fields = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._generate(tokens, holders, transfers, random.Random(seed))
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/subgraphs/finrizz"
+
+    @property
+    def token_ids(self) -> List[str]:
+        """Token entity ids (hex without 0x)."""
+        return sorted(self.entities["Token"])
+
+    @property
+    def token_addresses(self) -> List[str]:
+        """The tokens' contract addresses, as users and the agents pass them (0x...)."""
+        return ["0x" + token_id for token_id in self.token_ids]
+
+    def start(self) -> "GraphStandIn":
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    # --- Data ---
+
+    def _address(self, rng: random.Random) -> str:
+        """An address as an entity id: lowercase hex without 0x."""
+        return "".join(rng.choice("0123456789abcdef") for _ in range(40))
+
+    def _add(self, kind: str, entity: Dict):
+        self.entities[kind][entity["id"]] = entity
+        token_id = entity["id"] if kind == "Token" else entity.get("token")
+        self._by_token.setdefault((kind, token_id), []).append(entity)
+
+    def _generate(self, tokens: int, holders: int, transfers: int, rng: random.Random):
+        for index in range(tokens):
+            token_id = self._address(rng)
+            supply = 10 ** 27
+            price = round(rng.uniform(0.01, 5.0), 4)
+            self._add("Token", {
+                "id": token_id, "name": f"Token {index}", "symbol": f"TK{index}", "decimals": 18,
+                "totalSupply": supply, "circulatingSupply": supply, "currentPriceUSD": price,
+                "marketCapUSD": price * supply / 10 ** 18, "vestingCliffDate": None,
+                "vestingDilutionPercent": None, "_block": 0,
+            })
+            # Pareto-distributed balances: a few whales, a long tail
+            weights = [rng.paretovariate(1.1) for _ in range(holders)]
+            total = sum(weights)
+            wallets = []
+            for weight in weights:
+                wallet_id = self._address(rng)
+                balance = int(supply * weight / total)
+                self._add("Wallet", {
+                    "id": wallet_id, "token": token_id, "balance": balance,
+                    "percentageOfSupply": round(100 * balance / supply, 6), "_block": 0,
+                })
+                wallets.append(wallet_id)
+            whales = sorted(wallets, key=lambda w: -self.entities["Wallet"][w]["balance"])[:50]
+            for number in range(transfers):
+                amount = int(supply * rng.uniform(0.0005, 0.01))
+                tx_hash = f"{rng.getrandbits(256):064x}"
+                self._add("WhaleTransfer", {
+                    "id": f"{tx_hash}-{number}", "token": token_id, "fromWallet": rng.choice(whales),
+                    "toWallet": rng.choice(wallets), "amount": amount, "amountUSD": round(amount / 10 ** 18 * price, 2),
+                    "timestamp": 1_700_000_000 + number * 60, "txHash": f"0x{tx_hash}", "_block": 0,
+                })
+            pool_id = self._address(rng)
+            self._add("LiquidityPool", {
+                "id": pool_id, "token": token_id, "lpTokenSupply": 10 ** 21,
+                "totalLiquidityUSD": round(rng.uniform(1e5, 1e7), 2), "isLiquidityLocked": rng.random() < 0.7,
+                "lockedPercentage": round(rng.uniform(0, 100), 2), "_block": 0,
+            })
+
+    def advance(self, blocks: int = 1, transfers: int = 0, seed: int = 0):
+        """Move the head; optionally add whale transfers for every token at the new block."""
+        rng = random.Random(seed or self.head)
+        with self._lock:
+            self.head += blocks
+            for token_id in list(self.entities["Token"]) if transfers else []:
+                wallets = [e["id"] for e in self._by_token[("Wallet", token_id)]]
+                for _ in range(transfers):
+                    tx_hash = f"{rng.getrandbits(256):064x}"
+                    self._add("WhaleTransfer", {
+                        "id": f"{tx_hash}-{self.head}", "token": token_id, "fromWallet": rng.choice(wallets),
+                        "toWallet": rng.choice(wallets), "amount": 10 ** 24, "amountUSD": None,
+                        "timestamp": 1_800_000_000 + self.head, "txHash": f"0x{tx_hash}",
+                        "_block": self.head,
+                    })
+
+    # --- Execution ---
+
+    def _matches(self, entity: Dict, where: Dict) -> bool:
+        for key, expected in where.items():
+            field, _, operator = key.partition("_")
+            actual = entity.get(field)  # relationship fields hold (and are filtered by) the related id
+            if operator in ("", "not"):
+                equal = actual == _number(expected) or actual == expected
+                if equal == (operator == "not"):
+                    return False
+            elif operator == "in":
+                if actual not in [_number(item) for item in expected] and actual not in expected:
+                    return False
+            elif operator in ("gt", "gte", "lt", "lte"):
+                expected = _number(expected)
+                if actual is None:
+                    return False
+                if isinstance(actual, str) != isinstance(expected, str):
+                    return False
+                if operator == "gt" and not actual > expected:
+                    return False
+                if operator == "gte" and not actual >= expected:
+                    return False
+                if operator == "lt" and not actual < expected:
+                    return False
+                if operator == "lte" and not actual <= expected:
+                    return False
+            else:
+                raise GraphQLSyntaxError(f"Unsupported filter {key}")
+        return True
+
+    def _render(self, entity: Dict, selection: List[Dict], block: int) -> Dict:
+        result = {}
+        for field in selection:
+            value = entity.get(field["name"])
+            if field["name"] in RELATIONS and value is not None:
+                target = self.entities[RELATIONS[field["name"]]].get(value)
+                value = self._render(target, field["selection"] or [], block) if target else None
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and field["name"] not in INT_FIELDS:
+                value = str(value)
+            result[field["alias"]] = value
+        return result
+
+    def _collection(self, kind: str, arguments: Dict, selection: List[Dict], block: int) -> List[Dict]:
+        where = arguments.get("where") or {}
+        with self._lock:
+            if isinstance(where.get("token"), str):
+                candidates = list(self._by_token.get((kind, where["token"]), []))
+            else:
+                candidates = list(self.entities[kind].values())
+        rows = [e for e in candidates if e["_block"] <= block and self._matches(e, where)]
+        order_by = arguments.get("orderBy", "id")
+        descending = arguments.get("orderDirection", "asc") == "desc"
+        rows.sort(key=lambda e: (e.get(order_by) is None, e.get(order_by) if e.get(order_by) is not None else 0),
+                  reverse=descending)
+        first, skip = int(arguments.get("first", 100)), int(arguments.get("skip", 0))
+        if first > 1000 or skip > 5000:
+            raise GraphQLSyntaxError("first must be <= 1000 and skip <= 5000")
+        return [self._render(e, selection, block) for e in rows[skip:skip + first]]
+
+    def execute(self, document: str) -> Dict:
+        """Return the GraphQL response ({"data": ...} or {"errors": [...]}) for a query document."""
+        try:
+            fields = parse(document)
+            with self._lock:
+                self.requests += 1
+                self.root_fields += len(fields)
+                head = self.head  # the whole document is answered at one block
+            data = {}
+            for field in fields:
+                block = (field["arguments"].get("block") or {}).get("number", head)
+                if block > head:
+                    raise GraphQLSyntaxError(f"block {block} is not yet indexed (head {head})")
+                if field["name"] == "_meta":
+                    data[field["alias"]] = {"block": {"number": head}}
+                elif field["name"] in COLLECTIONS:
+                    data[field["alias"]] = self._collection(COLLECTIONS[field["name"]], field["arguments"],
+                                                            field["selection"] or [], block)
+                elif field["name"] in SINGULAR:
+                    entity = self.entities[SINGULAR[field["name"]]].get(field["arguments"].get("id"))
+                    visible = entity is not None and entity["_block"] <= block
+                    data[field["alias"]] = self._render(entity, field["selection"] or [], block) if visible else None
+                else:
+                    raise GraphQLSyntaxError(f"Unknown field {field['name']}")
+            return {"data": data}
+        except GraphQLSyntaxError as e:
+            return {"errors": [{"message": str(e)}]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = server.execute(body.get("query", ""))
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Subgraph GraphQL stand-in")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--tokens", type=int, default=3)
+    parser.add_argument("--holders", type=int, default=2500)
+    args = parser.parse_args()
+
+    stand_in = GraphStandIn(tokens=args.tokens, holders=args.holders, latency=args.latency_ms / 1000,
+                            port=args.port).start()
+    print(f"🕸️ Subgraph stand-in running at {stand_in.url} (Ctrl+C to stop)")
+    for address in stand_in.token_addresses:
+        print(f"   token {address}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_in.stop()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: agno debug logging vs structured run traces.
+
+Runs one /analyze team run at a time against a local ModelStandIn (fixed
+latency per completion, streamed tokens) and compares mean wall time with:
+
+- debug on: debug_mode=True, debug_level=2 (the previous default), written
+  to /dev/null (a terminal or log collector costs more)
+- debug off: no logging, no trace
+- traced: debug off, every event recorded in a RunTrace
+
+then prints the per-agent and per-tool breakdown of the last traced run,
+as written to the JSON trace, and scrapes the same numbers from the bot's
+/metrics endpoint.
+
+    python instrumentation_benchmark.py --latency-ms 200 --tokens-per-second 400 --runs 3
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+import urllib.request
+
+from model_stand_in import ModelStandIn
+
+PROMPT = ("Perform comprehensive analysis on token address: 0xabc. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debug logging vs run trace overhead")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    trace_path = os.path.join(tempfile.mkdtemp(), "agent_traces.jsonl")
+    with ModelStandIn(latency=args.latency_ms / 1000, tokens_per_second=args.tokens_per_second) as model, \
+            open(os.devnull, "w") as sink:
+        os.environ["NEBIUS_BASE_URL"] = model.url
+        os.environ["AGENT_TRACE_PATH"] = trace_path
+        os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+        os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+        import agents
+        from run_trace import RunTrace, agent_metrics
+        from team_stream import run_team_streaming
+
+
+        # agno's handlers hold on to the stdout they were created with
+        for name in ("agno", "agno-team", "agno-workflow"):
+            for handler in logging.getLogger(name).handlers:
+                if isinstance(handler, logging.StreamHandler):
+                    handler.setStream(sink)
+
+        def set_debug(enabled: bool):
+            for agent in agents.get_team().members:
+                agent.debug_mode = enabled
+            agents.get_team().debug_mode = enabled
+            if not enabled:
+                for name in ("agno", "agno-team", "agno-workflow"):
+                    logging.getLogger(name).setLevel(logging.CRITICAL)
+
+        def timed(traced: bool) -> float:
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                    run_team_streaming(agents.get_team(), PROMPT,
+                                       trace=RunTrace("analyze", mode="team") if traced else None)
+                samples.append(time.perf_counter() - start)
+            return sum(samples) / len(samples)
+
+        print(f"🧪 Model stand-in at {model.url}, {args.latency_ms:.0f}ms per completion, "
+              f"{args.tokens_per_second:.0f} tok/s, {args.runs} runs per mode")
+        print("=" * 50)
+        print(f"{'mode':<30}{'wall s':>10}{'vs debug':>10}")
+        print("-" * 50)
+        set_debug(True)
+        baseline = timed(False)
+        print(f"{'debug on (level 2)':<30}{baseline:>10.2f}{'':>10}")
+        set_debug(False)
+        for label, traced in (("debug off", False), ("debug off + trace", True)):
+            wall = timed(traced)
+            print(f"{label:<30}{wall:>10.2f}{(wall - baseline) / baseline:>+10.0%}")
+
+        with open(trace_path, "r", encoding="utf-8") as f:
+            trace = json.loads(f.readlines()[-1])
+        print(f"\n🔎 Last trace ({trace['duration_s']:.2f}s, {trace['input_tokens']} tokens in, "
+              f"{trace['output_tokens']} out) from {trace_path}")
+        print("=" * 86)
+        print(f"{'agent':<48}{'wall s':>8}{'TTFT s':>8}{'in':>7}{'out':>6}{'tok/s':>9}")
+        print("-" * 86)
+        for span in trace["agents"]:
+            print(f"{span['agent']:<48}{span['duration_s']:>8.2f}{span['ttft_s'] or 0:>8.3f}"
+                  f"{span['input_tokens']:>7}{span['output_tokens']:>6}{span['tokens_per_s'] or 0:>9.0f}")
+        print("-" * 86)
+        for name, values in agent_metrics.snapshot()["tools"].items():
+            print(f"🔧 {name:<40} {values['calls']:>3} calls  {values['errors']} errors  p50 {values['p50_s'] * 1000:.2f}ms")
+
+        from bot_metrics import start_metrics_server
+
+        server = start_metrics_server(0, "127.0.0.1")
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            samples = [line for line in response.read().decode().splitlines()
+                       if line.startswith(("finrizz_agent_runs_total", "finrizz_agent_tokens_total"))]
+        server.shutdown()
+        print(f"\n📈 /metrics: {len(samples)} agent run and token samples, e.g.")
+        for line in samples[:4]:
+            print(f"   {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ERC-20 market caps through PyEthTools.
+
+Each analysis asks for the market cap of a few tokens. Runs against pyeth's
+JSON-RPC (Erc20StandIn) and Hermes stand-ins with fixed latency:
+
+- per call: decimals(), symbol() and totalSupply() as separate eth_calls
+  for each token, then pyth_oracle.get_prices() per symbol
+- multicall: PyEthTools.get_market_caps on an Erc20MarketReader, one
+  aggregate3 eth_call per analysis (metadata only on first sight) and the
+  shared Pyth provider for prices
+- batch: the same reader on a chain without Multicall3 (one JSON-RPC batch
+  per analysis)
+
+    python market_cap_benchmark.py --analyses 100 --tokens 5 --rpc-ms 40 --hermes-ms 60
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import requests
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ERC-20 market cap benchmark")
+    parser.add_argument("--analyses", type=int, default=100)
+    parser.add_argument("--tokens", type=int, default=5, help="Tokens looked up per analysis")
+    parser.add_argument("--universe", type=int, default=20, help="Distinct tokens across the run")
+    parser.add_argument("--rpc-ms", type=float, default=40.0)
+    parser.add_argument("--hermes-ms", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+    import agent_tools
+    import pyth_oracle
+    from erc20_market import SELECTORS, Erc20MarketReader, decode_string, decode_uint
+    from price_provider import PythPriceProvider
+    from stand_ins import Erc20StandIn, HermesStandIn
+
+    rng = random.Random(args.seed)
+    # Pyth-listed symbols first, then tokens without a feed
+    symbols = [feed.split("/")[0] for feed in sorted(pyth_oracle.PRICE_FEEDS)]
+    symbols += [f"TK{index}" for index in range(max(0, args.universe - len(symbols)))]
+    addresses = [f"0x{index + 1:040x}" for index in range(len(symbols))]
+    plan = [rng.sample(addresses, args.tokens) for _ in range(args.analyses)]
+    # The stand-in's Pyth-listed tokens play the vetted contracts (address -> feed)
+    vetted = {address: f"{symbol}/USD" for address, symbol in zip(addresses, symbols)
+              if f"{symbol}/USD" in pyth_oracle.PRICE_FEEDS}
+    metadata_path = os.path.join(tempfile.mkdtemp(), "token_metadata.json")
+
+    with HermesStandIn(latency=args.hermes_ms / 1000) as hermes, \
+            Erc20StandIn(latency=args.rpc_ms / 1000) as chain, \
+            Erc20StandIn(latency=args.rpc_ms / 1000, multicall=False) as plain_chain:
+        os.environ["HERMES_URL"] = hermes.url
+        for stand_in in (chain, plain_chain):
+            for address, symbol in zip(addresses, symbols):
+                stand_in.add_token(address, symbol, total_supply=rng.randrange(10 ** 24, 10 ** 27),
+                                   decimals=6 if symbol.startswith("USD") else 18)
+
+        def per_call(tokens, session=requests):
+            caps = {}
+            for address in tokens:
+                values = {}
+                for field in ("decimals", "symbol", "totalSupply"):
+                    reply = session.post(chain.url, json={
+                        "jsonrpc": "2.0", "id": 1, "method": "eth_call",
+                        "params": [{"to": address, "data": "0x" + SELECTORS[field]}, "latest"]}).json()
+                    data = bytes.fromhex(reply["result"][2:])
+                    values[field] = decode_string(data) if field == "symbol" else decode_uint(data)
+                feed = vetted.get(address)
+                price = pyth_oracle.get_prices(feed).get(feed) if feed else None
+                supply = values["totalSupply"] / 10 ** values["decimals"]
+                caps[address] = supply * price.price if price else None
+            return caps
+
+        def reader_mode(url):
+            reader = Erc20MarketReader(url, metadata_path=metadata_path if url == chain.url else None,
+                                       price_provider=PythPriceProvider(ttl=5.0),
+                                       price_feeds={chain.chain_id: vetted})
+            if url != chain.url:
+                reader.multicall_address = None
+            tools = agent_tools.PyEthTools(reader=reader)
+            return lambda tokens: json.loads(tools.get_market_caps(tokens))
+
+        modes = [("per call", chain, per_call)]
+        modes += [(label, stand_in, reader_mode(stand_in.url))
+                  for label, stand_in in (("multicall", chain), ("batch", plain_chain))]
+
+        print(f"🪙 {args.analyses} analyses x {args.tokens} tokens ({len(symbols)} distinct, "
+              f"{len(pyth_oracle.PRICE_FEEDS)} with a Pyth feed), RPC {args.rpc_ms:.0f}ms, "
+              f"Hermes {args.hermes_ms:.0f}ms")
+        print("=" * 76)
+        print(f"{'mode':<11}{'wall s':>8}{'RPC reqs':>10}{'sub-calls':>11}{'Hermes':>8}"
+              f"{'first ms':>10}{'p50 ms':>9}{'p95 ms':>9}")
+        print("-" * 76)
+        for label, stand_in, lookup in modes:
+            before_rpc = sum(stand_in.request_counts.values())
+            before_calls = sum(stand_in.contract_calls.values())
+            before_hermes = sum(hermes.request_counts.values())
+            latencies = []
+            start = time.perf_counter()
+            for tokens in plan:
+                began = time.perf_counter()
+                lookup(tokens)
+                latencies.append(time.perf_counter() - began)
+            wall = time.perf_counter() - start
+            print(f"{label:<11}{wall:>8.2f}{sum(stand_in.request_counts.values()) - before_rpc:>10}"
+                  f"{sum(stand_in.contract_calls.values()) - before_calls:>11}"
+                  f"{sum(hermes.request_counts.values()) - before_hermes:>8}"
+                  f"{latencies[0] * 1000:>10.1f}{percentile(latencies, 50) * 1000:>9.1f}"
+                  f"{percentile(latencies, 95) * 1000:>9.1f}")
+
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        cached = json.load(f)
+    print("-" * 76)
+    restarted = Erc20MarketReader("http://unused", metadata_path=metadata_path)
+    print(f"📦 {len(cached)} tokens' metadata persisted to {metadata_path}; "
+          f"a restarted reader starts with {len(restarted._metadata)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Per-agent model routing with latency-SLO fallback.
+
+Each agent has a route: an ordered list of model tiers. Specialists do
+extraction and tool calling, which a small, fast model handles well, so
+they route to the fast tier. The financial agent and the team coordinator
+write the final synthesis, so they route to the large tier:
+
+    MODEL_ROUTES="discovery=fast>large,whale=fast>large,market=fast>large,financial=large>fast,team=large>fast"
+
+Every tier has a latency SLO: time to the first streamed chunk, or to the
+whole response when not streaming. The router keeps a rolling window of
+each tier's latencies. A tier whose p90 is over its SLO is skipped for the
+next tier in the route; one request per probe interval still goes to it,
+and a probe within the SLO clears its record. A call that fails before
+producing output (including a timeout, set to a multiple of the SLO)
+counts as a miss and is retried on the next tier at once.
+
+Tiers are configured from the environment (defaults in brackets):
+
+    FAST_MODEL_ID [openai/gpt-oss-20b]     LARGE_MODEL_ID [openai/gpt-oss-120b]
+    FAST_MODEL_BASE_URL / LARGE_MODEL_BASE_URL [NEBIUS_BASE_URL]
+    FAST_MODEL_API_KEY / LARGE_MODEL_API_KEY [NEBIUS_API_KEY]
+    FAST_MODEL_SLO_MS [4000]               LARGE_MODEL_SLO_MS [30000]
+
+MODEL_ROUTING=off sends every agent to the large tier, as before routing.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from agno.models.openai.like import OpenAILike
+
+DEFAULT_ROUTES = "discovery=fast>large,whale=fast>large,market=fast>large,financial=large>fast,team=large>fast"
+NEBIUS_BASE_URL = "https://api.studio.nebius.com/v1/"
+
+
+def parse_routes(spec: str) -> Dict[str, List[str]]:
+    """Parse "agent=tier>fallback,agent=tier" routes."""
+    routes = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        agent, _, tiers = item.partition("=")
+        routes[agent.strip()] = [tier.strip() for tier in tiers.split(">") if tier.strip()]
+    return routes
+
+
+class ModelTier:
+    """
+    One model endpoint and its latency record.
+
+    Args:
+        name: Tier name used in routes ("fast", "large")
+        model: The agno model serving the tier
+        slo: Latency objective in seconds (0: none, never skipped)
+        window: Latencies kept for the p90
+        min_samples: Latencies needed before the tier can be judged over its SLO
+    """
+
+    def __init__(self, name: str, model, slo: float = 0.0, window: int = 20, min_samples: int = 3):
+        self.name = name
+        self.model = model
+        self.slo = slo
+        self.min_samples = min_samples
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.misses = 0
+        self.failures = 0
+        self.last_probe = 0.0
+
+    def p90(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.9 * (len(ordered) - 1))))]
+
+    def breaching(self) -> bool:
+        if not self.slo or len(self.latencies) < self.min_samples:
+            return False
+        return self.p90() > self.slo
+
+
+class ModelRouter:
+    """
+    Chooses a tier for each model call of an agent.
+
+    Args:
+        tiers: Tier name -> ModelTier
+        routes: Agent route name -> tier names, preferred first
+        probe_interval: Seconds between requests still sent to a tier over its SLO
+
+    Calls served by a tier other than their route's first count as fallbacks.
+    """
+
+    def __init__(self, tiers: Dict[str, ModelTier], routes: Dict[str, List[str]], probe_interval: float = 10.0):
+        self.tiers = tiers
+        self.routes = routes
+        self.probe_interval = probe_interval
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def candidates(self, route: str) -> List[ModelTier]:
+        """Tiers to try for a call, in order: within their SLO (or due a probe) first."""
+        names = [name for name in self.routes.get(route) or ["large"] if name in self.tiers] or [next(iter(self.tiers))]
+        now = time.monotonic()
+        with self._lock:
+            healthy, degraded = [], []
+            for tier in (self.tiers[name] for name in names):
+                if not tier.breaching():
+                    healthy.append(tier)
+                elif now - tier.last_probe >= self.probe_interval:
+                    tier.last_probe = now
+                    healthy.append(tier)
+                else:
+                    degraded.append(tier)
+            # Everything over its SLO: the least bad tier first
+            return healthy + sorted(degraded, key=lambda tier: tier.p90())
+
+    def record(self, route: str, tier: ModelTier, latency: Optional[float]):
+        """Record a call's latency (None: failed before any output)."""
+        with self._lock:
+            tier.requests += 1
+            if latency is None:
+                tier.failures += 1
+                latency = float("inf")
+            elif tier.name != (self.routes.get(route) or ["large"])[0]:
+                self.fallbacks += 1
+            if tier.slo and latency > tier.slo:
+                tier.misses += 1
+            elif tier.breaching():
+                tier.latencies.clear()  # a probe within the SLO: the tier has recovered
+            tier.latencies.append(latency)
+
+    def model(self, route: str) -> "RoutedModel":
+        """The model to give an agent on ``route``."""
+        primary = self.candidates(route)[0]
+        return RoutedModel(id=primary.model.id, name=f"Routed[{route}]", router=self, route=route)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            tiers = {name: {"model": tier.model.id, "requests": tier.requests, "slo_misses": tier.misses,
+                            "failures": tier.failures, "p90_s": round(tier.p90(), 3) if tier.latencies else None,
+                            "breaching": tier.breaching()}
+                     for name, tier in self.tiers.items()}
+            return {"tiers": tiers, "fallbacks": self.fallbacks}
+
+
+@dataclass
+class RoutedModel(OpenAILike):
+    """OpenAI-compatible model that sends each call to its route's current tier."""
+
+    router: Optional[ModelRouter] = None
+    route: str = "large"
+
+    def __deepcopy__(self, memo):
+        memo[id(self.router)] = self.router  # copies (e.g. per team run) share the router's latency record
+        return super().__deepcopy__(memo)
+
+    def _tiers(self) -> List[ModelTier]:
+        return self.router.candidates(self.route)
+
+    def invoke(self, *args, **kwargs):
+        tiers = self._tiers()
+        for index, tier in enumerate(tiers):
+            started = time.perf_counter()
+            try:
+                response = tier.model.invoke(*args, **kwargs)
+            except Exception:
+                self.router.record(self.route, tier, None)
+                if index == len(tiers) - 1:
+                    raise
+                continue
+            self.router.record(self.route, tier, time.perf_counter() - started)
+            return response
+
+    def invoke_stream(self, *args, **kwargs) -> Iterator:
+        tiers = self._tiers()
+        for index, tier in enumerate(tiers):
+            started = time.perf_counter()
+            first = True
+            try:
+                for chunk in tier.model.invoke_stream(*args, **kwargs):
+                    if first:
+                        self.router.record(self.route, tier, time.perf_counter() - started)
+                        first = False
+                    yield chunk
+            except Exception:
+                # Output already streamed cannot be taken back; only fall back before it
+                if not first:
+                    raise
+                self.router.record(self.route, tier, None)
+                if index == len(tiers) - 1:
+                    raise
+                continue
+            if first:
+                self.router.record(self.route, tier, time.perf_counter() - started)
+            return
+
+    async def ainvoke(self, *args, **kwargs):
+        tiers = self._tiers()
+        for index, tier in enumerate(tiers):
+            started = time.perf_counter()
+            try:
+                response = await tier.model.ainvoke(*args, **kwargs)
+            except Exception:
+                self.router.record(self.route, tier, None)
+                if index == len(tiers) - 1:
+                    raise
+                continue
+            self.router.record(self.route, tier, time.perf_counter() - started)
+            return response
+
+    async def ainvoke_stream(self, *args, **kwargs) -> AsyncIterator:
+        tiers = self._tiers()
+        for index, tier in enumerate(tiers):
+            started = time.perf_counter()
+            first = True
+            try:
+                async for chunk in tier.model.ainvoke_stream(*args, **kwargs):
+                    if first:
+                        self.router.record(self.route, tier, time.perf_counter() - started)
+                        first = False
+                    yield chunk
+            except Exception:
+                if not first:
+                    raise
+                self.router.record(self.route, tier, None)
+                if index == len(tiers) - 1:
+                    raise
+                continue
+            if first:
+                self.router.record(self.route, tier, time.perf_counter() - started)
+            return
+
+
+def _tier_from_env(name: str, default_id: str, default_slo_ms: float, timeout_factor: float) -> ModelTier:
+    prefix = f"{name.upper()}_MODEL"
+    slo = float(os.getenv(f"{prefix}_SLO_MS", str(default_slo_ms))) / 1000
+    model = OpenAILike(
+        id=os.getenv(f"{prefix}_ID", default_id),
+        api_key=os.getenv(f"{prefix}_API_KEY") or os.getenv("NEBIUS_API_KEY"),
+        base_url=os.getenv(f"{prefix}_BASE_URL") or os.getenv("NEBIUS_BASE_URL", NEBIUS_BASE_URL),
+        # A tier that is far past its SLO is abandoned for the next one rather than waited on
+        timeout=slo * timeout_factor if slo else None,
+    )
+    if slo:
+        model.max_retries = 0  # retrying a slow tier is what the fallback tier is for
+    return ModelTier(name, model, slo=slo)
+
+
+def load_model_router() -> ModelRouter:
+    timeout_factor = float(os.getenv("MODEL_SLO_TIMEOUT_FACTOR", "3"))
+    tiers = {
+        "large": _tier_from_env("large", "openai/gpt-oss-120b", 30000, timeout_factor),
+        "fast": _tier_from_env("fast", "openai/gpt-oss-20b", 4000, timeout_factor),
+    }
+    enabled = os.getenv("MODEL_ROUTING", "on").lower() not in ("0", "off", "false", "no")
+    routes = parse_routes(os.getenv("MODEL_ROUTES", DEFAULT_ROUTES)) if enabled else {}
+    return ModelRouter(tiers, routes, probe_interval=float(os.getenv("MODEL_PROBE_SECONDS", "10")))
+
+
+model_router = load_model_router()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-agent model routing and latency-SLO fallback.
+
+Two ModelStandIns play the tiers: a slow "large" model and a quick "fast"
+one. /analyze runs go through both orchestration modes in four phases:
+
+- large only: MODEL_ROUTING=off, every agent on the large model (as before)
+- routed: specialists on the fast tier, synthesis on the large one
+- fast degraded: the fast stand-in slowed past its SLO (and the timeout
+  of SLO x MODEL_SLO_TIMEOUT_FACTOR); calls fail over to the large tier, then
+  the router skips the fast tier outright
+- recovered: the fast stand-in is quick again; after the probe interval
+  the specialists return to it
+
+For each phase: median wall time, completions served by each stand-in,
+fallbacks, and where synthesis ran.
+
+    python model_routing_benchmark.py --large-ms 1500 --fast-ms 250 --slo-ms 800 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from model_stand_in import ModelStandIn
+
+PROMPT = ("Perform comprehensive analysis on token address: 0xabc. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model routing benchmark")
+    parser.add_argument("--large-ms", type=float, default=1500.0, help="Large model latency per completion")
+    parser.add_argument("--fast-ms", type=float, default=250.0, help="Fast model latency per completion")
+    parser.add_argument("--slo-ms", type=float, default=800.0, help="Fast tier latency SLO")
+    parser.add_argument("--degraded-ms", type=float, default=4000.0, help="Fast model latency while degraded")
+    parser.add_argument("--probe-s", type=float, default=2.0, help="Probe interval for a tier over its SLO")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode and phase")
+    args = parser.parse_args()
+
+    with ModelStandIn(latency=args.large_ms / 1000) as large, ModelStandIn(latency=args.fast_ms / 1000) as fast:
+        os.environ.update({
+            "LARGE_MODEL_BASE_URL": large.url, "FAST_MODEL_BASE_URL": fast.url,
+            "FAST_MODEL_SLO_MS": str(args.slo_ms), "MODEL_PROBE_SECONDS": str(args.probe_s),
+            "AGENT_TRACE_PATH": os.path.join(tempfile.mkdtemp(), "agent_traces.jsonl"),
+        })
+        os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+        os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+        import agents
+        from model_routing import DEFAULT_ROUTES, model_router, parse_routes
+        from team_stream import run_team_streaming
+
+        team = agents.get_team()
+        for agent in team.members:
+            agent.debug_mode = False
+        for name in ("agno", "agno-team", "agno-workflow"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        fast_tier = model_router.tiers["fast"]
+
+        def run(mode: str) -> float:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                if mode == "team":
+                    run_team_streaming(team, PROMPT)
+                else:
+                    agents.run_parallel_analysis(PROMPT)
+            return time.perf_counter() - started
+
+        def routed():
+            model_router.routes = parse_routes(DEFAULT_ROUTES)
+
+        def large_only():
+            model_router.routes = {}
+
+        def degrade():
+            routed()
+            fast.latency = args.degraded_ms / 1000
+
+        def recover():
+            fast.latency = args.fast_ms / 1000
+            time.sleep(args.probe_s)
+
+        phases = (("large only", large_only), ("routed", routed), ("fast degraded", degrade), ("recovered", recover))
+
+        print(f"🔀 Large model {args.large_ms:.0f}ms, fast model {args.fast_ms:.0f}ms (SLO {args.slo_ms:.0f}ms, "
+              f"{args.degraded_ms:.0f}ms when degraded), {args.runs} runs per mode and phase")
+        print("=" * 78)
+        print(f"{'phase':<15}{'mode':<10}{'median s':>9}{'first s':>9}{'last s':>8}"
+              f"{'large':>7}{'fast':>6}{'fallbacks':>11}")
+        print("-" * 78)
+        results = {}
+        for label, setup in phases:
+            setup()
+            for mode in ("parallel", "team"):
+                before = (large.completions, fast.completions, model_router.fallbacks)
+                samples = [run(mode) for _ in range(args.runs)]
+                served = (large.completions - before[0], fast.completions - before[1],
+                          model_router.fallbacks - before[2])
+                results[label, mode] = statistics.median(samples)
+                print(f"{label:<15}{mode:<10}{results[label, mode]:>9.2f}{samples[0]:>9.2f}{samples[-1]:>8.2f}"
+                      f"{served[0]:>7}{served[1]:>6}{served[2]:>11}")
+        print("-" * 78)
+        for mode in ("parallel", "team"):
+            print(f"⚡ {mode}: routed {results['large only', mode] / results['routed', mode]:.1f}x faster than "
+                  f"large only; degraded fast tier costs {results['fast degraded', mode] - results['routed', mode]:+.2f}s")
+        print(f"📊 fast tier p90 {fast_tier.p90():.3f}s, breaching: {fast_tier.breaching()}")
+        print(f"📊 {model_router.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Lets agno agents and teams run offline, with a fixed latency per completion,
+so orchestration changes can be timed without paying for (or waiting on)
+a real model:
+
+    POST /v1/chat/completions   (plain and `stream: true` SSE responses)
+    GET  /v1/models
+
+Team coordinators are recognised by the `delegate_task_to_member` tool in
+the request: the stand-in delegates to each member listed in the system
+prompt (`<member id=...>`) one after another, as the team's "process
+sequentially" instructions ask, and then writes the final answer. Every
+other request gets a short markdown report; agents whose system prompt
+contains one of `raw_markers` also paste `raw_words` of raw tool output
+into it (scraped page text, a tweet dump and a JSON blob around a few
+facts), as real specialists tend to. With `tool_calls` (tool name ->
+arguments), an agent offered one of those tools calls each of them once
+before writing its report.
+
+    python model_stand_in.py --port 8100 --latency-ms 500
+    NEBIUS_BASE_URL=http://127.0.0.1:8100/v1 python bot.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+DELEGATE_TOOL = "delegate_task_to_member"
+RAW_VOCABULARY = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+                  "incididunt ut labore et dolore magna aliqua roadmap ecosystem partners").split()
+MEMBER_PATTERN = re.compile(r'<member id="([^"]+)" name="([^"]+)"')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+class ModelStandIn:
+    """
+    Threaded OpenAI-compatible stand-in.
+
+    Args:
+        latency: Seconds before each completion starts returning
+        tokens_per_second: Streaming rate for content (0 sends it at once)
+        report_words: Approximate length of generated reports
+        raw_words: Words of raw tool output in reports of agents matching raw_markers
+        raw_markers: System prompt substrings of the agents that paste raw output
+        prompt_tokens_per_second: Prefill rate; adds prompt tokens / rate to the latency (0: none)
+        tool_calls: Tool name -> arguments, called once by agents offered that tool
+    """
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 0.0, report_words: int = 120,
+                 raw_words: int = 0, raw_markers: Sequence[str] = (), prompt_tokens_per_second: float = 0.0,
+                 tool_calls: Optional[Dict[str, Dict]] = None, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.report_words = report_words
+        self.raw_words = raw_words
+        self.raw_markers = list(raw_markers)
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.tool_calls = dict(tool_calls or {})
+        self.host = host
+        self.port = port
+        self.completions = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._httpd: Optional[_Server] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "ModelStandIn":
+        self._httpd = _Server((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    # --- Scripted responses ---
+
+    def _report(self, messages: List[Dict]) -> str:
+        system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+        task = next((_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+        topic = system.strip().splitlines()[0][:80] if system.strip() else "analysis"
+        filler = " ".join(f"point{i}" for i in range(self.report_words))
+        report = (
+            f"## Report\n"
+            f"**Scope:** {topic}\n"
+            f"**Task:** {task[:120]}\n\n"
+            f"- Risk: medium, liquidity adequate\n"
+            f"- Recommendation: HOLD\n\n"
+            f"{filler}\n"
+        )
+        if self.raw_words and any(marker in system for marker in self.raw_markers):
+            report += self._raw_output()
+        return report
+
+    def _raw_output(self) -> str:
+        words = max(self.raw_words, 60)
+        page = " ".join(RAW_VOCABULARY[i % len(RAW_VOCABULARY)] for i in range(words // 2))
+        tweets = "\n".join(f"@user{i}: gm frens, wagmi, {RAW_VOCABULARY[i % len(RAW_VOCABULARY)]} soon"
+                           for i in range(words // 20))
+        rows = [{"id": f"0x{i:040x}", "balance": str(10 ** 24 - i * 10 ** 21), "percentage": round(9.5 - i * 0.2, 2)}
+                for i in range(words // 30)]
+        return (
+            "\n### Raw tool output\n"
+            f"Scraped page: {page}\n"
+            "- Total supply: 1,000,000,000; circulating 240,000,000 (24%)\n"
+            "- Raised $12M seed round, 12-month cliff then 36-month linear vesting\n"
+            "- Top 10 holders control 61% of supply\n"
+            "- Price $0.42, 24h volume $3.1M, liquidity $5.4M\n"
+            "- Twitter sentiment: Bullish (72% of 1,204 authentic posts), 35 bot accounts filtered\n"
+            f"{tweets}\n"
+            f"```json\n{json.dumps({'top_holders': rows})}\n```\n"
+        )
+
+    def respond(self, body: Dict) -> Dict:
+        """Return the assistant message (content and/or tool_calls) for a request."""
+        messages = body.get("messages", [])
+        tools = [t.get("function", {}).get("name") for t in body.get("tools") or []]
+        if DELEGATE_TOOL in tools:
+            system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+            members = MEMBER_PATTERN.findall(system)
+            delegated = sum(1 for m in messages if m.get("role") == "tool")
+            if delegated < len(members):
+                member_id, name = members[delegated]
+                return {"role": "assistant", "content": None, "tool_calls": [{
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "function",
+                    "function": {
+                        "name": DELEGATE_TOOL,
+                        "arguments": json.dumps({"member_id": member_id, "task": f"Contribute {name} findings"}),
+                    },
+                }]}
+            return {"role": "assistant", "content": self._report(messages)}
+        called = {call.get("function", {}).get("name")
+                  for m in messages if m.get("role") == "assistant" for call in m.get("tool_calls") or []}
+        pending = [name for name in tools if name in self.tool_calls and name not in called]
+        if pending:
+            return {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(self.tool_calls[name])},
+            } for name in pending]}
+        return {"role": "assistant", "content": self._report(messages)}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _json(self, status: int, payload: Dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _chunk(self, payload):
+                data = f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._json(200, {"object": "list", "data": [{"id": "stand-in", "object": "model"}]})
+                else:
+                    self._json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._json(404, {"error": {"message": "Not found"}})
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.completions += 1
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    prefill = 0.0
+                    if server.prompt_tokens_per_second:
+                        prompt = sum(len(_text(m.get("content")).split()) for m in body.get("messages", []))
+                        prefill = prompt / server.prompt_tokens_per_second
+                    time.sleep(server.latency + prefill)
+                    message = server.respond(body)
+                    if body.get("stream"):
+                        self._stream(body, message)
+                    else:
+                        self._complete(body, message)
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _usage(self, body: Dict, message: Dict) -> Dict:
+                prompt = sum(len(_text(m.get("content")).split()) for m in body.get("messages", []))
+                completion = len((message.get("content") or "").split()) or 10
+                return {"prompt_tokens": prompt, "completion_tokens": completion,
+                        "total_tokens": prompt + completion}
+
+            def _complete(self, body: Dict, message: Dict):
+                self._json(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stand-in"),
+                    "choices": [{"index": 0, "message": message,
+                                 "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"}],
+                    "usage": self._usage(body, message),
+                })
+
+            def _stream(self, body: Dict, message: Dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion.chunk",
+                        "created": int(time.time()), "model": body.get("model", "stand-in")}
+
+                def chunk(delta, finish=None):
+                    self._chunk({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]})
+
+                if message.get("tool_calls"):
+                    chunk({"role": "assistant", "tool_calls": [
+                        {"index": i, **call} for i, call in enumerate(message["tool_calls"])
+                    ]})
+                    chunk({}, "tool_calls")
+                else:
+                    words = message["content"].split(" ")
+                    for i, word in enumerate(words):
+                        chunk({"role": "assistant", "content": word + (" " if i < len(words) - 1 else "")})
+                        if server.tokens_per_second:
+                            time.sleep(1 / server.tokens_per_second)
+                    chunk({}, "stop")
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self._chunk({**base, "choices": [], "usage": self._usage(body, message)})
+                self._chunk("[DONE]")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible model stand-in")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stand_in = ModelStandIn(latency=args.latency_ms / 1000, tokens_per_second=args.tokens_per_second,
+                            port=args.port).start()
+    print(f"🧪 Model stand-in running at {stand_in.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stand_in.stop()
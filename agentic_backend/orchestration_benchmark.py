@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential team run vs parallel specialist fan-out.
+
+Points the agents at a local ModelStandIn (fixed latency per completion)
+and times one /analyze prompt through:
+
+- team: finrizz_team.run(), the coordinator delegating to each member in turn
+- parallel: run_parallel_analysis(), discovery/whale/market concurrently, then
+  the financial agent
+
+Also runs the parallel mode with one specialist slowed past its timeout to
+show the synthesis still completes on schedule.
+
+    python orchestration_benchmark.py --latency-ms 500 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import time
+
+from model_stand_in import ModelStandIn
+
+PROMPT = ("Perform comprehensive analysis on token address: 0xabc. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+
+
+def timed(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            fn()
+        samples.append(time.perf_counter() - start)
+    return sum(samples) / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Team vs parallel orchestration benchmark")
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with ModelStandIn(latency=args.latency_ms / 1000) as model:
+        os.environ["NEBIUS_BASE_URL"] = model.url
+        os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+        os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+        import agents
+
+        for agent in agents.get_team().members:
+            agent.debug_mode = False
+        for name in ("agno", "agno-team", "agno-workflow"):
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+
+        print(f"🧪 Model stand-in at {model.url}, {args.latency_ms:.0f}ms per completion, {args.runs} runs")
+        print("=" * 60)
+        print(f"{'mode':<22}{'wall s':>10}{'completions/run':>17}{'peak conc.':>11}")
+        print("-" * 60)
+
+        results = {}
+        for mode, fn in (("team (sequential)", lambda: agents.get_team().run(PROMPT)),
+                         ("parallel fan-out", lambda: agents.run_parallel_analysis(PROMPT))):
+            before = model.completions
+            model.max_active = 0
+            results[mode] = timed(fn, args.runs)
+            print(f"{mode:<22}{results[mode]:>10.2f}{(model.completions - before) / args.runs:>17.1f}"
+                  f"{model.max_active:>11}")
+
+        # One specialist slower than its timeout: synthesis proceeds without it
+        slow = agents.get_agent(agents.WHALE_AGENT)
+        original_run, original_timeout = slow.run, agents.specialist_timeouts[slow.name]
+        agents.specialist_timeouts[slow.name] = args.latency_ms / 1000 * 2
+        slow.run = lambda *a, **kw: (time.sleep(args.latency_ms / 1000 * 6), original_run(*a, **kw))[1]
+        try:
+            wall = timed(lambda: agents.run_parallel_analysis(PROMPT), 1)
+        finally:
+            del slow.run
+            agents.specialist_timeouts[slow.name] = original_timeout
+        print(f"{'parallel, 1 timeout':<22}{wall:>10.2f}")
+
+        speedup = results["team (sequential)"] / results["parallel fan-out"]
+        print(f"\n⚡ Parallel fan-out is {speedup:.1f}x faster than the sequential team run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Speculative data prefetch for /analyze.
+
+Without it, the whale, market and financial agents fetch on-chain and price
+data one tool call at a time, each only once the model has decided to ask.
+Once /analyze has passed the busy check and reserved its credit (before
+queueing and the first model turn), Prefetcher starts the tool calls the team will almost certainly
+make, concurrently, with the arguments the agents use by default:
+
+- holders and whale transfers: query_whale_activity, get_top_holders and
+  get_whale_transfers (subgraph), get_holder_concentration
+- token metadata and supply: get_market_cap (RPC_URL)
+- the Pyth price: get_price, once the symbol is known from either of the
+  above (skipped for tokens without a Pyth feed)
+
+`hook` (an agno tool hook on those agents) answers a matching call with
+the prefetched result, waiting for it (up to PREFETCH_WAIT seconds) if it
+is still in flight. Planning runs on its own thread, so fetches never wait
+behind planners blocked on them. Calls with
+other arguments, failed prefetches and results older than PREFETCH_TTL go
+to the tool as usual. They still find the subgraph's block cache and the
+token metadata cache warm. Served data is as of the start of the analysis.
+
+Each analysis gets a Prefetch with its tool-wait saving: for every call
+answered from the prefetch, the time the fetch took minus any time the
+agent still had to wait for it.
+
+PREFETCH=off disables it.
+"""
+
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from analysis_cache import normalize_address
+from tool_cache import cache_key, is_error_result
+
+EVM_ADDRESS = re.compile(r"^0x[0-9a-fA-F]{40}$")
+# Solana and other base58 chains: analysed, but nothing to prefetch from the EVM subgraph and RPC
+BASE58_ADDRESS = re.compile(r"^[1-9A-HJ-NP-Za-km-z]{32,44}$")
+
+
+def valid_address(address: str) -> bool:
+    """True for an EVM (0x + 40 hex) or base58 token address."""
+    address = address.strip()
+    return bool(EVM_ADDRESS.match(address) or BASE58_ADDRESS.match(address))
+
+
+@dataclass
+class Prefetch:
+    """The prefetched tool calls of one token and what they saved."""
+    token: str
+    started: float = field(default_factory=time.time)
+    fetched: Dict[str, float] = field(default_factory=dict)  # tool -> fetch seconds
+    failed: int = 0
+    served: int = 0
+    saved: float = 0.0  # seconds of tool wait avoided
+    waited: float = 0.0  # seconds agents still waited on fetches in flight
+
+    def report(self) -> Dict:
+        return {"token": self.token, "prefetched": len(self.fetched), "failed": self.failed,
+                "served": self.served, "fetch_s": round(sum(self.fetched.values()), 3),
+                "saved_s": round(self.saved, 3), "waited_s": round(self.waited, 3)}
+
+
+class Prefetcher:
+    """
+    Concurrent tool prefetch for a token, served back through a tool hook.
+
+    Args:
+        ttl: Seconds a prefetched result may answer tool calls
+        workers: Fetch threads
+        wait: Longest a tool call (or the price lookup) waits on a fetch in flight
+        enabled: False makes start() a no-op
+    """
+
+    def __init__(self, ttl: float = 120.0, workers: int = 8, wait: float = 10.0, enabled: bool = True):
+        self.ttl = ttl
+        self.wait = wait
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        # Planners block on fetches; on the fetch pool they could take every worker and starve them
+        self._planner = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch-plan")
+        self._lock = threading.Lock()
+        self._prefetches: Dict[str, Prefetch] = {}
+        self._results: Dict[str, Tuple[Prefetch, Future]] = {}  # tool call key -> (prefetch, fetch)
+        self._signatures: Dict[str, inspect.Signature] = {}
+        self._stats = {"prefetches": 0, "served": 0, "saved_s": 0.0, "waited_s": 0.0}
+
+    # --- Prefetching ---
+
+    def start(self, token: str) -> Optional[Prefetch]:
+        """
+        Start prefetching for a token unless a fresh prefetch exists (returned
+        instead). Returns at once; None for non-EVM addresses or when disabled.
+        """
+        if not self.enabled or not EVM_ADDRESS.match(token.strip()):
+            return None
+        token = normalize_address(token)
+        with self._lock:
+            self._expire()
+            prefetch = self._prefetches.get(token)
+            if prefetch is not None:
+                return prefetch
+            prefetch = self._prefetches[token] = Prefetch(token)
+            self._stats["prefetches"] += 1
+        # Tool modules are imported on the worker, not the caller's event loop
+        self._planner.submit(self._plan, prefetch)
+        return prefetch
+
+    def _plan(self, prefetch: Prefetch):
+        import agent_tools
+
+        token = prefetch.token
+        graph, game, pyeth = agent_tools.TheGraphTools(), agent_tools.GameTheoryTools(), agent_tools.PyEthTools()
+        sources = []
+        if agent_tools.subgraph_client is not None:
+            whale = self._submit(prefetch, graph.query_whale_activity, contract_address=token)
+            self._submit(prefetch, graph.get_top_holders, contract_address=token)
+            self._submit(prefetch, graph.get_whale_transfers, contract_address=token)
+            self._submit(prefetch, game.get_holder_concentration, token_address=token)
+            sources.append((whale, lambda data: (data.get("token") or [{}])[0].get("symbol")))
+        if agent_tools.shared_market_reader() is not None:
+            market = self._submit(prefetch, pyeth.get_market_cap, token_address=token)
+            sources.append((market, lambda data: (data.get("tokens") or [{}])[0].get("symbol")))
+
+        # The price needs the symbol: the first one with a Pyth feed, in source order
+        provider = agent_tools.shared_price_provider()
+        for fetch, symbol_of in sources:
+            try:
+                symbol = symbol_of(json.loads(fetch.result(timeout=self.wait)))
+            except Exception:  # failed, unparseable or still in flight: try the next source
+                continue
+            if symbol and agent_tools.pyth_symbol(symbol) in provider.symbols():
+                self._submit(prefetch, agent_tools.PythNetworkTools(provider=provider).get_price, symbol=symbol)
+                return
+
+    def _submit(self, prefetch: Prefetch, tool: Callable, **arguments) -> Future:
+        name = tool.__name__
+        self._signatures.setdefault(name, inspect.signature(tool))
+        fetch = self._executor.submit(self._fetch, prefetch, tool, arguments)
+        with self._lock:
+            self._results[self._key(name, arguments)] = (prefetch, fetch)
+        return fetch
+
+    def _fetch(self, prefetch: Prefetch, tool: Callable, arguments: Dict) -> str:
+        started = time.perf_counter()
+        result = tool(**arguments)
+        with self._lock:
+            if is_error_result(result):
+                prefetch.failed += 1
+            else:
+                prefetch.fetched[tool.__name__] = time.perf_counter() - started
+        return result
+
+    def _key(self, name: str, arguments: Dict) -> str:
+        """Tool call key with the tool's defaults filled in, so omitted and explicit defaults match."""
+        arguments = dict(arguments)
+        signature = self._signatures.get(name)
+        if signature is not None:
+            try:
+                bound = signature.bind_partial(**arguments)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+            except TypeError:
+                pass
+        if "symbol" in arguments:
+            from agent_tools import pyth_symbol
+
+            arguments["symbol"] = pyth_symbol(str(arguments["symbol"]))
+        return cache_key(name, arguments)
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for token in [t for t, p in self._prefetches.items() if p.started < cutoff]:
+            del self._prefetches[token]
+        for key in [k for k, (p, _) in self._results.items() if p.started < cutoff]:
+            del self._results[key]
+
+    # --- Serving ---
+
+    def hook(self, function_name: str, function_call, arguments: Dict):
+        """agno tool hook: answer a call from its prefetch when there is one."""
+        if function_name not in self._signatures:
+            return function_call(**arguments)
+        key = self._key(function_name, arguments)
+        with self._lock:
+            prefetch, fetch = self._results.get(key, (None, None))
+        if fetch is None or time.time() - prefetch.started >= self.ttl:
+            return function_call(**arguments)
+        started = time.perf_counter()
+        try:
+            result = fetch.result(timeout=self.wait)
+        except Exception:  # failed, or still in flight past the wait: the tool fetches for itself
+            result = None
+        waited = time.perf_counter() - started
+        if result is None or is_error_result(result):
+            return function_call(**arguments)
+        with self._lock:
+            saved = max(0.0, prefetch.fetched.get(function_name, 0.0) - waited)
+            prefetch.served += 1
+            prefetch.saved += saved
+            prefetch.waited += waited
+            self._stats["served"] += 1
+            self._stats["saved_s"] += saved
+            self._stats["waited_s"] += waited
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "saved_s": round(self._stats["saved_s"], 3),
+                    "waited_s": round(self._stats["waited_s"], 3)}
+
+
+prefetcher = Prefetcher(ttl=float(os.getenv("PREFETCH_TTL", "120")), wait=float(os.getenv("PREFETCH_WAIT", "10")),
+                        enabled=os.getenv("PREFETCH", "on").lower() not in ("0", "off", "false", "no"))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /analyze with and without the speculative data prefetch.
+
+Runs the team (parallel and team orchestration) on a ModelStandIn whose
+whale, market and financial agents call their data tools (holders, whale
+transfers, concentration, market cap, price) as real agents would,
+against the subgraph, JSON-RPC and Hermes stand-ins with fixed latency.
+Each run analyses a fresh token, so no run finds another's data cached.
+
+- off: tools fetch when the model calls them, one call after another
+- on: prefetcher.start() once the analysis is admitted, then the run; the
+  tools answer from the prefetch
+
+Reports tool wait per run (the tool call time in the run's trace), the
+prefetch's own saving estimate, and wall time.
+
+    python prefetch_benchmark.py --latency-ms 400 --graph-ms 150 --rpc-ms 60 --hermes-ms 80 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from graph_stand_in import GraphStandIn
+from model_stand_in import ModelStandIn
+
+# The Hermes and JSON-RPC stand-ins live in ../pyeth
+PYETH_PATH = os.getenv("PYETH_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pyeth"))
+if PYETH_PATH not in sys.path:
+    sys.path.append(PYETH_PATH)
+
+PROMPT = ("Perform comprehensive analysis on token address: {token}. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+DATA_TOOLS = {"query_whale_activity", "get_top_holders", "get_whale_transfers", "get_holder_concentration",
+              "get_market_cap", "get_price"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch benchmark")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Model stand-in latency per completion")
+    parser.add_argument("--graph-ms", type=float, default=150.0)
+    parser.add_argument("--rpc-ms", type=float, default=60.0)
+    parser.add_argument("--hermes-ms", type=float, default=80.0)
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode and orchestration")
+    args = parser.parse_args()
+    runs = args.runs
+
+    workdir = tempfile.mkdtemp()
+    graph = GraphStandIn(tokens=4 * runs, holders=800, transfers=200, latency=args.graph_ms / 1000).start()
+    os.environ.update({
+        "SUBGRAPH_URL": graph.url,
+        "AGENT_TRACE_PATH": os.path.join(workdir, "agent_traces.jsonl"),
+        "TOOL_CACHE_DIR": os.path.join(workdir, "tool_cache"),
+        "TOKEN_METADATA_PATH": os.path.join(workdir, "token_metadata.json"),
+    })
+    os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+    os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+    import pyth_oracle
+    from stand_ins import Erc20StandIn, HermesStandIn
+
+    hermes = HermesStandIn(latency=args.hermes_ms / 1000).start()
+    chain = Erc20StandIn(latency=args.rpc_ms / 1000).start()
+    os.environ.update({"HERMES_URL": hermes.url, "RPC_URL": chain.url})
+    symbols = [feed.split("/")[0] for feed in sorted(pyth_oracle.PRICE_FEEDS)]
+    tokens = graph.token_addresses
+    # Symbols repeat every few tokens, by which time the shared provider's price has expired
+    for index, token in enumerate(tokens):
+        chain.add_token(token, symbols[index % len(symbols)], total_supply=10 ** 27)
+
+    import agents
+    from model_routing import model_router
+    from prefetch import prefetcher
+    from run_trace import RunTrace
+    from team_stream import run_team_streaming
+
+    model = ModelStandIn(latency=args.latency_ms / 1000).start()
+    for tier in model_router.tiers.values():
+        tier.model.base_url = model.url
+    team = agents.get_team()
+    for agent in team.members:
+        agent.debug_mode = False
+    for name in ("agno", "agno-team", "agno-workflow"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    def run(mode: str, token: str, prefetch: bool):
+        model.tool_calls = {
+            "query_whale_activity": {"contract_address": token},
+            "get_top_holders": {"contract_address": token},
+            "get_whale_transfers": {"contract_address": token},
+            "get_holder_concentration": {"token_address": token},
+            "get_market_cap": {"token_address": token},
+            "get_price": {"symbol": chain.tokens[token]["symbol"]},
+        }
+        trace = RunTrace("analyze", mode=mode)
+        started = time.perf_counter()
+        report = prefetcher.start(token) if prefetch else None
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            if mode == "team":
+                run_team_streaming(team, PROMPT.format(token=token), trace=trace)
+            else:
+                agents.run_parallel_analysis(PROMPT.format(token=token), trace=trace)
+        wall = time.perf_counter() - started
+        tool_wait = sum(call["duration_s"] or 0 for call in trace.to_dict()["tools"] if call["tool"] in DATA_TOOLS)
+        return wall, tool_wait, report.saved if report else 0.0, report.served if report else 0
+
+    print(f"⚡ Model {args.latency_ms:.0f}ms per completion; subgraph {args.graph_ms:.0f}ms, RPC {args.rpc_ms:.0f}ms, "
+          f"Hermes {args.hermes_ms:.0f}ms; {runs} runs per row, a fresh token each")
+    print("=" * 70)
+    print(f"{'mode':<10}{'prefetch':<10}{'tool wait s':>12}{'saved s':>9}{'served':>8}{'wall s':>9}")
+    print("-" * 70)
+    fresh = iter(tokens)
+    results = {}
+    for mode in ("parallel", "team"):
+        for prefetch in (False, True):
+            samples = [run(mode, next(fresh), prefetch) for _ in range(runs)]
+            wall, wait, saved, served = (statistics.median(values) for values in zip(*samples))
+            results[mode, prefetch] = (wall, wait)
+            print(f"{mode:<10}{'on' if prefetch else 'off':<10}{wait:>12.3f}{saved:>9.3f}{served:>8.0f}{wall:>9.2f}")
+    print("-" * 70)
+    for mode in ("parallel", "team"):
+        (slow, before), (fast, after) = results[mode, False], results[mode, True]
+        print(f"⚡ {mode}: tool wait {before:.2f}s -> {after:.2f}s per analysis, {slow - fast:.2f}s faster")
+    print(f"📊 {prefetcher.stats()}")
+    for stand_in in (model, hermes, chain, graph):
+        stand_in.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: market agent price lookups through PythNetworkTools.
+
+Replays the price lookups of concurrent /analyze runs (each wants a few
+symbols) against pyeth's Hermes stand-in with fixed latency:
+
+- per call: pyth_oracle.get_prices() for each symbol, a new PythOracle and
+  connection every time
+- get_price: a warm provider shared by all agents, one tool call per symbol
+- get_prices: a warm shared provider, one batched tool call per analysis
+
+Each mode starts with an empty cache; analyses arrive spread over the
+replay, so cached prices also expire and are refetched. The per-tool
+latency summary is scraped from /metrics, as Prometheus would see it from
+the bot.
+
+    python pyth_tools_benchmark.py --analyses 200 --agents 8 --hermes-ms 60
+"""
+
+import argparse
+import os
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pyth price tool benchmark")
+    parser.add_argument("--analyses", type=int, default=200)
+    parser.add_argument("--symbols", type=int, default=3, help="Symbols looked up per analysis")
+    parser.add_argument("--agents", type=int, default=8, help="Concurrent market agent threads")
+    parser.add_argument("--hermes-ms", type=float, default=60.0)
+    parser.add_argument("--ttl", type=float, default=0.5, help="Shared provider cache TTL (seconds)")
+    parser.add_argument("--spacing-ms", type=float, default=10.0, help="Gap between analysis arrivals")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+    import agent_tools
+    import pyth_oracle
+    from price_provider import PythPriceProvider
+    from stand_ins import HermesStandIn
+
+    rng = random.Random(args.seed)
+    feeds = sorted(pyth_oracle.PRICE_FEEDS)
+    plan = [[symbol.split("/")[0] for symbol in rng.sample(feeds, args.symbols)] for _ in range(args.analyses)]
+
+    with HermesStandIn(latency=args.hermes_ms / 1000) as hermes:
+        os.environ["HERMES_URL"] = hermes.url
+
+        def per_call(symbols):
+            return [pyth_oracle.get_prices(agent_tools.pyth_symbol(symbol)) for symbol in symbols]
+
+        def get_price(tools, symbols):
+            return [tools.get_price(symbol) for symbol in symbols]
+
+        def get_prices(tools, symbols):
+            return tools.get_prices(symbols)
+
+        modes = (
+            ("per call", lambda tools, symbols: per_call(symbols), args.symbols),
+            ("get_price", get_price, args.symbols),
+            ("get_prices", get_prices, 1),
+        )
+
+        print(f"💹 {args.analyses} analyses x {args.symbols} symbols, {args.agents} agent threads, "
+              f"Hermes {args.hermes_ms:.0f}ms, TTL {args.ttl}s")
+        print("=" * 78)
+        print(f"{'mode':<12}{'wall s':>9}{'tool calls':>12}{'Hermes calls':>14}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'analysis p50':>13}")
+        print("-" * 78)
+        for label, lookup, calls_per_analysis in modes:
+            tools = agent_tools.PythNetworkTools(provider=PythPriceProvider(ttl=args.ttl))
+            latencies = []
+            before = sum(hermes.request_counts.values())
+
+            def analysis(index_symbols):
+                index, symbols = index_symbols
+                time.sleep(max(0.0, begin + index * args.spacing_ms / 1000 - time.perf_counter()))
+                start = time.perf_counter()
+                lookup(tools, symbols)
+                latencies.append(time.perf_counter() - start)
+
+            begin = start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.agents) as pool:
+                list(pool.map(analysis, enumerate(plan)))
+            wall = time.perf_counter() - start
+            upstream = sum(hermes.request_counts.values()) - before
+            tool_calls = args.analyses * calls_per_analysis
+            per_tool = [latency / calls_per_analysis for latency in latencies]
+            print(f"{label:<12}{wall:>9.2f}{tool_calls:>12}{upstream:>14}"
+                  f"{percentile(per_tool, 50) * 1000:>9.1f}{percentile(per_tool, 95) * 1000:>9.1f}"
+                  f"{percentile(latencies, 50) * 1000:>13.1f}")
+
+    print("-" * 78)
+    from bot_metrics import start_metrics_server
+
+    server = start_metrics_server(0, "127.0.0.1")
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+        scraped = response.read().decode()
+    server.shutdown()
+    samples = {}
+    for line in scraped.splitlines():
+        name, _, value = line.rpartition(" ")
+        for suffix in ("_sum", "_count"):
+            prefix = f"{agent_tools.PYTH_TOOL_SECONDS.name}{suffix}{{tool=\""
+            if name.startswith(prefix):
+                samples.setdefault(name[len(prefix):-2], {})[suffix] = float(value)
+    for tool, values in sorted(samples.items()):
+        calls = int(values.get("_count", 0))
+        print(f"🔧 {tool:<12} {calls:>5} calls  {values.get('_sum', 0.0) / max(calls, 1) * 1000:.2f}ms mean  (/metrics)")
+
+
+if __name__ == "__main__":
+    main()
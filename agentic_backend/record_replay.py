@@ -0,0 +1,399 @@
+"""
+Record/replay harness for running the agents offline.
+
+Benchmarks of the team otherwise need live Nebius, Firecrawl, Twitter and
+on-chain endpoints. A cassette (JSONL file) captures one or more live runs:
+
+- CompletionRecorder: an OpenAI-compatible proxy in front of the real
+  model endpoint. It records every chat completion with its timing: total
+  duration for plain responses, the arrival time of every SSE chunk for
+  streamed ones.
+- ToolTape (record mode): an agno tool hook recording each tool's result
+  and duration.
+
+and plays them back deterministically:
+
+- CompletionReplayer: an OpenAI-compatible stub serving the recorded
+  completions, with the recorded timing scaled by `speed` (0 answers
+  instantly, so what remains of a run's wall time is orchestration
+  overhead)
+- ToolTape (replay mode): answers tool calls from the cassette after the
+  recorded duration, scaled the same way
+
+Requests are matched on their content (roles, text, tool calls and offered
+tools; tool call ids are ignored). Identical requests get their recordings
+in order. A request with no exact match falls back to a looser key (system
+prompt, roles and offered tools).
+
+    python record_replay.py record --upstream https://api.studio.nebius.com/v1 --cassette run.jsonl
+    TOOL_TAPE_PATH=run.jsonl TOOL_TAPE_MODE=record NEBIUS_BASE_URL=http://127.0.0.1:8100/v1 python bot.py
+    python record_replay.py replay --cassette run.jsonl --speed 1
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional
+
+import httpx
+
+from tool_cache import cache_key
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def completion_keys(body: Dict) -> tuple:
+    """(exact, loose) match keys of a chat completion request."""
+    messages = body.get("messages", [])
+    tools = sorted(t.get("function", {}).get("name", "") for t in body.get("tools") or [])
+    exact = [
+        (m.get("role"), _text(m.get("content")),
+         [(c.get("function", {}).get("name"), c.get("function", {}).get("arguments"))
+          for c in m.get("tool_calls") or []])
+        for m in messages
+    ]
+    system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+    loose = (system, [m.get("role") for m in messages], tools)
+    return _digest([exact, tools, bool(body.get("stream"))]), _digest(loose)
+
+
+class Cassette:
+    """
+    Recorded completions and tool calls, appended to a JSONL file as they happen.
+
+    Args:
+        path: JSONL file (None keeps the recording in memory)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, Deque[Dict]] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = [json.loads(line) for line in f if line.strip()]
+        self.rewind()
+
+    def add(self, entry: Dict):
+        with self._lock:
+            self.entries.append(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def rewind(self):
+        """Start serving every recording again, in recorded order."""
+        with self._lock:
+            self._queues = defaultdict(deque)
+            for entry in self.entries:
+                for key in entry.get("keys", []):
+                    self._queues[entry["kind"], key].append(entry)
+
+    def take(self, kind: str, *keys: str) -> Optional[Dict]:
+        """Next unserved recording under the first key that has one (reused once exhausted)."""
+        with self._lock:
+            for key in keys:
+                queue = self._queues.get((kind, key))
+                if queue:
+                    entry = queue.popleft()
+                    queue.append(entry)  # a repeated run cycles through the recordings again
+                    return entry
+        return None
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for entry in self.entries:
+            counts[entry["kind"]] += 1
+        return dict(counts)
+
+
+class _CassetteServer:
+    """Threaded OpenAI-compatible endpoint at ``url`` (start/stop or use as a context manager)."""
+
+    def __init__(self, cassette: Cassette, host: str = "127.0.0.1", port: int = 0):
+        self.cassette = cassette
+        self.host = host
+        self.port = port
+        self._httpd: Optional[_Server] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self):
+        self._httpd = _Server((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def handle_completion(self, handler, body: Dict):
+        raise NotImplementedError
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def send_json(self, status: int, payload: Dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def start_stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+            def send_chunk(self, line: str):
+                data = f"{line}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def end_stream(self):
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self.send_json(200, {"object": "list", "data": [{"id": "replay", "object": "model"}]})
+                else:
+                    self.send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_json(404, {"error": {"message": "Not found"}})
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                server.handle_completion(self, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class CompletionRecorder(_CassetteServer):
+    """
+    Recording proxy: forwards chat completions to ``upstream`` and records them.
+
+    Args:
+        upstream: Base URL of the real endpoint (e.g. https://api.studio.nebius.com/v1)
+        cassette: Where completions are recorded
+        api_key: Upstream key (default: NEBIUS_API_KEY; the caller's Authorization header wins)
+        timeout: Upstream timeout in seconds
+    """
+
+    def __init__(self, upstream: str, cassette: Cassette, api_key: Optional[str] = None, timeout: float = 120.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        super().__init__(cassette, host, port)
+        self.upstream = upstream.rstrip("/")
+        self.api_key = api_key or os.getenv("NEBIUS_API_KEY", "")
+        self.client = httpx.Client(timeout=timeout)
+        self.recorded = 0
+
+    def handle_completion(self, handler, body: Dict):
+        headers = {"Authorization": handler.headers.get("Authorization") or f"Bearer {self.api_key}",
+                   "Content-Type": "application/json"}
+        url = f"{self.upstream}/chat/completions"
+        started = time.perf_counter()
+        entry = {"kind": "completion", "keys": list(completion_keys(body)), "stream": bool(body.get("stream"))}
+        if body.get("stream"):
+            chunks = []
+            with self.client.stream("POST", url, json=body, headers=headers) as response:
+                if response.status_code != 200:
+                    response.read()
+                    handler.send_json(response.status_code, response.json())
+                    return
+                handler.start_stream()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunks.append([time.perf_counter() - started, line])
+                    handler.send_chunk(line)
+                handler.end_stream()
+            entry.update(chunks=chunks, duration=time.perf_counter() - started)
+        else:
+            response = self.client.post(url, json=body, headers=headers)
+            payload = response.json()
+            handler.send_json(response.status_code, payload)
+            if response.status_code != 200:
+                return
+            entry.update(response=payload, duration=time.perf_counter() - started)
+        self.cassette.add(entry)
+        with self._lock:
+            self.recorded += 1
+
+    def stop(self):
+        super().stop()
+        self.client.close()
+
+
+class CompletionReplayer(_CassetteServer):
+    """
+    OpenAI-compatible stub replaying a cassette's completions.
+
+    Args:
+        cassette: Recorded completions
+        speed: Multiplier on recorded timing (1: as recorded, 0: instant)
+    """
+
+    def __init__(self, cassette: Cassette, speed: float = 1.0, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(cassette, host, port)
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self.replayed_seconds = 0.0  # recorded model time served (before scaling)
+
+    def handle_completion(self, handler, body: Dict):
+        entry = self.cassette.take("completion", *completion_keys(body))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            handler.send_json(404, {"error": {"message": "No recorded completion matches this request",
+                                              "type": "replay_miss"}})
+            return
+        with self._lock:
+            self.served += 1
+            self.replayed_seconds += entry["duration"]
+        started = time.perf_counter()
+        if entry["stream"]:
+            handler.start_stream()
+            for offset, line in entry["chunks"]:
+                delay = started + offset * self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                handler.send_chunk(line)
+            handler.end_stream()
+        else:
+            if self.speed:
+                time.sleep(entry["duration"] * self.speed)
+            handler.send_json(200, entry["response"])
+
+
+class ToolTape:
+    """
+    agno tool hook recording tool results, or replaying them from a cassette.
+
+    Install it first in an agent's ``tool_hooks`` so a replay answers before
+    any other hook (e.g. the tool cache) runs.
+
+    Args:
+        cassette: Where tool calls are recorded / replayed from
+        mode: "record" or "replay"
+        speed: Replay: multiplier on recorded tool durations
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", speed: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown tool tape mode: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.speed = speed
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self.replayed_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def hook(self, function_name: str, function_call, arguments: Dict):
+        key = cache_key(function_name, arguments)
+        if self.mode == "replay":
+            entry = self.cassette.take("tool", key)
+            with self._lock:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.replayed += 1
+                    self.replayed_seconds += entry["duration"]
+            if entry is None:
+                return json.dumps({"error": f"No recorded result for {function_name}"})
+            if self.speed:
+                time.sleep(entry["duration"] * self.speed)
+            return entry["result"]
+
+        started = time.perf_counter()
+        result = function_call(**arguments)
+        if isinstance(result, (str, int, float, bool, list, dict)) or result is None:
+            self.cassette.add({"kind": "tool", "keys": [key], "tool": function_name, "arguments": arguments,
+                               "result": result, "duration": time.perf_counter() - started})
+            with self._lock:
+                self.recorded += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"mode": self.mode, "recorded": self.recorded, "replayed": self.replayed,
+                    "misses": self.misses, "replayed_seconds": round(self.replayed_seconds, 3)}
+
+
+def load_tool_tape() -> Optional[ToolTape]:
+    path = os.getenv("TOOL_TAPE_PATH")
+    if not path:
+        return None
+    return ToolTape(Cassette(path), os.getenv("TOOL_TAPE_MODE", "replay"),
+                    speed=float(os.getenv("TOOL_TAPE_SPEED", "1")))
+
+
+tool_tape = load_tool_tape()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay model completions")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", required=True, help="JSONL cassette file")
+    parser.add_argument("--upstream", default=os.getenv("NEBIUS_BASE_URL", "https://api.studio.nebius.com/v1/"),
+                        help="Real endpoint to record from")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay timing multiplier (0: instant)")
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    if args.mode == "record":
+        server = CompletionRecorder(args.upstream, cassette, port=args.port)
+    else:
+        server = CompletionReplayer(cassette, speed=args.speed, port=args.port)
+    with server:
+        print(f"📼 {args.mode} at {server.url} ({args.cassette}: {cassette.counts()})")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
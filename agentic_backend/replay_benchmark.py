@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: team and discovery agent runs replayed offline from a cassette.
+
+Records one /analyze run of the team and one discovery agent run through
+record_replay (the CompletionRecorder in front of a ModelStandIn, the tool
+tape around real tools on the Hermes and subgraph stand-ins), shuts every
+upstream down, and replays the cassette:
+
+- speed 1: recorded model and tool timing, which should land close to the
+  recorded wall time
+- speed 0: no model or tool time at all, i.e. the orchestration overhead
+  (agno, prompt building, tool hooks, compaction, tracing)
+
+Every replay must be served entirely from the cassette (0 misses).
+--profile prints where the speed-0 team run spends its time.
+
+    python replay_benchmark.py --latency-ms 400 --tool-ms 80 --runs 3 --profile
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import logging
+import os
+import pstats
+import statistics
+import sys
+import tempfile
+import time
+
+from graph_stand_in import GraphStandIn
+from model_stand_in import ModelStandIn
+from record_replay import Cassette, CompletionRecorder, CompletionReplayer, ToolTape
+
+# The Hermes and JSON-RPC stand-ins live in ../pyeth
+PYETH_PATH = os.getenv("PYETH_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pyeth"))
+if PYETH_PATH not in sys.path:
+    sys.path.append(PYETH_PATH)
+
+PROMPT = ("Perform comprehensive analysis on token address: {token}. Include discovery research, "
+          "whale tracking, live market data, and investment recommendation.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay benchmark")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Model stand-in latency per completion")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0, help="Model stand-in streaming rate")
+    parser.add_argument("--tool-ms", type=float, default=80.0, help="Hermes and subgraph stand-in latency")
+    parser.add_argument("--runs", type=int, default=3, help="Replays per speed")
+    parser.add_argument("--profile", action="store_true", help="Profile a speed-0 team replay")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    graph = GraphStandIn(tokens=1, holders=500, transfers=100, latency=args.tool_ms / 1000).start()
+    token = graph.token_addresses[0]
+    os.environ["SUBGRAPH_URL"] = graph.url
+    os.environ["AGENT_TRACE_PATH"] = os.path.join(workdir, "agent_traces.jsonl")
+    os.environ["TOOL_CACHE_DIR"] = os.path.join(workdir, "tool_cache")
+    os.environ.setdefault("NEBIUS_API_KEY", "stand-in")
+    os.environ.setdefault("FIRECRAWL_API_KEY", "stand-in")
+    import agents
+    import record_replay
+    from model_routing import model_router
+    from stand_ins import HermesStandIn
+    from team_stream import run_team_streaming
+
+    hermes = HermesStandIn(latency=args.tool_ms / 1000).start()
+    os.environ["HERMES_URL"] = hermes.url
+    model = ModelStandIn(latency=args.latency_ms / 1000, tokens_per_second=args.tokens_per_second, tool_calls={
+        "get_sentiment": {"token_symbol": "ETH"},
+        "query_whale_activity": {"contract_address": token},
+        "get_price": {"symbol": "ETH"},
+        "get_holder_concentration": {"token_address": token},
+    }).start()
+
+    cassette = Cassette(os.path.join(workdir, "cassette.jsonl"))
+    tape = record_replay.tool_tape = ToolTape(cassette, mode="record")
+    team = agents.get_team()
+    discovery = agents.get_agent(agents.DISCOVERY_AGENT)
+    for agent in team.members:
+        agent.debug_mode = False
+    for name in ("agno", "agno-team", "agno-workflow"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    def point_at(url: str):
+        for tier in model_router.tiers.values():
+            tier.model.base_url = url
+            tier.model.client = None  # agno caches the OpenAI client per model
+
+    prompt = PROMPT.format(token=token)
+    workloads = {
+        "team": lambda: run_team_streaming(team, prompt),
+        "discovery agent": lambda: discovery.run(prompt),
+    }
+
+    def timed(run) -> float:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            run()
+        return time.perf_counter() - started
+
+    recorded = {}
+    with CompletionRecorder(model.url, cassette) as recorder:
+        point_at(recorder.url)
+        for label, run in workloads.items():
+            recorded[label] = timed(run)
+    for upstream in (model, hermes, graph):
+        upstream.stop()
+
+    print(f"📼 Recorded {cassette.counts()} (model {args.latency_ms:.0f}ms + {args.tokens_per_second:.0f} tok/s, "
+          f"tools {args.tool_ms:.0f}ms); upstreams stopped, {args.runs} replays per speed")
+    print("=" * 78)
+    print(f"{'workload':<17}{'recorded s':>11}{'speed 1 s':>11}{'speed 0 s':>11}"
+          f"{'model s':>9}{'tools s':>9}{'misses':>8}")
+    print("-" * 78)
+    tape.mode = "replay"
+    for label, run in workloads.items():
+        walls, replayed = {}, {}
+        for speed in (1.0, 0.0):
+            samples, misses = [], 0
+            for _ in range(args.runs):
+                cassette.rewind()
+                tape.speed, tape.replayed_seconds, tape.misses = speed, 0.0, 0
+                with CompletionReplayer(cassette, speed=speed) as replayer:
+                    point_at(replayer.url)
+                    samples.append(timed(run))
+                misses += replayer.misses + tape.misses
+                replayed[speed] = (replayer.replayed_seconds, tape.replayed_seconds)
+            walls[speed] = (statistics.median(samples), misses)
+        model_s, tools_s = replayed[1.0]
+        misses = walls[1.0][1] + walls[0.0][1]
+        print(f"{label:<17}{recorded[label]:>11.2f}{walls[1.0][0]:>11.2f}{walls[0.0][0]:>11.3f}"
+              f"{model_s:>9.2f}{tools_s:>9.2f}{misses:>8}")
+    print("-" * 78)
+    print("⚙️ speed 0 is orchestration overhead alone; model s / tools s are the recorded waits it removes")
+
+    if args.profile:
+        cassette.rewind()
+        tape.speed = 0.0
+        profiler = cProfile.Profile()
+        with CompletionReplayer(cassette, speed=0.0) as replayer:
+            point_at(replayer.url)
+            profiler.enable()
+            timed(workloads["team"])
+            profiler.disable()
+        print("\n🔬 Team run at speed 0, top functions by cumulative time:")
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(15)
+        sys.stdout.write(stream.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Single-pass keyword classification of LLM reports.
+
+The bot's formatters used to lowercase every line once per keyword and scan
+the report several times. KeywordExtractor compiles all keyword sets into
+one pattern and runs it once over the lowercased report, so every line ends
+up with a bitmask of the categories it mentions.
+
+Keyword sets are a mapping of category -> keywords. The defaults below can
+be overridden per category from a JSON file named by REPORT_KEYWORDS_PATH:
+
+    {"token": ["token", "project", "airdrop"], "risk": ["risk", "rug"]}
+
+Matching is substring-based, like the checks it replaces ("hold" matches
+"holders").
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_KEYWORDS: Dict[str, List[str]] = {
+    "token": ["token", "project", "divine", "redotpay", "uptop"],
+    "sentiment": ["bullish", "bearish"],
+    "recommendation": ["recommendation", "buy", "sell", "hold"],
+    "risk": ["risk"],
+    "positive": ["buy", "bullish", "positive"],
+    "negative": ["sell", "bearish", "negative", "risk"],
+}
+
+
+class ClassifiedReport:
+    """Lines of a report with the categories each one mentions."""
+
+    def __init__(self, lines: List[str], masks: List[int], bits: Dict[str, int]):
+        self.lines = lines
+        self.masks = masks
+        self._bits = bits
+
+    def mask(self, *categories: str) -> int:
+        mask = 0
+        for category in categories:
+            mask |= self._bits[category]
+        return mask
+
+    def has(self, index: int, category: str) -> bool:
+        return bool(self.masks[index] & self._bits[category])
+
+    def matching(self, *categories: str) -> Iterator[Tuple[int, str]]:
+        """(index, line) for lines mentioning any of ``categories``, in order."""
+        mask = self.mask(*categories)
+        for index, line_mask in enumerate(self.masks):
+            if line_mask & mask:
+                yield index, self.lines[index]
+
+    def first(self, *categories: str) -> Optional[int]:
+        """Index of the first line mentioning any of ``categories``."""
+        return next((index for index, _ in self.matching(*categories)), None)
+
+
+class KeywordExtractor:
+    """
+    Precompiled multi-pattern line classifier.
+
+    Args:
+        keyword_sets: category -> keywords (case-insensitive substrings)
+    """
+
+    def __init__(self, keyword_sets: Dict[str, Iterable[str]]):
+        self.keyword_sets = {
+            category: [k.lower() for k in keywords if k and "\n" not in k]
+            for category, keywords in keyword_sets.items()
+        }
+        self.bits = {category: 1 << i for i, category in enumerate(self.keyword_sets)}
+
+        keyword_masks: Dict[str, int] = {}
+        for category, keywords in self.keyword_sets.items():
+            for keyword in keywords:
+                keyword_masks[keyword] = keyword_masks.get(keyword, 0) | self.bits[category]
+
+        # The scan reports non-overlapping matches, longest alternative first. So
+        # that no keyword hides another: overlapping pairs ("bullish" + "hold" in
+        # "bullishold") get a merged alternative, and every alternative carries the
+        # categories of all keywords it contains
+        alternatives = set(keyword_masks) | _overlaps(keyword_masks)
+        self._masks = {
+            alternative: _contained_masks(alternative, keyword_masks)
+            for alternative in alternatives
+        }
+        self._masks["\n"] = 0
+        # Newlines are matched too, so a single findall over the lowercased report
+        # yields line breaks and keywords in order. (IGNORECASE or a zero-width
+        # lookahead would disable the regex engine's literal-prefix scanning.)
+        pattern = "|".join(re.escape(a) for a in sorted(alternatives, key=len, reverse=True))
+        self._pattern = re.compile(f"\n|{pattern}" if pattern else "\n")
+
+    @classmethod
+    def from_file(cls, path: str, base: Dict[str, Iterable[str]] = None) -> "KeywordExtractor":
+        """Load keyword sets from JSON; categories in the file replace those in ``base``."""
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+        return cls({**(base or DEFAULT_KEYWORDS), **overrides})
+
+    def classify(self, text: str) -> ClassifiedReport:
+        lines = text.split("\n")
+        masks = [0] * len(lines)
+        keyword_masks = self._masks
+        line = 0
+        for token in self._pattern.findall(text.lower()):
+            if token == "\n":
+                line += 1
+            else:
+                masks[line] |= keyword_masks[token]
+        return ClassifiedReport(lines, masks, self.bits)
+
+    def first_line(self, text: str, *categories: str) -> Optional[Tuple[int, Set[str]]]:
+        """
+        (index, categories) of the first line mentioning any of ``categories``.
+
+        Stops scanning at the end of that line, so it is cheap when the
+        answer is near the top of a long report.
+        """
+        wanted = 0
+        for category in categories:
+            wanted |= self.bits[category]
+        keyword_masks = self._masks
+        line, line_mask = 0, 0
+        for match in self._pattern.finditer(text.lower()):
+            token = match.group()
+            if token != "\n":
+                line_mask |= keyword_masks[token]
+                continue
+            if line_mask & wanted:
+                break
+            line, line_mask = line + 1, 0
+        if not line_mask & wanted:
+            return None
+        return line, {category for category, bit in self.bits.items() if line_mask & bit}
+
+
+def _overlaps(keyword_masks: Dict[str, int]) -> Set[str]:
+    """Merged strings for keyword pairs where one's suffix is the other's prefix."""
+    merged = set()
+    for a in keyword_masks:
+        for b in keyword_masks:
+            for k in range(1, min(len(a), len(b))):
+                if a.endswith(b[:k]):
+                    merged.add(a + b[k:])
+    return merged
+
+
+def _contained_masks(alternative: str, keyword_masks: Dict[str, int]) -> int:
+    mask = 0
+    for keyword, keyword_mask in keyword_masks.items():
+        if keyword in alternative:
+            mask |= keyword_mask
+    return mask
+
+
+def load_extractor() -> KeywordExtractor:
+    path = os.getenv("REPORT_KEYWORDS_PATH")
+    if path:
+        return KeywordExtractor.from_file(path)
+    return KeywordExtractor(DEFAULT_KEYWORDS)
+
+
+report_extractor = load_extractor()
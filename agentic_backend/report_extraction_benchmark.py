@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report formatting with the single-pass keyword extractor.
+
+Times the bot's formatters against the previous implementations (kept here
+as `legacy_*`, line-by-line `any(keyword in line.lower() ...)` scans) on
+synthetic multi-megabyte LLM reports, and checks both produce identical
+output.
+
+    python report_extraction_benchmark.py --sizes 1 4 8
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("FIRECRAWL_API_KEY", "benchmark")
+
+import bot  # noqa: E402
+from report_extraction import KeywordExtractor, DEFAULT_KEYWORDS  # noqa: E402
+
+LINE_TEMPLATES = [
+    "## {name} Token Overview",
+    "The project raised ${n}M from tier-1 investors.",
+    "| Metric | Value | Change |",
+    "| Holders | {n},000 | +{n}% |",
+    "Community sentiment is BULLISH after the mainnet launch.",
+    "Whale wallets are accumulating; concentration Risk remains moderate.",
+    "**Recommendation:** Hold with a {n}% trailing stop.",
+    "Vesting unlocks in {n} days may add sell pressure.",
+    "Technical indicators: RSI {n}, MACD crossing upward.",
+    "Liquidity depth is adequate on the major venues.",
+    "",
+]
+
+
+def llm_report(size: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    names = ["Divine", "RedotPay", "UpTop", "Nebula", "Quanta"]
+    lines, total = [], 0
+    while total < size:
+        line = rng.choice(LINE_TEMPLATES).format(name=rng.choice(names), n=rng.randint(1, 99))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_format_analysis_summary(raw_response: str) -> str:
+    lines = raw_response.split('\n')
+    summary = "🔍 **FinRizz Analysis Summary**\n\n"
+    tokens_found = []
+    for line in lines:
+        if any(keyword in line.lower() for keyword in ['token', 'project', 'divine', 'redotpay', 'uptop']):
+            if len(line.strip()) < 100 and '|' not in line:
+                tokens_found.append(line.strip())
+    if tokens_found:
+        summary += "📊 **Top Discoveries:**\n"
+        for i, token in enumerate(tokens_found[:3], 1):
+            if token and not token.startswith('#'):
+                summary += f"{i}. {token}\n"
+        summary += "\n"
+    summary += "💡 **Key Insights:**\n"
+    insights = []
+    for line in lines:
+        if any(keyword in line.lower() for keyword in ['bullish', 'bearish', 'risk', 'recommendation', 'buy', 'sell', 'hold']):
+            if len(line.strip()) < 150 and line.strip() and not line.startswith('|'):
+                insights.append(line.strip().replace('*', '').replace('#', ''))
+    for insight in insights[:3]:
+        if insight:
+            summary += f"• {insight}\n"
+    summary += f"\n🤖 Analysis completed • {len(raw_response)} chars processed"
+    summary += "\n💬 Use /analyze <token> for specific token analysis"
+    return summary
+
+
+def legacy_recommendation(raw_response: str) -> str:
+    for line in raw_response.split('\n'):
+        if any(word in line.lower() for word in ['buy', 'bullish', 'positive']):
+            return "BUY 🟢"
+        elif any(word in line.lower() for word in ['sell', 'bearish', 'negative', 'risk']):
+            return "SELL 🔴"
+    return "HOLD"
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report keyword extraction benchmark")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 8], help="Report sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Parity on many small mixed reports, including ones where the first signal line is late
+    for seed in range(200):
+        report = llm_report(random.Random(seed).randint(50, 5000), seed)
+        assert bot.format_analysis_summary(report) == legacy_format_analysis_summary(report), seed
+        assert legacy_recommendation(report) in bot.format_token_analysis(report, "0xabc"), seed
+    print("✅ Output identical to the previous formatters on 200 reports")
+
+    extractor = KeywordExtractor(DEFAULT_KEYWORDS)
+    print("=" * 74)
+    print(f"{'report':<10}{'legacy summary ms':>20}{'summary ms':>13}{'speedup':>10}{'classify ms':>14}")
+    print("-" * 74)
+    for megabytes in args.sizes:
+        report = llm_report(int(megabytes * 1_000_000))
+        legacy = best_of(lambda: legacy_format_analysis_summary(report), args.repeat)
+        current = best_of(lambda: bot.format_analysis_summary(report), args.repeat)
+        classify = best_of(lambda: extractor.classify(report), args.repeat)
+        print(f"{megabytes:>6.1f} MB{legacy * 1000:>20.1f}{current * 1000:>13.1f}"
+              f"{legacy / current:>9.1f}x{classify * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
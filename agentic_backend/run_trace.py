@@ -0,0 +1,297 @@
+"""
+Structured instrumentation for agent and team runs.
+
+agno's `debug_mode` prints verbose logs but no numbers. RunTrace is fed the
+events of a streamed run (`observe(event)`) and records, per agent run and
+per tool call:
+
+- wall time
+- LLM time to first token (streamed runs)
+- tokens in/out and generation speed (output tokens per second after the
+  first token)
+- model request count and errors
+
+A finished trace is aggregated into `agent_metrics` (per-agent and per-tool
+counts and percentiles, see `AgentMetrics.snapshot()`) and appended as one
+JSON line to AGENT_TRACE_PATH (default agent_traces.jsonl; empty disables).
+The same numbers are exported as Prometheus metrics (finrizz_agent_*,
+finrizz_tool_*, finrizz_runs_total) in the registry the bot serves at
+/metrics (see bot_metrics).
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+from bot_metrics import RUN_BUCKETS, Counter, Histogram
+
+RUNS = Counter("finrizz_runs_total", "Team and parallel runs by command and outcome", ["command", "outcome"])
+AGENT_RUNS = Counter("finrizz_agent_runs_total", "Agent runs by agent and outcome", ["agent", "outcome"])
+AGENT_RUN_SECONDS = Histogram("finrizz_agent_run_duration_seconds", "Wall time of agent runs", ["agent"],
+                              buckets=RUN_BUCKETS)
+AGENT_TTFT_SECONDS = Histogram("finrizz_agent_ttft_seconds", "LLM time to first token of agent runs", ["agent"],
+                               buckets=RUN_BUCKETS)
+AGENT_TOKENS = Counter("finrizz_agent_tokens_total", "LLM tokens by agent and direction (input/output)",
+                       ["agent", "direction"])
+TOOL_CALLS = Counter("finrizz_tool_calls_total", "Agent tool calls by tool and outcome", ["tool", "outcome"])
+TOOL_SECONDS = Histogram("finrizz_tool_duration_seconds", "Latency of agent tool calls", ["tool"],
+                         buckets=RUN_BUCKETS)
+
+
+class RunTrace:
+    """
+    Spans and token counts for one team or parallel run.
+
+    Thread-safe: parallel specialists feed the same trace from several threads.
+
+    Args:
+        command: Bot command (or other label) the run serves
+        run_id: Identifier written to the trace (defaults to a random id)
+        mode: Orchestration mode, for the trace record
+    """
+
+    def __init__(self, command: str, run_id: Optional[str] = None, mode: str = ""):
+        self.command = command
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.mode = mode
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.agents: Dict[str, Dict] = {}  # agno run_id -> agent span
+        self.tools: List[Dict] = []
+        self._open_tools: Dict[str, Dict] = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _offset(self) -> float:
+        return time.perf_counter() - self._start
+
+    def _agent(self, event) -> Dict:
+        name = getattr(event, "agent_name", "") or getattr(event, "team_name", "") or "unknown"
+        run_id = getattr(event, "run_id", None) or name
+        span = self.agents.get(run_id)
+        if span is None:
+            span = self.agents[run_id] = {
+                "agent": name, "model": getattr(event, "model", "") or "", "team": not getattr(event, "agent_name", ""),
+                "start_s": self._offset(), "duration_s": None, "ttft_s": None,
+                "input_tokens": 0, "output_tokens": 0, "model_requests": 0, "error": None,
+            }
+        return span
+
+    def observe(self, event):
+        """Record one agno run event (agent or team, including forwarded member events)."""
+        kind = getattr(event, "event", "")
+        with self._lock:
+            if kind in ("RunStarted", "TeamRunStarted"):
+                span = self._agent(event)
+                span["model"] = getattr(event, "model", "") or span["model"]
+            elif kind in ("ModelRequestCompleted", "TeamModelRequestCompleted"):
+                span = self._agent(event)
+                span["model_requests"] += 1
+                if span["ttft_s"] is None and getattr(event, "time_to_first_token", None) is not None:
+                    span["ttft_s"] = event.time_to_first_token
+            elif kind in ("ToolCallStarted", "TeamToolCallStarted"):
+                tool = getattr(event, "tool", None)
+                span = self._agent(event)
+                call = {"tool": getattr(tool, "tool_name", None) or "unknown", "agent": span["agent"],
+                        "start_s": self._offset(), "duration_s": None, "error": False}
+                self._open_tools[getattr(tool, "tool_call_id", None) or str(id(call))] = call
+                self.tools.append(call)
+            elif kind in ("ToolCallCompleted", "TeamToolCallCompleted", "ToolCallError", "TeamToolCallError"):
+                tool = getattr(event, "tool", None)
+                call = self._open_tools.pop(getattr(tool, "tool_call_id", None), None)
+                if call is None:
+                    call = {"tool": getattr(tool, "tool_name", None) or "unknown", "agent": self._agent(event)["agent"],
+                            "start_s": self._offset(), "duration_s": None, "error": False}
+                    self.tools.append(call)
+                metrics = getattr(tool, "metrics", None)
+                measured = getattr(metrics, "duration", None)
+                call["duration_s"] = measured if measured is not None else self._offset() - call["start_s"]
+                call["error"] = kind.endswith("Error") or bool(getattr(tool, "tool_call_error", False))
+            elif kind in ("RunCompleted", "TeamRunCompleted"):
+                self._complete(self._agent(event), getattr(event, "metrics", None))
+            elif kind in ("RunError", "TeamRunError"):
+                span = self._agent(event)
+                span["error"] = str(getattr(event, "content", None) or "error")
+                span["duration_s"] = self._offset() - span["start_s"]
+
+    def _complete(self, span: Dict, metrics):
+        span["duration_s"] = self._offset() - span["start_s"]
+        if metrics is not None:
+            span["input_tokens"] = metrics.input_tokens or 0
+            span["output_tokens"] = metrics.output_tokens or 0
+            if span["ttft_s"] is None:
+                span["ttft_s"] = metrics.time_to_first_token
+
+    def finish(self, error: Optional[BaseException] = None):
+        """Close the trace and hand it to the metrics registry."""
+        with self._lock:
+            if self.duration is not None:
+                return
+            self.duration = self._offset()
+            if error is not None:
+                self.error = f"{type(error).__name__}: {error}"
+        agent_metrics.record(self)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            agents = [dict(span, tokens_per_s=tokens_per_second(span)) for span in self.agents.values()]
+            tools = [dict(call) for call in self.tools]
+        return {
+            "run_id": self.run_id,
+            "command": self.command,
+            "mode": self.mode,
+            "started_at": self.started_at,
+            "duration_s": self.duration,
+            "error": self.error,
+            "input_tokens": sum(span["input_tokens"] for span in agents),
+            "output_tokens": sum(span["output_tokens"] for span in agents),
+            "agents": agents,
+            "tools": tools,
+        }
+
+
+def run_traced(agent, prompt: str, trace: RunTrace, finish: bool = True) -> str:
+    """
+    Run ``agent`` with event streaming into ``trace`` and return its content (blocking).
+
+    With ``finish`` the trace is closed when the run ends; pass False when
+    the agent is one step of a larger traced run.
+    """
+    final, deltas, error = None, [], None
+    try:
+        for event in agent.run(prompt, stream=True, stream_events=True):
+            trace.observe(event)
+            kind = getattr(event, "event", "")
+            if kind == "RunContent" and isinstance(event.content, str):
+                deltas.append(event.content)
+            elif kind == "RunCompleted":
+                final = event.content
+            elif kind == "RunError":
+                raise RuntimeError(getattr(event, "content", None) or f"{agent.name} run failed")
+        return str(final if final is not None else "".join(deltas))
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if finish:
+            trace.finish(error)
+
+
+def tokens_per_second(span: Dict) -> Optional[float]:
+    """Output tokens per second of generation (after the first token when TTFT is known)."""
+    if not span.get("output_tokens") or not span.get("duration_s"):
+        return None
+    generating = span["duration_s"] - (span.get("ttft_s") or 0.0)
+    if generating <= 0:
+        generating = span["duration_s"]
+    return span["output_tokens"] / generating
+
+
+def _percentile(samples, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class AgentMetrics:
+    """
+    Per-agent and per-tool aggregates over recent traces.
+
+    Args:
+        trace_path: JSONL file each finished trace is appended to (None: don't write)
+        window: Samples kept per agent/tool for percentiles
+    """
+
+    def __init__(self, trace_path: Optional[str] = None, window: int = 500):
+        self.trace_path = trace_path
+        self.runs = 0
+        self.failed_runs = 0
+        self._agents: Dict[str, Dict] = defaultdict(lambda: {
+            "runs": 0, "errors": 0, "input_tokens": 0, "output_tokens": 0,
+            "duration": deque(maxlen=window), "ttft": deque(maxlen=window), "tps": deque(maxlen=window),
+        })
+        self._tools: Dict[str, Dict] = defaultdict(lambda: {"calls": 0, "errors": 0, "duration": deque(maxlen=window)})
+        self._lock = threading.Lock()
+
+    def record(self, trace: RunTrace):
+        record = trace.to_dict()
+        with self._lock:
+            self.runs += 1
+            self.failed_runs += record["error"] is not None
+            RUNS.labels(record["command"], _outcome(record["error"])).inc()
+            for span in record["agents"]:
+                _export_span(span)
+                stats = self._agents[span["agent"]]
+                stats["runs"] += 1
+                stats["errors"] += span["error"] is not None
+                stats["input_tokens"] += span["input_tokens"]
+                stats["output_tokens"] += span["output_tokens"]
+                for key, value in (("duration", span["duration_s"]), ("ttft", span["ttft_s"]),
+                                   ("tps", span["tokens_per_s"])):
+                    if value is not None:
+                        stats[key].append(value)
+            for call in record["tools"]:
+                TOOL_CALLS.labels(call["tool"], _outcome(call["error"])).inc()
+                if call["duration_s"] is not None:
+                    TOOL_SECONDS.labels(call["tool"]).observe(call["duration_s"])
+                stats = self._tools[call["tool"]]
+                stats["calls"] += 1
+                stats["errors"] += call["error"]
+                if call["duration_s"] is not None:
+                    stats["duration"].append(call["duration_s"])
+            if self.trace_path:
+                try:
+                    with open(self.trace_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(record) + "\n")
+                except OSError as e:
+                    print(f"⚠️ Could not write run trace: {e}")
+
+    def snapshot(self) -> Dict:
+        """Counts, token totals and p50/p95 timings per agent and per tool."""
+        def rounded(value, digits=3):
+            return None if value is None else round(value, digits)
+
+        with self._lock:
+            agents = {
+                name: {
+                    "runs": s["runs"], "errors": s["errors"],
+                    "input_tokens": s["input_tokens"], "output_tokens": s["output_tokens"],
+                    "p50_s": rounded(_percentile(s["duration"], 50)), "p95_s": rounded(_percentile(s["duration"], 95)),
+                    "ttft_p50_s": rounded(_percentile(s["ttft"], 50)), "ttft_p95_s": rounded(_percentile(s["ttft"], 95)),
+                    "tokens_per_s": rounded(statistics.median(s["tps"]), 1) if s["tps"] else None,
+                }
+                for name, s in self._agents.items()
+            }
+            tools = {
+                name: {
+                    "calls": s["calls"], "errors": s["errors"],
+                    "p50_s": rounded(_percentile(s["duration"], 50)), "p95_s": rounded(_percentile(s["duration"], 95)),
+                }
+                for name, s in self._tools.items()
+            }
+            return {"runs": self.runs, "failed_runs": self.failed_runs, "agents": agents, "tools": tools}
+
+
+def _outcome(error) -> str:
+    return "error" if error else "ok"
+
+
+def _export_span(span: Dict):
+    agent = span["agent"]
+    AGENT_RUNS.labels(agent, _outcome(span["error"])).inc()
+    AGENT_TOKENS.labels(agent, "input").inc(span["input_tokens"])
+    AGENT_TOKENS.labels(agent, "output").inc(span["output_tokens"])
+    if span["duration_s"] is not None:
+        AGENT_RUN_SECONDS.labels(agent).observe(span["duration_s"])
+    if span["ttft_s"] is not None:
+        AGENT_TTFT_SECONDS.labels(agent).observe(span["ttft_s"])
+
+
+agent_metrics = AgentMetrics(trace_path=os.getenv("AGENT_TRACE_PATH", "agent_traces.jsonl") or None)
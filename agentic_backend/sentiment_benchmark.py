@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming sentiment pipeline at 1M posts per minute.
+
+Generates a minute of posts (mostly human accounts posting once or twice,
+plus a set of bot accounts posting every few seconds) about a few hundred
+cashtags, then measures on one core:
+
+- baseline: the previous get_sentiment approach (Counter pass, then
+  substring checks per post)
+- pipeline: SentimentPipeline.ingest in batches from an in-memory iterator
+- pipeline + file: the same posts read back from a JSONL file by
+  PostFileReader (JSON parsing included)
+
+and checks the sketch's bot flags against exact per-account counts.
+
+    python sentiment_benchmark.py --posts 1000000 --batch 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from sentiment_stream import PostFileReader, SentimentPipeline
+
+PHRASES = [
+    "So bullish on ${t}! To the moon 🚀", "Selling all my ${t}, this is a scam", "${t} breakout incoming, accumulate",
+    "Just read the ${t} whitepaper, impressive tech", "Feeling uncertain about ${t} price action",
+    "${t} looks overvalued, expect a dump", "gm, watching ${t} and ${u} today", "${t} partnership news, buying more",
+    "Is ${t} a rug? devs went quiet", "Holding ${t}, nothing to add",
+]
+BOT_PHRASES = ["Buy ${t} now! Guaranteed 100x! #crypto", "Don't miss out on ${t}! #altcoin", "Join the ${t} revolution!"]
+
+
+def generate(posts: int, humans: int, bots: int, tokens: int, seconds: float, seed: int):
+    rng = random.Random(seed)
+    symbols = [f"TK{index}" for index in range(tokens)]
+    popular = [symbols[min(int(rng.paretovariate(1.1)) - 1, tokens - 1)] for _ in range(4096)]
+    bot_share = 0.1
+    result = []
+    for index in range(posts):
+        stamp = index * seconds / posts
+        token, other = rng.choice(popular), rng.choice(popular)
+        if rng.random() < bot_share:
+            account = f"bot_{rng.randrange(bots)}"
+            text = rng.choice(BOT_PHRASES).replace("${t}", f"${token}")
+        else:
+            account = f"user_{rng.randrange(humans)}"
+            text = rng.choice(PHRASES).replace("${t}", f"${token}").replace("${u}", f"${other}")
+        result.append({"account": account, "text": text, "timestamp": stamp})
+    return result
+
+
+def baseline(posts):
+    """The previous implementation, generalized to many tokens."""
+    counts = Counter(post["account"] for post in posts)
+    summary = Counter()
+    for post in posts:
+        if counts[post["account"]] > 3:
+            continue
+        content = post["text"]
+        if "bullish" in content or "impressive" in content:
+            summary["bullish"] += 1
+        if "scam" in content or "uncertain" in content:
+            summary["bearish"] += 1
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming sentiment benchmark")
+    parser.add_argument("--posts", type=int, default=1_000_000, help="Posts in the simulated minute")
+    parser.add_argument("--humans", type=int, default=500_000)
+    parser.add_argument("--bots", type=int, default=2_000)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    posts = generate(args.posts, args.humans, args.bots, args.tokens, 60.0, args.seed)
+    print(f"🐦 {args.posts:,} posts in one simulated minute, {args.humans:,} human and {args.bots:,} bot accounts, "
+          f"{args.tokens} cashtags, batches of {args.batch:,}")
+    print("=" * 66)
+    print(f"{'mode':<22}{'seconds':>10}{'posts/min':>16}{'vs 1M/min':>12}")
+    print("-" * 66)
+
+    def report(label, seconds):
+        rate = args.posts / seconds * 60
+        print(f"{label:<22}{seconds:>10.2f}{rate:>16,.0f}{rate / 1e6:>11.1f}x")
+
+    start = time.perf_counter()
+    baseline(posts)
+    report("baseline", time.perf_counter() - start)
+
+    pipeline = SentimentPipeline()
+    start = time.perf_counter()
+    pipeline.ingest_stream(iter(posts), batch_size=args.batch)
+    report("pipeline", time.perf_counter() - start)
+
+    path = os.path.join(tempfile.mkdtemp(), "posts.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+    from_file = SentimentPipeline()
+    start = time.perf_counter()
+    from_file.ingest_stream(PostFileReader(path).read_new(), batch_size=args.batch)
+    report("pipeline + file", time.perf_counter() - start)
+    os.remove(path)
+
+    # Bot flags vs exact counts (the whole run fits in the 60s bot window)
+    exact = Counter(post["account"] for post in posts)
+    truly_bots = {account for account, count in exact.items() if count > pipeline.bot_max_posts}
+    stats = pipeline.stats()
+    print("-" * 66)
+    print(f"🤖 {len(truly_bots):,} accounts over {pipeline.bot_max_posts} posts/min; "
+          f"{stats['bot_posts']:,} posts flagged as bot ({stats['bot_posts'] / args.posts:.1%}, "
+          f"{sum(exact[a] for a in truly_bots) / args.posts:.1%} exact, flagged from their "
+          f"{pipeline.bot_max_posts + 1}th post), sketch {stats['sketch_mb']} MB")
+    top = pipeline.sentiment("TK0")
+    print(f"📈 $TK0: {top['authentic_sentiment']} (score {top['sentiment_score']}), "
+          f"{top['total_authentic_posts']:,} authentic posts, {top['bot_posts']:,} bot posts")
+
+
+if __name__ == "__main__":
+    main()
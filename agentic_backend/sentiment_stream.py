@@ -0,0 +1,359 @@
+"""
+Streaming sentiment and bot detection for the discovery agent's Twitter tool.
+
+Posts (account, text, timestamp) are ingested in batches from a JSONL file
+(`PostFileReader`, which follows the file as it grows) or any iterator,
+and each batch is processed in one pass:
+
+- bot detection: per-account post counts over the last `bot_window`
+  seconds come from a sliding-window count-min sketch (a ring of sketches,
+  one per sub-window, so memory is fixed however many accounts post).
+  Accounts above `bot_max_posts` in the window are bots, and their posts
+  are left out of sentiment.
+- scoring: one regex scan over the whole batch finds lexicon words and
+  cashtags; matches are mapped back to posts by offset and summed with
+  NumPy, instead of substring checks per post
+- aggregates: bullish / bearish / neutral / bot post counts per token
+  (cashtag) in a ring of time buckets covering the last `window` seconds
+
+Time is the posts' own timestamps, so replayed files age out like live ones.
+
+Needs numpy (pip install numpy). The shared pipeline (`shared_sentiment_pipeline()`)
+is built on first use, since its sketch takes about 24 MB; without a post
+stream (TWEET_STREAM_PATH unset) the Twitter tool keeps answering from
+`sample_sentiment()` instead.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the sentiment pipeline needs it
+    np = None
+
+# word -> weight; positive is bullish
+DEFAULT_LEXICON: Dict[str, float] = {
+    "bullish": 1, "moon": 1, "mooning": 1, "pump": 0.5, "buy": 0.5, "buying": 0.5, "long": 0.5,
+    "undervalued": 1, "impressive": 1, "breakout": 1, "gem": 1, "accumulate": 1, "accumulating": 1,
+    "adoption": 0.5, "partnership": 0.5, "ath": 0.5, "hodl": 0.5, "rocket": 0.5,
+    "bearish": -1, "scam": -1, "rug": -1, "rugpull": -1, "dump": -1, "dumping": -1, "sell": -0.5,
+    "selling": -0.5, "short": -0.5, "overvalued": -1, "uncertain": -0.5, "exploit": -1, "hack": -1,
+    "hacked": -1, "ponzi": -1, "crash": -1, "fud": -0.5, "exit": -0.5, "honeypot": -1,
+}
+
+FIELDS = ("bullish", "bearish", "neutral", "bot")
+# Posts are joined with this separator for one scan per batch; it matches as a token so
+# a running count of separators maps every match back to its post
+SEPARATOR = "\x1e"
+
+
+class WindowedCountMin:
+    """
+    Count-min sketch over a sliding time window.
+
+    The window is split into `buckets` sub-windows, each with its own
+    depth x width counter table; a sub-window is cleared when time moves
+    past it. Estimates never undercount.
+
+    Args:
+        window: Seconds covered
+        buckets: Sub-windows per window (finer expiry, more memory)
+        width: Counters per row (a power of two)
+        depth: Hash rows
+        seed: Seed for the hash multipliers
+    """
+
+    def __init__(self, window: float = 60.0, buckets: int = 6, width: int = 2 ** 18, depth: int = 4, seed: int = 7):
+        self.window = window
+        self.buckets = buckets
+        self.bucket_seconds = window / buckets
+        self.width = width
+        self.depth = depth
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._tables = np.zeros((buckets, depth, width), dtype=np.int32)
+        self._epochs = np.full(buckets, -1, dtype=np.int64)
+        self._rows = np.arange(depth)[:, None]
+
+    def _rotate(self, now: float) -> int:
+        epoch = int(now // self.bucket_seconds)
+        stale = self._epochs <= epoch - self.buckets
+        if stale.any():
+            self._tables[stale] = 0
+            self._epochs[stale] = -1
+        slot = epoch % self.buckets
+        if self._epochs[slot] != epoch:
+            self._tables[slot] = 0
+            self._epochs[slot] = epoch
+        return slot
+
+    def _columns(self, keys: "np.ndarray") -> "np.ndarray":
+        # multiply-shift hashing, one row per multiplier
+        return ((keys[None, :] * self._multipliers[:, None]) >> self._shift).astype(np.int64)
+
+    def add(self, keys: "np.ndarray", now: float) -> "np.ndarray":
+        """Count one occurrence per key (uint64 hashes) and return each key's windowed estimate."""
+        slot = self._rotate(now)
+        columns = self._columns(keys)
+        with np.errstate(over="ignore"):
+            for row in range(self.depth):
+                np.add.at(self._tables[slot, row], columns[row], 1)
+        windowed = sum(self._tables[live, self._rows, columns] for live in np.flatnonzero(self._epochs >= 0))
+        return windowed.min(axis=0)  # depth x keys -> keys
+
+    @property
+    def nbytes(self) -> int:
+        return self._tables.nbytes
+
+
+def hash_accounts(accounts: Sequence[str]) -> "np.ndarray":
+    return np.fromiter((hash(account) for account in accounts), dtype=np.int64, count=len(accounts)).view(np.uint64)
+
+
+class SentimentPipeline:
+    """
+    Batch-at-a-time sentiment and bot detection with rolling per-token aggregates.
+
+    Args:
+        window: Seconds of posts behind each token's aggregates
+        buckets: Time buckets per window
+        bot_window: Seconds over which account post rates are counted
+        bot_max_posts: Posts per bot_window above which an account is a bot
+        sketch_width / sketch_depth: Count-min sketch size (memory is
+            6 * depth * width * 4 bytes)
+        lexicon: word -> weight (defaults to DEFAULT_LEXICON)
+        recent_bots: Bot accounts remembered per token for reports
+    """
+
+    def __init__(self, window: float = 3600.0, buckets: int = 12, bot_window: float = 60.0, bot_max_posts: int = 3,
+                 sketch_width: int = 2 ** 18, sketch_depth: int = 4, lexicon: Dict[str, float] = None,
+                 recent_bots: int = 20):
+        if np is None:
+            raise RuntimeError("The sentiment pipeline needs numpy (pip install numpy)")
+        self.window = window
+        self.buckets = buckets
+        self.bucket_seconds = window / buckets
+        self.bot_max_posts = bot_max_posts
+        self.recent_bots = recent_bots
+        self.rates = WindowedCountMin(window=bot_window, width=sketch_width, depth=sketch_depth)
+        self.lexicon = {word.lower(): float(weight) for word, weight in (lexicon or DEFAULT_LEXICON).items()}
+        words = "|".join(re.escape(word) for word in sorted(self.lexicon, key=len, reverse=True))
+        self._words = re.compile(rf"{SEPARATOR}|\b(?:{words})\b")
+        self._cashtags = re.compile(rf"{SEPARATOR}|\$[a-z][a-z0-9]{{0,9}}\b")
+        self._token_ids: Dict[str, int] = {}  # "$tag" -> token
+        self._token_names: List[str] = []
+        self._counts = np.zeros((0, buckets, len(FIELDS)), dtype=np.int64)  # token x bucket x field
+        self._epochs = np.full(buckets, -1, dtype=np.int64)
+        self._bots: Dict[int, deque] = {}
+        self._lock = threading.Lock()
+        self.now = 0.0
+        self.posts = 0
+        self.bot_posts = 0
+
+    def _token(self, cashtag: str) -> int:
+        token = self._token_ids.get(cashtag)
+        if token is None:
+            token = self._token_ids[cashtag] = len(self._token_names)
+            self._token_names.append(cashtag[1:].upper())
+            if token >= len(self._counts):
+                grown = np.zeros((max(16, 2 * len(self._counts)), self.buckets, len(FIELDS)), dtype=np.int64)
+                grown[:len(self._counts)] = self._counts
+                self._counts = grown
+        return token
+
+    def _rotate(self, now: float) -> int:
+        epoch = int(now // self.bucket_seconds)
+        stale = self._epochs <= epoch - self.buckets
+        if stale.any():
+            self._counts[:, stale] = 0
+            self._epochs[stale] = -1
+        slot = epoch % self.buckets
+        if self._epochs[slot] != epoch:
+            self._counts[:, slot] = 0
+            self._epochs[slot] = epoch
+        return slot
+
+    def ingest(self, posts: Sequence) -> int:
+        """
+        Process one batch of posts: (account, text[, timestamp]) tuples or
+        dicts with account/user, text and timestamp. Returns posts ingested.
+        """
+        if not posts:
+            return 0
+        if isinstance(posts[0], dict):
+            accounts = [post.get("account") or post.get("user") or "" for post in posts]
+            texts = [post.get("text") or "" for post in posts]
+            stamps = [post.get("timestamp") for post in posts]
+        else:
+            accounts = [post[0] for post in posts]
+            texts = [post[1] for post in posts]
+            stamps = [post[2] if len(post) > 2 else None for post in posts]
+        newest = max((stamp for stamp in stamps if stamp is not None), default=None)
+        count = len(texts)
+
+        # One C-level scan per pattern over the whole batch
+        joined = SEPARATOR.join(texts).lower()
+        if joined.count(SEPARATOR) != count - 1:
+            joined = SEPARATOR.join(text.replace(SEPARATOR, " ") for text in texts).lower()
+        words = self._words.findall(joined)
+        post_of_word = np.cumsum(np.fromiter(map(SEPARATOR.__eq__, words), dtype=bool, count=len(words)))
+        weights = np.fromiter(map(self.lexicon.get, words, repeat(0.0, len(words))), dtype=np.float64,
+                              count=len(words))
+        scores = np.bincount(post_of_word, weights=weights, minlength=count)
+        label = np.where(scores > 0, 0, np.where(scores < 0, 1, 2))  # index into FIELDS
+        cashtags = self._cashtags.findall(joined)
+
+        with self._lock:
+            self.now = max(self.now, newest if newest is not None else time.time())
+            estimates = self.rates.add(hash_accounts(accounts), self.now)
+            bot = estimates > self.bot_max_posts
+            label[bot] = 3
+            self.posts += count
+            self.bot_posts += int(bot.sum())
+            separators = np.fromiter(map(SEPARATOR.__eq__, cashtags), dtype=bool, count=len(cashtags))
+            if len(cashtags) == count - 1:
+                return count  # no mentions
+
+            # A post counts once per token it mentions
+            post_of = np.cumsum(separators)[~separators]
+            tokens = np.fromiter(map(self._token, (tag for tag in cashtags if tag != SEPARATOR)), dtype=np.int64,
+                                 count=len(post_of))
+            pairs = np.unique(post_of * len(self._token_names) + tokens)
+            post_of, tokens = pairs // len(self._token_names), pairs % len(self._token_names)
+            slot = self._rotate(self.now)
+            cells = np.bincount(tokens * len(FIELDS) + label[post_of], minlength=len(self._token_names) * len(FIELDS))
+            self._counts[:len(self._token_names), slot] += cells.reshape(-1, len(FIELDS))
+            for post, token in zip(post_of[bot[post_of]].tolist(), tokens[bot[post_of]].tolist()):
+                recent = self._bots.setdefault(token, deque(maxlen=self.recent_bots))
+                if accounts[post] not in recent:
+                    recent.append(accounts[post])
+        return count
+
+    def ingest_stream(self, source: Iterable, batch_size: int = 5000) -> int:
+        """Ingest posts from any iterable in batches of batch_size."""
+        total, batch = 0, []
+        for post in source:
+            batch.append(post)
+            if len(batch) >= batch_size:
+                total += self.ingest(batch)
+                batch = []
+        return total + self.ingest(batch)
+
+    def sentiment(self, token_symbol: str) -> Optional[Dict]:
+        """Rolling sentiment for a token over the window, or None if it has not been seen."""
+        symbol = token_symbol.strip().lstrip("$").upper()
+        with self._lock:
+            token = self._token_ids.get(f"${symbol.lower()}")
+            if token is None:
+                return None
+            self._rotate(self.now)
+            totals = self._counts[token].sum(axis=0)
+            bots = list(self._bots.get(token, ()))
+        bullish, bearish, neutral, bot = (int(value) for value in totals)
+        scored = bullish + bearish
+        return {
+            "token": symbol,
+            "authentic_sentiment": "Bullish" if bullish > bearish else "Bearish",
+            "sentiment_score": round((bullish - bearish) / scored, 3) if scored else 0.0,
+            "bullish_posts": bullish,
+            "bearish_posts": bearish,
+            "neutral_posts": neutral,
+            "total_authentic_posts": bullish + bearish + neutral,
+            "bot_posts": bot,
+            "detected_bots": bots,
+            "window_seconds": self.window,
+        }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"posts": self.posts, "bot_posts": self.bot_posts, "tokens": len(self._token_names),
+                    "sketch_mb": round(self.rates.nbytes / 1024 / 1024, 1)}
+
+
+class PostFileReader:
+    """
+    Follows a JSONL file of posts ({"account", "text", "timestamp"} per line),
+    returning only lines appended since the last read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def read_new(self) -> Iterator[Dict]:
+        with self._lock:
+            try:
+                with open(self.path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size < self._offset:
+                        self._offset = 0  # truncated or rotated
+                    f.seek(self._offset)
+                    data = f.read()
+            except OSError:
+                return iter(())
+            end = data.rfind(b"\n") + 1  # leave a partial last line for the next read
+            self._offset += end
+        posts = []
+        for line in data[:end].splitlines():
+            try:
+                posts.append(json.loads(line))
+            except ValueError:
+                continue
+        return iter(posts)
+
+
+def sample_sentiment(token_symbol: str) -> Dict:
+    """
+    Sentiment over a fixed sample of posts, for when no post stream is
+    configured. Accounts posting more than 3 times are flagged as bots.
+    """
+    sample = [
+        ("user_a", f"So bullish on ${token_symbol}! To the moon! 🚀"),
+        ("user_b", f"I'm selling all my ${token_symbol}. This project is a scam."),
+        ("bot_1", f"Buy ${token_symbol} now! Guaranteed 100x! #crypto"),
+        ("bot_1", f"Don't miss out on ${token_symbol}! #altcoin"),
+        ("user_c", f"Just read the whitepaper for ${token_symbol}. Very impressive tech."),
+        ("bot_1", f"${token_symbol} is the future of finance! #DeFi"),
+        ("bot_1", f"Join the ${token_symbol} revolution!"),
+        ("user_d", f"Feeling uncertain about ${token_symbol}'s recent price action."),
+    ]
+    post_counts = Counter(account for account, _ in sample)
+    authentic = [content for account, content in sample if post_counts[account] <= 3]
+    bullish = sum(1 for content in authentic if "bullish" in content or "impressive" in content)
+    bearish = sum(1 for content in authentic if "scam" in content or "uncertain" in content)
+    return {
+        "authentic_sentiment": "Bullish" if bullish > bearish else "Bearish",
+        "bullish_posts": bullish,
+        "bearish_posts": bearish,
+        "total_authentic_posts": len(authentic),
+        "detected_bots": [account for account, count in post_counts.items() if count > 3],
+    }
+
+
+_stream_path = os.getenv("TWEET_STREAM_PATH", "")
+post_reader: Optional[PostFileReader] = PostFileReader(_stream_path) if _stream_path else None
+
+_sentiment_pipeline: Optional[SentimentPipeline] = None
+_sentiment_pipeline_lock = threading.Lock()
+
+
+def shared_sentiment_pipeline() -> Optional[SentimentPipeline]:
+    """The process-wide pipeline, built on first use; None without numpy."""
+    global _sentiment_pipeline
+    if _sentiment_pipeline is None and np is not None:
+        with _sentiment_pipeline_lock:
+            if _sentiment_pipeline is None:
+                _sentiment_pipeline = SentimentPipeline(
+                    window=float(os.getenv("SENTIMENT_WINDOW_SECONDS", "3600")),
+                    bot_window=float(os.getenv("BOT_WINDOW_SECONDS", "60")),
+                    bot_max_posts=int(os.getenv("BOT_MAX_POSTS", "3")),
+                )
+    return _sentiment_pipeline
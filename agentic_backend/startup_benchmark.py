@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bot startup with lazily built agents.
+
+Each sample is a fresh interpreter, so nothing is cached between runs:
+
+- import agents / import bot: `python -X importtime` cumulative time of
+  the module (what every bot restart and test import pays)
+- eager build: import plus building the model, agents and team at import
+  time, i.e. what importing agents cost before the factories
+- first get_team: building on the first request, cold vs after prewarm()
+
+    python startup_benchmark.py --runs 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# `setup` may reset `started` to time only its last step
+TIMED = """
+import time
+started = time.perf_counter()
+{setup}
+elapsed = time.perf_counter() - started
+print(f"ELAPSED {{elapsed}}")
+"""
+
+
+def run(code: str, importtime: bool = False) -> str:
+    env = dict(os.environ, FIRECRAWL_API_KEY=os.getenv("FIRECRAWL_API_KEY", "stand-in"))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    done = subprocess.run(command, cwd=HERE, env=env, capture_output=True, text=True, check=True)
+    return done.stdout + done.stderr
+
+
+def import_seconds(module: str) -> float:
+    """Cumulative -X importtime of a top-level module"""
+    output = run(f"import {module}", importtime=True)
+    match = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \| {module}$", output, re.M)
+    return int(match.group(1)) / 1e6
+
+
+def timed_seconds(setup: str) -> float:
+    output = run(TIMED.format(setup=setup))
+    return float(re.search(r"ELAPSED (\S+)", output).group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    measurements = (
+        ("import agents", lambda: import_seconds("agents")),
+        ("import bot", lambda: import_seconds("bot")),
+        ("eager build (old import)", lambda: timed_seconds("import agents; agents.prewarm(background=False)")),
+        ("first get_team, cold", lambda: timed_seconds(
+            "import agents\nstarted = time.perf_counter()\nagents.get_team()")),
+        ("first get_team, prewarmed", lambda: timed_seconds(
+            "import agents\nagents.prewarm(background=False)\nstarted = time.perf_counter()\nagents.get_team()")),
+    )
+
+    print(f"🚀 Bot startup, median of {args.runs} fresh interpreters")
+    print("=" * 52)
+    print(f"{'measurement':<30}{'median ms':>11}{'max ms':>11}")
+    print("-" * 52)
+    results = {}
+    for label, measure in measurements:
+        samples = [measure() for _ in range(args.runs)]
+        results[label] = statistics.median(samples)
+        print(f"{label:<30}{results[label] * 1000:>11.1f}{max(samples) * 1000:>11.1f}")
+    print("-" * 52)
+    print(f"⚡ import agents is {results['eager build (old import)'] / results['import agents']:.0f}x cheaper "
+          f"than building everything at import")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whale lookups against the subgraph, naive vs batched client.
+
+Replays whale agent lookups (token data, top holders, recent whale
+transfers, pool status, and the full holder list for concentration) for a
+few tokens against the local GraphQL stand-in with fixed latency per
+request. The head advances a block every --block-s seconds:
+
+- naive: one request per entity query, holders paged with `skip`, no cache
+- batched: one document per lookup, `id_gt` pages batched, no cache
+- batched + cache: as batched, with the block-scoped cache
+
+    python subgraph_benchmark.py --lookups 60 --latency-ms 80 --holders 2500
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from graph_stand_in import GraphStandIn
+from subgraph_client import (
+    MAX_PAGE_SIZE, SubgraphClient, holders_query, pools_query, token_query, top_holders_query,
+    whale_transfers_query,
+)
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def lookup_queries(token: str) -> dict:
+    return {
+        "token": token_query(token),
+        "top_holders": top_holders_query(token, 100),
+        "whale_transfers": whale_transfers_query(token, 50),
+        "pools": pools_query(token),
+        "holders": holders_query(token),
+    }
+
+
+def naive_lookup(client: SubgraphClient, token: str) -> dict:
+    """One request per query; the holder list paged with skip."""
+    results = {}
+    for name, query in lookup_queries(token).items():
+        if not query.paginate:
+            results[name] = client.execute("{ " + query.render("q") + " }")["q"]
+            continue
+        rows, skip = [], 0
+        while True:
+            page = query.render("q").replace(f"first: {query.first}", f"first: {query.first}, skip: {skip}", 1)
+            batch = client.execute("{ " + page + " }")["q"]
+            rows.extend(batch)
+            if len(batch) < MAX_PAGE_SIZE:
+                break
+            skip += len(batch)
+        results[name] = rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subgraph client benchmark")
+    parser.add_argument("--lookups", type=int, default=60)
+    parser.add_argument("--tokens", type=int, default=3)
+    parser.add_argument("--holders", type=int, default=2500)
+    parser.add_argument("--agents", type=int, default=4, help="Concurrent whale agent threads")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--block-s", type=float, default=1.0, help="Seconds per new block")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with GraphStandIn(tokens=args.tokens, holders=args.holders, latency=args.latency_ms / 1000) as graph:
+        rng = random.Random(args.seed)
+        plan = [rng.choice(graph.token_addresses) for _ in range(args.lookups)]
+        modes = (
+            ("naive", lambda client, token: naive_lookup(client, token), 0.0),
+            ("batched", lambda client, token: client.fetch(lookup_queries(token)), 0.0),
+            ("batched + cache", lambda client, token: client.fetch(lookup_queries(token)), args.block_s),
+        )
+
+        print(f"🐋 {args.lookups} whale lookups over {args.tokens} tokens ({args.holders} holders each), "
+              f"{args.agents} agent threads, {args.latency_ms:.0f}ms per request, a block every {args.block_s}s")
+        print("=" * 72)
+        print(f"{'mode':<18}{'wall s':>9}{'requests':>10}{'per lookup':>12}{'p50 ms':>10}{'p95 ms':>10}")
+        print("-" * 72)
+        for label, lookup, head_ttl in modes:
+            client = SubgraphClient(graph.url, head_ttl=head_ttl)
+            before, latencies, done = graph.requests, [], threading.Event()
+
+            def produce_blocks():
+                while not done.wait(args.block_s):
+                    graph.advance()
+
+            def run(token):
+                start = time.perf_counter()
+                lookup(client, token)
+                latencies.append(time.perf_counter() - start)
+
+            threading.Thread(target=produce_blocks, daemon=True).start()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.agents) as pool:
+                list(pool.map(run, plan))
+            wall = time.perf_counter() - start
+            done.set()
+            client.close()
+            requests = graph.requests - before
+            print(f"{label:<18}{wall:>9.2f}{requests:>10}{requests / args.lookups:>12.2f}"
+                  f"{percentile(latencies, 50) * 1000:>10.0f}{percentile(latencies, 95) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+GraphQL client for the FinRizz tokenomics-risk subgraph.
+
+Queries the entities of graph/finrizz-tokenomics-risk-rust/schema.graphql
+(Token, Wallet, WhaleTransfer, LiquidityPool, LiquidityLock) for the whale
+agent's tools, keeping round trips per lookup to one or two:
+
+- batching: every query of a lookup goes out as one GraphQL document, each
+  under its own alias
+- consistent reads: all queries (and all pages) of a lookup are answered at
+  the same block; a request with no known block also asks for `_meta`,
+  and later pages are pinned to the block it returns
+- cursor pagination: paginated queries are ordered by id and continued
+  with `id_gt` (not `skip`, which the Graph caps and which gets slower
+  with depth); the next pages of several queries share one request
+- block-scoped cache: results are cached per (block, query). The head
+  block is re-learned at most every SUBGRAPH_HEAD_TTL seconds, so repeated
+  lookups within a block cost no round trip, and nothing is served from
+  an older block once the head has moved
+
+Entity ids follow graph_out in graph/finrizz-tokenomics-risk-rust/src/lib.rs:
+Token and Wallet ids are the bare address, lowercase hex without 0x
+(`Hex(..).to_string()`, the balance store key), one Wallet per holder.
+Queries take addresses in any form (`entity_id`); `address_of` turns an id
+back into a 0x address.
+
+SUBGRAPH_URL points at the deployment (gateway URL including the API key);
+without it `subgraph_client` is None.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from analysis_cache import normalize_address
+
+# The Graph serves at most this many entities per field
+MAX_PAGE_SIZE = 1000
+
+_HEX_ADDRESS = re.compile(r"^(0x)?[0-9a-fA-F]{40}$")
+
+
+def entity_id(address: str) -> str:
+    """The subgraph id of a token or wallet address: lowercase hex without 0x."""
+    address = address.strip()
+    if not _HEX_ADDRESS.match(address):
+        return normalize_address(address)  # not an EVM address: used as given
+    return address[2:].lower() if address[:2].lower() == "0x" else address.lower()
+
+
+def address_of(entity: str) -> str:
+    """The 0x address a Token or Wallet id stands for."""
+    return "0x" + entity.lower() if _HEX_ADDRESS.match(entity) and entity[:2].lower() != "0x" else entity
+
+
+class SubgraphError(RuntimeError):
+    """The subgraph answered with GraphQL errors or an unusable response."""
+
+
+def graphql_value(value: Any) -> str:
+    """Render a Python value as a GraphQL input literal."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float)):
+        return json.dumps(str(value))  # BigInt / BigDecimal filters take strings
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{key}: {graphql_value(item)}" for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(graphql_value(item) for item in value) + "]"
+    raise TypeError(f"Cannot render {type(value).__name__} as GraphQL")
+
+
+@dataclass
+class EntityQuery:
+    """
+    One collection query (e.g. `wallets`) of a batched lookup.
+
+    Args:
+        field: Root query field ("wallets", "whaleTransfers", ...)
+        selection: Fields to select, GraphQL syntax ("id balance token { id }")
+        where: Filter (`{"token": "0x..", "amount_gt": 10**18}`)
+        order_by / order_direction: Sort order (ignored when paginating, which orders by id)
+        first: Page size (at most 1000)
+        paginate: Follow `id_gt` cursors until the collection is exhausted
+    """
+
+    field: str
+    selection: str
+    where: Dict[str, Any] = field(default_factory=dict)
+    order_by: Optional[str] = None
+    order_direction: str = "desc"
+    first: int = 100
+    paginate: bool = False
+
+    def __post_init__(self):
+        self.first = max(1, min(self.first, MAX_PAGE_SIZE))
+        if self.paginate and "id" not in self.selection.split():
+            self.selection = f"id {self.selection}"
+
+    def render(self, alias: str, block: Optional[int] = None, cursor: Optional[str] = None) -> str:
+        where = dict(self.where)
+        if self.paginate:
+            order = "orderBy: id, orderDirection: asc"
+            if cursor is not None:
+                where["id_gt"] = cursor
+        elif self.order_by:
+            order = f"orderBy: {self.order_by}, orderDirection: {self.order_direction}"
+        else:
+            order = ""
+        arguments = [f"first: {self.first}"]
+        if order:
+            arguments.append(order)
+        if where:
+            arguments.append(f"where: {graphql_value(where)}")
+        if block is not None:
+            arguments.append(f"block: {{number: {block}}}")
+        return f"{alias}: {self.field}({', '.join(arguments)}) {{ {self.selection} }}"
+
+    def key(self) -> str:
+        """Cache key: the query without block or cursor."""
+        return self.render("q")
+
+
+class SubgraphClient:
+    """
+    Batched, paginated GraphQL client with a block-scoped result cache.
+
+    Thread-safe; agent threads share one instance (and its connection pool).
+
+    Args:
+        url: Subgraph GraphQL endpoint
+        timeout: Seconds allowed per request
+        head_ttl: Seconds the last seen head block is assumed current
+        cached_blocks: Number of recent blocks whose results are kept
+        max_connections: Connection pool size
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, head_ttl: float = 12.0, cached_blocks: int = 4,
+                 max_connections: int = 10):
+        self.url = url
+        self.timeout = timeout
+        self.head_ttl = head_ttl
+        self.cached_blocks = cached_blocks
+        self._client = httpx.Client(
+            timeout=httpx.Timeout(timeout, connect=min(3.0, timeout)),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._head: Optional[Tuple[float, int]] = None  # (learned_at, block)
+        self._cache: "OrderedDict[int, Dict[str, List[Dict]]]" = OrderedDict()  # block -> query key -> rows
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def close(self):
+        self._client.close()
+
+    def execute(self, document: str) -> Dict:
+        """POST one GraphQL document and return its `data`."""
+        with self._lock:
+            self.round_trips += 1
+        try:
+            response = self._client.post(self.url, json={"query": document})
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise SubgraphError(f"Subgraph request failed: {e}") from e
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", "unknown error") for error in payload["errors"])
+            raise SubgraphError(f"Subgraph query failed: {messages}")
+        if not isinstance(payload.get("data"), dict):
+            raise SubgraphError("Subgraph response has no data")
+        return payload["data"]
+
+    # --- Block-scoped cache ---
+
+    def _current_block(self) -> Optional[int]:
+        with self._lock:
+            if self._head is not None and time.monotonic() - self._head[0] < self.head_ttl:
+                return self._head[1]
+        return None
+
+    def _learn_head(self, block: int):
+        with self._lock:
+            if self._head is None or block >= self._head[1]:
+                self._head = (time.monotonic(), block)
+
+    def _cached(self, block: int, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            return self._cache.get(block, {}).get(key)
+
+    def _store(self, block: int, results: Dict[str, List[Dict]]):
+        with self._lock:
+            self._cache.setdefault(block, {}).update(results)
+            # Keep the newest blocks only
+            for old in sorted(self._cache)[:-self.cached_blocks]:
+                del self._cache[old]
+
+    def invalidate(self):
+        with self._lock:
+            self._head = None
+            self._cache.clear()
+
+    # --- Queries ---
+
+    def fetch(self, queries: Dict[str, EntityQuery]) -> Tuple[int, Dict[str, List[Dict]]]:
+        """
+        Run several entity queries at one block.
+
+        Queries already answered for the current head block come from the
+        cache; the rest share one request per page.
+
+        Returns:
+            (block number, rows per query name)
+        """
+        block = self._current_block()
+        results: Dict[str, List[Dict]] = {}
+        pending: Dict[str, Optional[str]] = {}  # query name -> cursor
+        for name, query in queries.items():
+            rows = self._cached(block, query.key()) if block is not None else None
+            if rows is not None:
+                results[name] = rows
+            else:
+                pending[name] = None
+        with self._lock:
+            self.counts["hits"] += len(results)
+            self.counts["misses"] += len(pending)
+
+        fetched: Dict[str, List[Dict]] = {name: [] for name in pending}
+        while pending:
+            fields = [] if block is not None else ["_meta { block { number } }"]
+            aliases = {f"q{index}": name for index, name in enumerate(pending)}
+            fields += [queries[name].render(alias, block, pending[name]) for alias, name in aliases.items()]
+            data = self.execute("{ " + " ".join(fields) + " }")
+            if block is None:
+                try:
+                    block = int(data["_meta"]["block"]["number"])
+                except (KeyError, TypeError, ValueError) as e:
+                    raise SubgraphError("Subgraph response has no _meta block") from e
+                self._learn_head(block)
+            for alias, name in aliases.items():
+                rows = data.get(alias)
+                if rows is None:
+                    rows = []
+                elif isinstance(rows, dict):
+                    rows = [rows]
+                fetched[name].extend(rows)
+                query = queries[name]
+                if query.paginate and len(rows) == query.first:
+                    pending[name] = rows[-1]["id"]
+                else:
+                    del pending[name]
+            with self._lock:
+                self.counts["pages"] += len(aliases)
+
+        self._store(block, {queries[name].key(): rows for name, rows in fetched.items()})
+        results.update(fetched)
+        return block, results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.counts["hits"] + self.counts["misses"]
+            return {
+                "round_trips": self.round_trips,
+                "pages": self.counts["pages"],
+                "hit_rate": round(self.counts["hits"] / lookups, 3) if lookups else 0.0,
+                "head_block": self._head[1] if self._head else None,
+            }
+
+
+# --- Whale agent queries ---
+
+WALLET_FIELDS = "id balance percentageOfSupply"
+TRANSFER_FIELDS = "id amount amountUSD timestamp txHash fromWallet { id } toWallet { id }"
+TOKEN_FIELDS = ("id name symbol decimals totalSupply circulatingSupply currentPriceUSD marketCapUSD "
+                "vestingCliffDate vestingDilutionPercent")
+POOL_FIELDS = "id lpTokenSupply totalLiquidityUSD isLiquidityLocked lockedPercentage"
+
+
+def token_query(token: str) -> EntityQuery:
+    return EntityQuery("tokens", TOKEN_FIELDS, where={"id": entity_id(token)}, first=1)
+
+
+def top_holders_query(token: str, limit: int = 100) -> EntityQuery:
+    return EntityQuery("wallets", WALLET_FIELDS, where={"token": entity_id(token)},
+                       order_by="balance", first=limit)
+
+
+def holders_query(token: str) -> EntityQuery:
+    """Every holder of a token, paginated."""
+    return EntityQuery("wallets", WALLET_FIELDS, where={"token": entity_id(token)},
+                       first=MAX_PAGE_SIZE, paginate=True)
+
+
+def whale_transfers_query(token: str, limit: int = 50, since: Optional[int] = None) -> EntityQuery:
+    where: Dict[str, Any] = {"token": entity_id(token)}
+    if since is not None:
+        where["timestamp_gte"] = since
+    return EntityQuery("whaleTransfers", TRANSFER_FIELDS, where=where, order_by="timestamp", first=limit)
+
+
+def pools_query(token: str) -> EntityQuery:
+    return EntityQuery("liquidityPools", POOL_FIELDS, where={"token": entity_id(token)}, first=5)
+
+
+_url = os.getenv("SUBGRAPH_URL", "")
+subgraph_client: Optional[SubgraphClient] = SubgraphClient(
+    _url,
+    timeout=float(os.getenv("SUBGRAPH_TIMEOUT", "10")),
+    head_ttl=float(os.getenv("SUBGRAPH_HEAD_TTL", "12")),
+) if _url else None
@@ -0,0 +1,165 @@
+"""
+Progressive team output for Telegram.
+
+`finrizz_team.run()` only returns once every member and the coordinator are
+done, so users used to wait on a static "⏳" message. `run_team_streaming`
+runs the team with agno event streaming instead and hands each member's
+output to a callback as soon as that member completes. `TeamProgress`
+summarizes those outputs into a single status message, edited in place
+(throttled to stay inside Telegram's edit rate limits; a member that
+finishes inside the throttle window is shown by a flush scheduled for the
+end of the window).
+
+Time-to-first-useful-content (command received -> first member summary
+visible to the user) is recorded per command; see `ttfc_stats()`.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from telegram.error import TelegramError
+
+from run_trace import RunTrace
+
+MEMBER_LABELS = {
+    "Token Discovery & Intelligence Agent": "🔎 Discovery",
+    "Whale Tracking & Behavior Analysis Agent": "🐋 Whales",
+    "Live Market Data & Technical Analysis Agent": "📈 Market",
+    "Financial Analysis & Investment Decision Agent": "💼 Financial",
+}
+
+_first_content_seconds: Dict[str, List[float]] = defaultdict(list)
+
+
+def summarize_member_output(content, limit: int = 280) -> str:
+    """First meaningful lines of a member's report, markdown stripped, capped at ``limit`` chars."""
+    lines = []
+    for line in str(content or "").splitlines():
+        line = line.strip().lstrip("#>*-• ").replace("**", "").replace("`", "").strip()
+        if not line or set(line) <= set("-=|_ "):
+            continue
+        lines.append(line)
+        if sum(len(l) for l in lines) >= limit:
+            break
+    summary = " ".join(lines)
+    return summary if len(summary) <= limit else summary[:limit - 1].rstrip() + "…"
+
+
+def run_team_streaming(team, prompt: str, on_member: Optional[Callable[[str, str], None]] = None,
+                       trace: Optional[RunTrace] = None) -> str:
+    """
+    Run ``team`` with event streaming (blocking; call it on the worker pool).
+
+    ``on_member(agent_name, content)`` is called from the worker thread as
+    each member finishes. Every event is recorded in ``trace``, which is
+    finished when the run ends. Returns the coordinator's final content.
+    """
+    final = None
+    deltas = []
+    error = None
+    try:
+        for event in team.run(prompt, stream=True, stream_events=True):
+            if trace is not None:
+                trace.observe(event)
+            kind = getattr(event, "event", "")
+            if kind == "RunCompleted" and getattr(event, "agent_name", ""):
+                if on_member:
+                    on_member(event.agent_name, event.content)
+            elif kind == "TeamRunContent" and isinstance(event.content, str):
+                deltas.append(event.content)
+            elif kind == "TeamRunCompleted":
+                final = event.content
+            elif kind == "TeamRunError":
+                raise RuntimeError(getattr(event, "content", None) or "Team run failed")
+        return final if final is not None else "".join(deltas)
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if trace is not None:
+            trace.finish(error)
+
+
+class TeamProgress:
+    """
+    A Telegram status message that fills in as team members finish.
+
+    Args:
+        message: The bot's status message to edit
+        command: Command name for time-to-first-content accounting
+        started_at: perf_counter() when the command was received
+        header: First line of the status message
+        min_edit_interval: Minimum seconds between edits
+    """
+
+    def __init__(self, message, command: str, started_at: float, header: str, min_edit_interval: float = 1.0):
+        self.message = message
+        self.command = command
+        self.started_at = started_at
+        self.header = header
+        self.min_edit_interval = min_edit_interval
+        self.sections: Dict[str, str] = {}
+        self.first_content_at = None
+        self._last_edit = 0.0
+        self._dirty = False
+        self._scheduled: Optional[asyncio.Task] = None  # flush at the end of the throttle window
+
+    def render(self) -> str:
+        text = self.header + "\n"
+        for name, summary in self.sections.items():
+            text += f"\n{MEMBER_LABELS.get(name, '🤖 ' + name)}: {summary}\n"
+        waiting = [label for name, label in MEMBER_LABELS.items() if name not in self.sections]
+        if waiting:
+            text += f"\n⏳ Waiting on: {', '.join(waiting)}"
+        return text[:4096]
+
+    async def add(self, agent_name: str, content):
+        self.sections[agent_name] = summarize_member_output(content)
+        self._dirty = True
+        wait = self._last_edit + self.min_edit_interval - time.monotonic()
+        if wait <= 0:
+            await self.flush()
+        elif self._scheduled is None:
+            self._scheduled = asyncio.get_running_loop().create_task(self._flush_after(wait))
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self._scheduled = None
+        await self.flush()
+
+    async def flush(self):
+        scheduled, self._scheduled = self._scheduled, None
+        if scheduled is not None and scheduled is not asyncio.current_task():
+            scheduled.cancel()
+        if not self._dirty:
+            return
+        try:
+            await self.message.edit_text(self.render())
+        except TelegramError as e:
+            print(f"⚠️ Progress edit failed: {e}")
+            return
+        self._dirty = False
+        self._last_edit = time.monotonic()
+        if self.first_content_at is None and self.sections:
+            self.first_content_at = time.perf_counter()
+            _first_content_seconds[self.command].append(self.first_content_at - self.started_at)
+
+
+def record_first_content(command: str, seconds: float):
+    """Record time-to-first-content for commands that answer without streaming."""
+    _first_content_seconds[command].append(seconds)
+
+
+def ttfc_stats() -> Dict[str, Dict[str, float]]:
+    """Per-command time-to-first-useful-content: count, p50 and max seconds."""
+    stats = {}
+    for command, samples in _first_content_seconds.items():
+        ordered = sorted(samples)
+        stats[command] = {
+            "count": len(ordered),
+            "p50_s": round(ordered[len(ordered) // 2], 2),
+            "max_s": round(ordered[-1], 2),
+        }
+    return stats
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first useful content for /analyze, blocking vs streamed.
+
+A StubTeam emits agno's own run events (member RunCompleted, then the
+coordinator's TeamRunCompleted) with a fixed delay per member, so the
+same event handling the bot uses is exercised. The status message is a
+stub that records edit times. Compares:
+
+- blocking: team.run() returns the whole report (previous bot behaviour)
+- streamed: run_team_streaming + TeamProgress editing one message
+
+    python team_stream_benchmark.py --member-seconds 0.5 --runs 3
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agno.run.agent import RunCompletedEvent
+from agno.run.team import RunCompletedEvent as TeamRunCompletedEvent
+from agno.run.team import TeamRunOutput
+
+from team_stream import MEMBER_LABELS, TeamProgress, run_team_streaming, ttfc_stats
+
+
+class StubTeam:
+    """Members finish one after another, then the coordinator synthesizes."""
+
+    def __init__(self, member_seconds: float):
+        self.member_seconds = member_seconds
+
+    def _events(self, prompt: str):
+        for name in MEMBER_LABELS:
+            time.sleep(self.member_seconds)
+            yield RunCompletedEvent(agent_name=name, content=f"## {name}\n**Finding:** key result for {prompt}\n...")
+        time.sleep(self.member_seconds)
+        yield TeamRunCompletedEvent(content=f"Final recommendation for {prompt}: HOLD")
+
+    def run(self, prompt: str, stream: bool = False, **kwargs):
+        if stream:
+            return self._events(prompt)
+        for _ in self._events(prompt):
+            pass
+        return TeamRunOutput(content=f"Final recommendation for {prompt}: HOLD")
+
+
+class StubMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit_text(self, text: str):
+        self.edits.append((time.perf_counter(), text))
+
+
+async def run_once(mode: str, team: StubTeam, executor: ThreadPoolExecutor) -> dict:
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    if mode == "blocking":
+        await loop.run_in_executor(executor, team.run, "0xabc")
+        done = time.perf_counter() - started
+        return {"ttfc_s": done, "final_s": done, "edits": 0}
+
+    message = StubMessage()
+    progress = TeamProgress(message, "analyze", started, "🔍 Analyzing token: 0xabc", min_edit_interval=0.0)
+    outputs = asyncio.Queue()
+
+    def on_member(name, content):
+        loop.call_soon_threadsafe(outputs.put_nowait, (name, content))
+
+    async def render():
+        while (item := await outputs.get()) is not None:
+            await progress.add(*item)
+        await progress.flush()
+
+    renderer = asyncio.create_task(render())
+    try:
+        await loop.run_in_executor(executor, run_team_streaming, team, "0xabc", on_member)
+    finally:
+        outputs.put_nowait(None)
+        await renderer
+    return {
+        "ttfc_s": progress.first_content_at - started,
+        "final_s": time.perf_counter() - started,
+        "edits": len(message.edits),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Team streaming time-to-first-content benchmark")
+    parser.add_argument("--member-seconds", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    team = StubTeam(args.member_seconds)
+    executor = ThreadPoolExecutor(max_workers=1)
+    print(f"🤖 {len(MEMBER_LABELS)} members x {args.member_seconds}s + coordinator, {args.runs} runs each")
+    print("=" * 52)
+    print(f"{'mode':<10}{'first content s':>18}{'final s':>10}{'edits':>8}")
+    print("-" * 52)
+    for mode in ("blocking", "streamed"):
+        results = [asyncio.run(run_once(mode, team, executor)) for _ in range(args.runs)]
+        ttfc = sum(r["ttfc_s"] for r in results) / len(results)
+        final = sum(r["final_s"] for r in results) / len(results)
+        print(f"{mode:<10}{ttfc:>18.2f}{final:>10.2f}{results[-1]['edits']:>8}")
+    executor.shutdown()
+    print(f"\n⏱️ Recorded by TeamProgress: {ttfc_stats()}")
+
+
+if __name__ == "__main__":
+    main()
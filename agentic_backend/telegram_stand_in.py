@@ -0,0 +1,202 @@
+"""
+Local stand-in for the Telegram Bot API.
+
+Serves the Bot API methods python-telegram-bot needs to run an Application
+(getMe, getUpdates long polling, setWebhook/deleteWebhook, sendMessage,
+editMessageText, ...) and delivers injected updates either to getUpdates
+callers or, once a webhook is set, by POSTing them to the bot's webhook
+(up to the webhook's max_connections at a time), like Telegram does.
+
+A one-way network delay can be added to every API response and webhook
+delivery. Each update's injection time is kept so the receiving side can
+measure update-to-handler latency.
+
+Point an Application at it with
+`Application.builder().token(...).base_url(stand_in.base_url)`.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import requests
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class TelegramStandIn:
+    """
+    Threaded Telegram Bot API stand-in.
+
+    Args:
+        latency: One-way network delay in seconds
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.sent_at: Dict[int, float] = {}  # update_id -> perf_counter() when injected
+        self.method_counts: Dict[str, int] = {}
+        self.messages_sent = 0
+        self._updates: List[Dict] = []
+        self._next_update_id = 1
+        self._webhook: Optional[Dict] = None
+        self._pushers: Optional[ThreadPoolExecutor] = None
+        self._push_session = requests.Session()
+        self._cond = threading.Condition()
+        self._httpd: Optional[_Server] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/bot"
+
+    def start(self) -> "TelegramStandIn":
+        self._httpd = _Server((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._cond.notify_all()
+        if self._pushers:
+            self._pushers.shutdown(wait=False, cancel_futures=True)
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    # --- Updates ---
+
+    def inject_command(self, text: str, user_id: int = 1) -> int:
+        """Queue a private-chat command message from ``user_id``; returns its update_id."""
+        with self._cond:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+        command = text.split()[0]
+        update = {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}],
+            },
+        }
+        self.sent_at[update_id] = time.perf_counter()
+        with self._cond:
+            webhook = self._webhook
+            if webhook is None:
+                self._updates.append(update)
+                self._cond.notify_all()
+        if webhook is not None:
+            self._pushers.submit(self._push, webhook, update)
+        return update_id
+
+    def _push(self, webhook: Dict, update: Dict):
+        time.sleep(self.latency)
+        headers = {}
+        if webhook.get("secret_token"):
+            headers["X-Telegram-Bot-Api-Secret-Token"] = webhook["secret_token"]
+        self._push_session.post(webhook["url"], json=update, headers=headers, timeout=10)
+
+    def _get_updates(self, params: Dict) -> List[Dict]:
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+            while not self._updates and self._httpd is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return list(self._updates[:int(params.get("limit") or 100)])
+
+    # --- Bot API methods ---
+
+    def call(self, method: str, params: Dict):
+        self.method_counts[method] = self.method_counts.get(method, 0) + 1
+        if method == "getMe":
+            return {"id": 4242, "is_bot": True, "first_name": "FinRizz", "username": "finrizz_stand_in_bot",
+                    "can_join_groups": True, "can_read_all_group_messages": False, "supports_inline_queries": False}
+        if method == "getUpdates":
+            return self._get_updates(params)
+        if method == "setWebhook":
+            max_connections = int(params.get("max_connections") or 40)
+            with self._cond:
+                self._webhook = {"url": params["url"], "secret_token": params.get("secret_token")}
+                self._pushers = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="webhook")
+                pending, self._updates = self._updates, []
+            for update in pending:
+                self._pushers.submit(self._push, self._webhook, update)
+            return True
+        if method == "deleteWebhook":
+            with self._cond:
+                self._webhook = None
+            return True
+        if method == "getWebhookInfo":
+            return {"url": (self._webhook or {}).get("url", ""), "has_custom_certificate": False,
+                    "pending_update_count": len(self._updates)}
+        if method in ("sendMessage", "editMessageText"):
+            self.messages_sent += 1
+            chat_id = int(params.get("chat_id") or 0)
+            return {"message_id": int(params.get("message_id") or self.messages_sent), "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"}, "text": params.get("text", "")}
+        return True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _params(self) -> Dict:
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                content_type = self.headers.get("Content-Type", "")
+                if "json" in content_type:
+                    return json.loads(raw or b"{}")
+                if "form-urlencoded" in content_type:
+                    return {k: v[0] for k, v in parse_qs(raw.decode("utf-8")).items()}
+                return {}
+
+            def do_POST(self):
+                # /bot<token>/<method>
+                method = self.path.rstrip("/").rsplit("/", 1)[-1]
+                params = self._params()
+                result = server.call(method, params)
+                time.sleep(server.latency)
+                data = json.dumps({"ok": True, "result": result}).encode("utf-8")
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up on a long poll while shutting down
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,24 @@
+"""
+Shared test setup.
+
+The bot modules import each other (and pyeth's) by bare name, as they do
+when bot.py runs from this directory, and several create process-wide
+singletons at import time; point those at nothing so tests write no files.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+PYETH = os.path.join(BACKEND, "..", "pyeth")
+for path in (BACKEND, PYETH):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+for name in ("AGENT_JOURNAL_PATH", "ANALYSIS_CACHE_PATH", "AGENT_TRACE_PATH", "TOOL_CACHE_DIR",
+             "TOKEN_METADATA_PATH"):
+    os.environ.setdefault(name, "")
+os.environ.setdefault("METRICS_PORT", "0")
+os.environ.setdefault("FIRECRAWL_API_KEY", "test")
+os.environ.setdefault("NEBIUS_API_KEY", "test")
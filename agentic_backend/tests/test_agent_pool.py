@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+import time
+
+from agent_pool import AgentPool, JobCancelledError
+from analysis_cache import AnalysisCache
+
+
+def test_journal_writes_are_coalesced_off_the_event_loop(tmp_path):
+    path = tmp_path / "jobs.json"
+
+    async def scenario():
+        pool = AgentPool(max_workers=2, per_user_limit=5, journal_path=str(path), journal_interval=0.05)
+        jobs = [pool.new_job(f"user-{i}", "analyze", ["0xabc"]) for i in range(10)]
+        await asyncio.gather(*(pool.submit(job, time.sleep, 0.01) for job in jobs))
+        await asyncio.sleep(0.1)
+        pool.shutdown(wait=True)
+        return pool.journal_writes
+
+    writes = asyncio.run(scenario())
+    assert 1 <= writes < 10
+    assert json.loads(path.read_text())["jobs"] == []
+
+
+def test_a_user_sharing_another_users_run_is_listed():
+    async def scenario():
+        pool = AgentPool(max_workers=1)
+        cache = AnalysisCache(path=None)
+        owner = pool.new_job("owner", "analyze", ["0xabc"])
+        joiner = pool.new_job("joiner", "analyze", ["0xabc"])
+        first = asyncio.ensure_future(cache.get_or_run(
+            "analyze", "0xabc", lambda: pool.submit(owner, time.sleep, 0.2),
+            waiting=lambda: pool.sharing(owner)))
+        await asyncio.sleep(0.05)
+        second = asyncio.ensure_future(cache.get_or_run(
+            "analyze", "0xabc", lambda: pool.submit(joiner, time.sleep, 0.2),
+            waiting=lambda: pool.sharing(joiner)))
+        await asyncio.sleep(0.05)
+        listed = pool.user_jobs("joiner")
+        assert [job.state for job in listed] == ["shared"]
+        assert pool.shared_with(joiner) is owner
+        assert not pool.cancel(joiner.id)
+        await asyncio.gather(first, second)
+        assert pool.user_jobs("joiner") == []
+        pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_queued_jobs_start_in_command_then_tier_order():
+    async def scenario():
+        pool = AgentPool(max_workers=1, per_user_limit=5)
+        started = []
+        gate = threading.Event()
+
+        def work(name):
+            started.append(name)
+            gate.wait(1)
+
+        blocker = asyncio.ensure_future(pool.submit(pool.new_job("u0", "discover"), work, "blocker"))
+        await asyncio.sleep(0.02)
+        queued = [("u1", "discover", "standard"), ("u2", "og_intel", "standard"), ("u3", "analyze", "free"),
+                  ("u4", "analyze", "premium")]
+        jobs = [pool.new_job(user, command, tier=tier) for user, command, tier in queued]
+        runs = [asyncio.ensure_future(pool.submit(job, work, f"{job.command}/{job.tier}")) for job in jobs]
+        await asyncio.sleep(0.02)
+        positions = [pool.queue_position(job) for job in jobs]
+        gate.set()
+        await asyncio.gather(blocker, *runs)
+        pool.shutdown()
+        return started, positions
+
+    started, positions = asyncio.run(scenario())
+    assert started == ["blocker", "analyze/premium", "analyze/free", "og_intel/standard", "discover/standard"]
+    assert positions == [4, 3, 2, 1]
+
+
+def test_cancelling_queued_and_running_jobs_releases_their_callers():
+    async def scenario():
+        pool = AgentPool(max_workers=1, per_user_limit=1)
+        running, queued = pool.new_job("a", "analyze"), pool.new_job("b", "analyze")
+        first = asyncio.ensure_future(pool.submit(running, time.sleep, 0.3))
+        second = asyncio.ensure_future(pool.submit(queued, time.sleep, 0.3))
+        await asyncio.sleep(0.02)
+        assert (running.state, queued.state) == ("running", "queued")
+        assert pool.cancel(queued.id) and pool.cancel(running.id)
+        start = time.perf_counter()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        released_in = time.perf_counter() - start
+        busy = pool.user_busy("a") or pool.user_busy("b")
+        pool.shutdown()
+        return results, released_in, busy
+
+    results, released_in, busy = asyncio.run(scenario())
+    assert all(isinstance(result, JobCancelledError) for result in results)
+    assert released_in < 0.1  # the running thread finishes in the background
+    assert not busy
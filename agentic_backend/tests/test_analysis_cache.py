@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from agent_pool import JobCancelledError
+from analysis_cache import AnalysisCache, SharedRunError
+
+TOKEN = "0xAbC0000000000000000000000000000000000001"
+
+
+def run_of(result, delay=0.05, calls=None, error=None):
+    async def run():
+        if calls is not None:
+            calls.append(result)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return run
+
+
+def test_concurrent_requests_share_one_run():
+    async def scenario():
+        cache, calls = AnalysisCache(), []
+        lookups = await asyncio.gather(*(cache.get_or_run("analyze", TOKEN.lower() if i % 2 else TOKEN,
+                                                          run_of("report", calls=calls)) for i in range(5)))
+        later = await cache.get_or_run("analyze", TOKEN, run_of("other", calls=calls))
+        return lookups, later, calls, cache.stats()
+
+    lookups, later, calls, stats = asyncio.run(scenario())
+    assert calls == ["report"]
+    assert sorted(lookup.source for lookup in lookups) == ["run", "shared", "shared", "shared", "shared"]
+    assert all(lookup.result == "report" for lookup in lookups)
+    assert later.source == "hit" and later.result == "report"
+    assert (stats["misses"], stats["shared"], stats["hits"]) == (1, 4, 1)
+
+
+def test_a_waiter_runs_again_when_the_owner_is_cancelled():
+    async def scenario():
+        cache, calls = AnalysisCache(), []
+        owner = asyncio.ensure_future(cache.get_or_run("analyze", TOKEN, run_of(
+            "owner", calls=calls, error=JobCancelledError("job"))))
+        await asyncio.sleep(0)
+        waiter = await cache.get_or_run("analyze", TOKEN, run_of("waiter", calls=calls))
+        with pytest.raises(JobCancelledError):
+            await owner
+        return waiter, calls
+
+    waiter, calls = asyncio.run(scenario())
+    assert calls == ["owner", "waiter"]
+    assert waiter.source == "run" and waiter.result == "waiter"
+
+
+def test_a_failed_run_is_reported_to_waiters_and_not_cached():
+    async def scenario():
+        cache = AnalysisCache()
+        owner = asyncio.ensure_future(cache.get_or_run("analyze", TOKEN, run_of(
+            "owner", error=RuntimeError("model down"))))
+        await asyncio.sleep(0)
+        with pytest.raises(SharedRunError):
+            await cache.get_or_run("analyze", TOKEN, run_of("waiter"))
+        with pytest.raises(RuntimeError, match="model down"):
+            await owner
+        return await cache.get_or_run("analyze", TOKEN, run_of("retry"))
+
+    retry = asyncio.run(scenario())
+    assert retry.source == "run" and retry.result == "retry"
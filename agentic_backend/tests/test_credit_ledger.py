@@ -0,0 +1,74 @@
+import asyncio
+
+from credit_ledger import CreditLedger
+from credits_client import CreditsClient
+from credits_stand_in import CreditsStandIn
+
+
+def run_ledger(balances, scenario, **ledger_args):
+    """Run ``scenario(ledger, stand_in)`` against a credits stand-in; returns its result."""
+    async def main():
+        with CreditsStandIn(balances) as stand_in:
+            client = CreditsClient(stand_in.url, api_secret=stand_in.api_secret)
+            ledger = CreditLedger(client, **ledger_args)
+            await asyncio.gather(*(client.get_balance(u) for u in balances))
+            try:
+                return await scenario(ledger, stand_in)
+            finally:
+                await ledger.close()
+                await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_balances_close_to_the_amount_are_not_deferred():
+    async def scenario(ledger, stand_in):
+        rich = await ledger.reserve("rich", 1)
+        poor = await ledger.reserve("poor", 1)
+        assert rich.accepted and rich.deferred
+        assert poor.accepted and not poor.deferred and poor.consumption_id
+        assert stand_in.requests["POST /api/consume-credits"] == 1
+
+    run_ledger({"rich": 100, "poor": 3}, scenario, batch_threshold=0, defer_headroom=5)
+
+
+def test_deferred_reservations_coalesce_into_one_batch_charge():
+    async def scenario(ledger, stand_in):
+        reservations = [await ledger.reserve(user, 1) for user in ("a", "a", "a", "b", "b")]
+        assert all(r.accepted and r.deferred for r in reservations)
+        assert await ledger.refund(reservations[0])  # before the flush: never charged
+        await ledger.flush()
+        assert await ledger.refund(reservations[3])  # after it: refunded on the server
+        assert [r.state for r in reservations] == ["refunded", "reserved", "reserved", "refunded", "reserved"]
+        assert stand_in.requests["POST /api/consume-credits/batch"] == 1
+        assert stand_in.requests["POST /api/refund-credits"] == 1
+        assert stand_in.balances == {"a": 18, "b": 19}
+        assert ledger.client.cached_balance("a") == 18
+
+    run_ledger({"a": 20, "b": 20}, scenario, batch_threshold=0, defer_headroom=0)
+
+
+def test_a_deferred_consumption_the_server_rejects_is_counted():
+    async def scenario(ledger, stand_in):
+        reservation = await ledger.reserve("a", 5)
+        assert reservation.deferred
+        stand_in.balances["a"] = 2  # spent elsewhere before the flush
+        await ledger.flush()
+        assert reservation.state == "rejected"
+        assert ledger.rejected_after_flush == 1
+        assert not await ledger.refund(reservation)
+        assert stand_in.balances["a"] == 2
+
+    run_ledger({"a": 10}, scenario, batch_threshold=0, defer_headroom=0)
+
+
+def test_low_volume_reservations_are_charged_and_refunded_at_once():
+    async def scenario(ledger, stand_in):
+        reservation = await ledger.reserve("a", 3)
+        assert reservation.accepted and not reservation.deferred and reservation.balance == 7
+        refused = await ledger.reserve("a", 8)
+        assert not refused.accepted and refused.reason == "insufficient"
+        assert await ledger.refund(reservation)
+        assert stand_in.balances["a"] == 10
+
+    run_ledger({"a": 10}, scenario)
@@ -0,0 +1,103 @@
+from erc20_market import (SELECTORS, TOKEN_PRICE_FEEDS, Erc20MarketReader, decode_aggregate3, decode_string,
+                          decode_uint, encode_aggregate3)
+from stand_ins import Erc20StandIn
+
+WETH = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+SPOOF = "0x00000000000000000000000000000000000e7e11"
+
+
+class FixedPrices:
+    def __init__(self, prices):
+        self.prices = prices
+        self.requested = []
+
+    def get_many(self, feeds):
+        self.requested.extend(feeds)
+        return {feed: {"price": self.prices[feed]} for feed in feeds if feed in self.prices}
+
+
+def test_aggregate3_calldata_matches_the_abi():
+    target = "0x" + "00" * 19 + "01"
+    calldata = encode_aggregate3([(target, "0x" + SELECTORS["totalSupply"])])
+    words = [calldata[10 + 64 * i:10 + 64 * (i + 1)] for i in range((len(calldata) - 10) // 64)]
+    assert calldata[:10] == "0x82ad56cb"
+    assert [int(word, 16) for word in words[:3]] == [32, 1, 32]  # array offset, length, element offset
+    assert [int(word, 16) for word in words[3:7]] == [1, 1, 96, 4]  # target, allowFailure, bytes offset, length
+    assert words[7] == SELECTORS["totalSupply"] + "00" * 28
+
+
+def test_aggregate3_round_trip_through_multicall():
+    with Erc20StandIn({WETH: {"symbol": "WETH", "name": "Wrapped Ether", "decimals": 18,
+                              "total_supply": 7 * 10 ** 21}}) as chain:
+        calls = [(WETH, SELECTORS["totalSupply"]), (WETH, SELECTORS["symbol"]), (WETH, "0xdeadbeef"),
+                 (SPOOF, SELECTORS["decimals"])]
+        result = chain._aggregate3(bytes.fromhex(encode_aggregate3(calls)[2:]))
+
+    (supply_ok, supply), (symbol_ok, symbol), (unknown_ok, _), (no_code_ok, no_code) = \
+        decode_aggregate3(bytes.fromhex(result[2:]))
+    assert supply_ok and decode_uint(supply) == 7 * 10 ** 21
+    assert symbol_ok and decode_string(symbol) == "WETH"
+    assert not unknown_ok
+    assert no_code_ok and decode_uint(no_code) is None
+
+
+def test_canonical_weth_is_in_the_vetted_map():
+    assert TOKEN_PRICE_FEEDS[1][WETH] == "ETH/USD"
+
+
+def test_token_spoofing_the_eth_symbol_gets_no_price():
+    prices = FixedPrices({"ETH/USD": 3000.0})
+    with Erc20StandIn(chain_id=1) as chain:
+        chain.add_token(WETH, "WETH", total_supply=2 * 10 ** 24)
+        chain.add_token(SPOOF, "ETH", total_supply=10 ** 30)
+        caps = Erc20MarketReader(chain.url, price_provider=prices).market_caps([WETH, SPOOF])
+
+    assert caps[SPOOF]["symbol"] == "ETH"
+    assert caps[SPOOF]["price_feed"] is None
+    assert caps[SPOOF]["price_usd"] is None
+    assert caps[SPOOF]["market_cap_usd"] is None
+    assert caps[WETH]["price_feed"] == "ETH/USD"
+    assert caps[WETH]["market_cap_usd"] == 2 * 10 ** 6 * 3000.0
+    assert prices.requested == ["ETH/USD"]
+
+
+def test_vetted_addresses_are_per_chain():
+    prices = FixedPrices({"ETH/USD": 3000.0})
+    with Erc20StandIn(chain_id=16602) as chain:
+        chain.add_token(WETH, "WETH", total_supply=10 ** 18)
+        caps = Erc20MarketReader(chain.url, price_provider=prices).market_caps([WETH])
+    assert caps[WETH]["price_usd"] is None
+
+
+class FlakyMulticall(Erc20StandIn):
+    """aggregate3 fails (as on a node error) for the first ``failures`` calls."""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def _aggregate3(self, calldata: bytes) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise ValueError("header not found")
+        return super()._aggregate3(calldata)
+
+
+def test_transient_multicall_error_keeps_multicall():
+    with FlakyMulticall(failures=1) as chain:
+        chain.add_token(WETH, "WETH", total_supply=10 ** 18)
+        reader = Erc20MarketReader(chain.url)
+        first = reader.read_tokens([WETH])
+        assert reader.multicall_address is not None
+        second = reader.read_tokens([WETH])
+    assert first[WETH]["total_supply"] == second[WETH]["total_supply"] == 1.0
+    assert chain.method_counts["eth_getCode"] == 1
+
+
+def test_multicall_switched_off_only_without_code():
+    with Erc20StandIn(multicall=False) as chain:
+        chain.add_token(WETH, "WETH", total_supply=10 ** 18)
+        reader = Erc20MarketReader(chain.url)
+        tokens = reader.read_tokens([WETH])
+    assert reader.multicall_address is None
+    assert tokens[WETH]["symbol"] == "WETH"
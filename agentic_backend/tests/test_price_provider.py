@@ -0,0 +1,47 @@
+import threading
+import time
+from datetime import datetime
+
+from price_provider import PythPriceProvider
+from pyth_oracle import PRICE_FEEDS, PriceData
+
+
+class FakeOracle:
+    """Returns a price per symbol after ``delay`` seconds, or nothing while ``down``."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.down = False
+        self.calls = []
+
+    def fetch_prices(self, symbols):
+        self.calls.append(list(symbols))
+        time.sleep(self.delay)
+        if self.down:
+            return {}
+        return {s: PriceData(s, 1.0, 0.01, datetime.now(), PRICE_FEEDS[s]) for s in symbols}
+
+
+def test_misses_for_different_symbols_are_fetched_in_parallel():
+    oracle = FakeOracle(delay=0.3)
+    provider = PythPriceProvider(oracle, ttl=10)
+    threads = [threading.Thread(target=provider.get, args=(s,)) for s in ("BTC/USD", "ETH/USD", "BTC/USD")]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.perf_counter() - start < 0.55
+    assert sorted(map(tuple, oracle.calls)) == [("BTC/USD",), ("ETH/USD",)]
+
+
+def test_failures_are_cached_and_the_stale_price_is_served():
+    oracle = FakeOracle()
+    provider = PythPriceProvider(oracle, ttl=0, failure_ttl=10, max_stale=60)
+    assert provider.get("BTC/USD")["price"] == 1.0
+    oracle.down = True
+    assert provider.get("BTC/USD")["price"] == 1.0
+    assert provider.get("BTC/USD")["price"] == 1.0
+    assert provider.get("ETH/USD") is None
+    assert provider.get("ETH/USD") is None
+    assert len(oracle.calls) == 3  # first fetch, then one failed fetch per symbol
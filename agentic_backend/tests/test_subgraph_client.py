@@ -0,0 +1,40 @@
+from graph_stand_in import GraphStandIn
+from holder_concentration import ConcentrationEngine
+from subgraph_client import SubgraphClient, address_of, entity_id, holders_query, token_query
+
+
+def test_entity_ids_match_the_subgraph_format():
+    # graph_out in lib.rs: Hex(..).to_string() and the balance store key, lowercase without 0x
+    assert entity_id("0xAbCdEf0000000000000000000000000000000001") == "abcdef0000000000000000000000000000000001"
+    assert entity_id("abcdef0000000000000000000000000000000001") == "abcdef0000000000000000000000000000000001"
+    assert address_of("abcdef0000000000000000000000000000000001") == "0xabcdef0000000000000000000000000000000001"
+    assert 'id: "abcdef0000000000000000000000000000000001"' in token_query(
+        "0xABCDEF0000000000000000000000000000000001").render("q")
+
+
+def test_holders_load_as_0x_addresses():
+    with GraphStandIn(tokens=1, holders=30, transfers=5, seed=3) as graph:
+        client = SubgraphClient(graph.url)
+        address = graph.token_addresses[0].upper().replace("0X", "0x")
+        _, results = client.fetch({"holders": holders_query(address)})
+        snapshot = ConcentrationEngine().load_from_subgraph(address, client)
+        client.close()
+
+    wallet_ids = {wallet["id"] for wallet in results["holders"]}
+    assert len(wallet_ids) == 30
+    assert all(len(wallet_id) == 40 and not wallet_id.startswith("0x") for wallet_id in wallet_ids)
+    holders = [holder["address"] for holder in snapshot["top_holders"]]
+    assert holders and all(holder.startswith("0x") and holder[2:] in wallet_ids for holder in holders)
+
+
+def test_holders_are_paginated_by_id():
+    with GraphStandIn(tokens=1, holders=2500, transfers=5, seed=5) as graph:
+        client = SubgraphClient(graph.url)
+        _, results = client.fetch({"holders": holders_query(graph.token_addresses[0])})
+        pages = client.stats()["pages"]
+        client.close()
+
+    ids = [wallet["id"] for wallet in results["holders"]]
+    assert len(ids) == 2500
+    assert ids == sorted(set(ids))  # every holder once, in id order across the page boundaries
+    assert pages == 3
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from team_stream import TeamProgress
+
+
+class StatusMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit_text(self, text):
+        self.edits.append(text)
+
+
+def test_member_finishing_inside_the_throttle_window_is_shown_at_its_end():
+    async def scenario():
+        message = StatusMessage()
+        progress = TeamProgress(message, "analyze", time.perf_counter(), "header", min_edit_interval=0.2)
+        await progress.add("Whale Tracking & Behavior Analysis Agent", "first")
+        await progress.add("Live Market Data & Technical Analysis Agent", "second")
+        assert len(message.edits) == 1
+        await asyncio.sleep(0.3)
+        return message.edits
+
+    edits = asyncio.run(scenario())
+    assert len(edits) == 2
+    assert "second" in edits[-1]
+
+
+def test_explicit_flush_cancels_the_scheduled_one():
+    async def scenario():
+        message = StatusMessage()
+        progress = TeamProgress(message, "analyze", time.perf_counter(), "header", min_edit_interval=0.2)
+        await progress.add("a", "first")
+        await progress.add("b", "second")
+        await progress.flush()
+        await asyncio.sleep(0.3)
+        return message.edits
+
+    assert len(asyncio.run(scenario())) == 2
@@ -0,0 +1,320 @@
+"""
+On-disk memoization of agent web tool calls (Firecrawl, DuckDuckGo).
+
+The discovery agent re-scrapes the same CryptoRank pages and project sites
+on every /discover and /analyze, and each scrape costs seconds and API
+credits. ToolCache is installed as an agno tool hook
+(`Agent(tool_hooks=[tool_cache.hook])`) and memoizes tool results keyed by
+tool name and normalized arguments:
+
+- per-tool TTLs (TOOL_CACHE_TTLS, e.g. "scrape_website=21600,web_search=900");
+  tools without a TTL are never cached
+- stale-while-revalidate: for another TTL after expiry (TOOL_CACHE_STALE_FACTOR
+  times the TTL) the stale result is returned at once and refreshed in the
+  background
+- one file per entry under TOOL_CACHE_DIR (default: tool_cache/ next to this
+  module, created on the first write), bounded by TOOL_CACHE_MAX_MB with
+  least-recently-used eviction; survives restarts
+- concurrent identical calls share one underlying call
+- TOOL_CACHE=off (or `tool_cache.enabled = False`) bypasses it entirely
+
+Exceptions and error results (Firecrawl's "Error searching ..." strings,
+`{"error": ...}` payloads) are never cached. Hit rate and tool seconds saved are available
+from `stats()`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from analysis_cache import normalize_address
+
+DEFAULT_TTLS: Dict[str, float] = {
+    # Firecrawl: project sites and listing pages change slowly
+    "scrape_website": 6 * 3600,
+    "crawl_website": 6 * 3600,
+    "map_website": 6 * 3600,
+    "search_web": 1800,
+    # DuckDuckGo
+    "web_search": 1800,
+    "search_news": 900,
+}
+
+_URL = re.compile(r"^[a-z][a-z0-9+.-]*://", re.IGNORECASE)
+
+
+def normalize_argument(value: Any) -> Any:
+    """Canonical form of a tool argument, so trivially different calls share an entry."""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if _URL.match(value):
+            parts = urlsplit(value)
+            path = parts.path.rstrip("/") or "/"
+            return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+        return normalize_address(value)
+    if isinstance(value, dict):
+        return {k: normalize_argument(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [normalize_argument(v) for v in value]
+    return value
+
+
+def cache_key(tool: str, arguments: Dict) -> str:
+    canonical = json.dumps([tool, normalize_argument(arguments or {})], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_error_result(result: Any) -> bool:
+    """True for a tool result that reports a failure rather than data."""
+    if isinstance(result, str):
+        text = result.lstrip()
+        return text.startswith("Error") or (text.startswith("{") and '"error"' in text[:16])
+    if isinstance(result, dict):
+        return bool(result.get("error")) or result.get("success") is False
+    return bool(getattr(result, "error", None))
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """Parse "tool=seconds,tool=seconds" overrides."""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, seconds = item.partition("=")
+        ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+class ToolCache:
+    """
+    Disk-backed TTL + LRU cache for tool results with stale-while-revalidate.
+
+    Args:
+        directory: Directory for entry files, created on the first write (None keeps the cache in memory)
+        ttls: tool name -> seconds a result stays fresh
+        stale_factor: Stale results are served (and refreshed) for ttl * stale_factor after expiry
+        max_bytes: Total size of stored results before the least recently used are evicted
+        enabled: False bypasses the cache
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttls: Dict[str, float] = None, stale_factor: float = 1.0,
+                 max_bytes: int = 64 * 1024 * 1024, enabled: bool = True):
+        self.directory = directory
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.stale_factor = stale_factor
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> stored bytes, least recently used first
+        self._memory: Dict[str, Dict] = {}
+        self._bytes = 0
+        self._inflight: Dict[str, Future] = {}
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tool-refresh")
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.seconds_saved = 0.0
+        self.evictions = 0
+        self._load()
+
+    # --- Storage ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            # mtime is bumped on every hit, so it orders entries by last use
+            found.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(found):
+            self._index[key] = size
+            self._bytes += size
+
+    def _read(self, key: str) -> Optional[Dict]:
+        if not self.directory:
+            return self._memory.get(key)
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+            return entry
+        except (OSError, ValueError):
+            self._forget(key)
+            return None
+
+    def _write(self, key: str, entry: Dict):
+        try:
+            data = json.dumps(entry)
+        except (TypeError, ValueError):
+            self._count("uncacheable", entry["tool"])
+            return
+        with self._lock:
+            if key in self._index:
+                self._bytes -= self._index.pop(key)
+            size = len(data.encode("utf-8"))
+            self._index[key] = size
+            self._bytes += size
+            if not self.directory:
+                self._memory[key] = entry
+        if self.directory:
+            tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(key))
+            except OSError as e:
+                print(f"⚠️ Could not write tool cache entry: {e}")
+                self._forget(key)
+                return
+        self._evict()
+
+    def _forget(self, key: str):
+        with self._lock:
+            if key in self._index:
+                self._bytes -= self._index.pop(key)
+            self._memory.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self._bytes <= self.max_bytes or len(self._index) <= 1:
+                    return
+                key = next(iter(self._index))
+            self._forget(key)
+            with self._lock:
+                self.evictions += 1
+
+    def _touch(self, key: str):
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+
+    # --- Calls ---
+
+    def _count(self, outcome: str, tool: str, amount: int = 1):
+        with self._lock:
+            self.counts[tool][outcome] += amount
+
+    def _call(self, key: str, tool: str, function_call: Callable, arguments: Dict, lookup: bool = True) -> Any:
+        """Run the tool once per key at a time; concurrent callers share the result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if lookup:
+            self._count("misses" if owner else "shared", tool)
+        if not owner:
+            return future.result()
+        started = time.perf_counter()
+        try:
+            result = function_call(**arguments)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        duration = time.perf_counter() - started
+        future.set_result(result)
+        if is_error_result(result):
+            self._count("errors", tool)
+        elif result is not None:
+            self._write(key, {"tool": tool, "arguments": normalize_argument(arguments or {}),
+                              "stored_at": time.time(), "duration": duration, "result": result})
+        return result
+
+    def _refresh(self, key: str, tool: str, function_call: Callable, arguments: Dict):
+        try:
+            self._call(key, tool, function_call, arguments, lookup=False)
+            self._count("refreshed", tool)
+        except Exception as e:
+            self._count("refresh_errors", tool)
+            print(f"⚠️ Background refresh of {tool} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def hook(self, function_name: str, function_call: Callable, arguments: Dict) -> Any:
+        """agno tool hook: answer from the cache or call through."""
+        ttl = self.ttls.get(function_name)
+        if not self.enabled or ttl is None:
+            if ttl is not None:
+                self._count("bypassed", function_name)
+            return function_call(**arguments)
+
+        key = cache_key(function_name, arguments)
+        entry = self._read(key) if key in self._index else None
+        if entry is not None and is_error_result(entry["result"]):
+            entry = None  # stored before errors were skipped: call through and replace it
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < ttl:
+                self._touch(key)
+                self._count("hits", function_name)
+                self._saved(entry)
+                return entry["result"]
+            if age < ttl * (1 + self.stale_factor):
+                self._touch(key)
+                self._count("stale_hits", function_name)
+                self._saved(entry)
+                with self._lock:
+                    refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                if refresh:
+                    self._refresher.submit(self._refresh, key, function_name, function_call, dict(arguments))
+                return entry["result"]
+        return self._call(key, function_name, function_call, arguments)
+
+    def _saved(self, entry: Dict):
+        with self._lock:
+            self.seconds_saved += entry.get("duration", 0.0)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {tool: dict(values) for tool, values in self.counts.items()}
+            entries, size = len(self._index), self._bytes
+        served = sum(c.get("hits", 0) + c.get("stale_hits", 0) + c.get("shared", 0) for c in counts.values())
+        lookups = served + sum(c.get("misses", 0) for c in counts.values())
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "mb": round(size / 1024 / 1024, 2),
+            "evictions": self.evictions,
+            "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+            "tool_seconds_saved": round(self.seconds_saved, 1),
+            "tools": counts,
+        }
+
+    def close(self):
+        self._refresher.shutdown(wait=False, cancel_futures=True)
+
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tool_cache")
+
+tool_cache = ToolCache(
+    directory=os.getenv("TOOL_CACHE_DIR", DEFAULT_DIRECTORY) or None,
+    ttls={**DEFAULT_TTLS, **parse_ttls(os.getenv("TOOL_CACHE_TTLS", ""))},
+    stale_factor=float(os.getenv("TOOL_CACHE_STALE_FACTOR", "1.0")),
+    max_bytes=int(float(os.getenv("TOOL_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    enabled=os.getenv("TOOL_CACHE", "on").lower() not in ("0", "off", "false", "no"),
+)
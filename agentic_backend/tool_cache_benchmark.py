@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: web tool calls with and without the on-disk tool cache.
+
+Replays discovery-agent tool traffic (scrape_website over a set of project
+pages with skewed popularity, some URLs written differently) against a stub
+scraper with fixed latency, from several agent threads at once, through
+agno's tool-call path (FunctionCall with the cache as a tool hook):
+
+- bypass: TOOL_CACHE=off behaviour, every call goes upstream
+- cache: TTL shorter than the replay, so entries also expire and are
+  served stale while refreshing
+- restart: a new ToolCache over the same directory, as after a bot restart
+
+    python tool_cache_benchmark.py --calls 300 --urls 40 --scrape-ms 400
+    python tool_cache_benchmark.py --max-mb 0.1   # LRU eviction under a tight budget
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agno.tools.function import Function, FunctionCall
+
+from tool_cache import ToolCache
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def workload(calls: int, urls: int, seed: int):
+    rng = random.Random(seed)
+    pages = [f"https://project{i}.io/tokenomics" for i in range(urls)]
+    plan = []
+    for _ in range(calls):
+        url = pages[min(int(rng.paretovariate(1.2)) - 1, urls - 1)]
+        if rng.random() < 0.3:
+            url = url.replace("https://", "HTTPS://").replace(".io", ".IO") + "/"
+        plan.append(url)
+    return plan
+
+
+def replay(cache: ToolCache, plan, args) -> dict:
+    upstream = []
+    lock = threading.Lock()
+
+    def scrape_website(url: str) -> str:
+        """Scrape a website."""
+        with lock:
+            upstream.append(url)
+        time.sleep(args.scrape_ms / 1000)
+        return f"# {url}\n" + "lorem ipsum " * args.page_words
+
+    function = Function.from_callable(scrape_website)
+    function.tool_hooks = [cache.hook]
+    latencies = []
+
+    def call(index_url):
+        index, url = index_url
+        # Calls arrive spread over the replay
+        time.sleep(max(0.0, begin + index * args.spacing_ms / 1000 - time.perf_counter()))
+        start = time.perf_counter()
+        FunctionCall(function=function, arguments={"url": url}).execute()
+        latencies.append(time.perf_counter() - start)
+
+    begin = start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.agents) as pool:
+        list(pool.map(call, enumerate(plan)))
+    wall = time.perf_counter() - start
+    time.sleep(args.scrape_ms / 1000 * 2)  # let background refreshes land before counting
+    stats = cache.stats()
+    return {
+        "wall_s": wall,
+        "upstream": len(upstream),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "hit_rate": stats["hit_rate"],
+        "stale": sum(c.get("stale_hits", 0) for c in stats["tools"].values()),
+        "evictions": stats["evictions"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool result cache benchmark")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--urls", type=int, default=40)
+    parser.add_argument("--agents", type=int, default=8, help="Concurrent agent threads")
+    parser.add_argument("--scrape-ms", type=float, default=400.0)
+    parser.add_argument("--spacing-ms", type=float, default=10.0, help="Gap between call arrivals")
+    parser.add_argument("--ttl", type=float, default=1.5, help="scrape_website TTL in seconds for the replay")
+    parser.add_argument("--page-words", type=int, default=2000)
+    parser.add_argument("--max-mb", type=float, default=64.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    plan = workload(args.calls, args.urls, args.seed)
+    directory = tempfile.mkdtemp(prefix="tool_cache_")
+    make = lambda enabled: ToolCache(directory, ttls={"scrape_website": args.ttl}, enabled=enabled,
+                                     max_bytes=int(args.max_mb * 1024 * 1024))
+
+    print(f"🧰 {args.calls} scrape_website calls over {args.urls} pages, {args.agents} agent threads, "
+          f"{args.scrape_ms:.0f}ms per scrape, TTL {args.ttl}s")
+    print("=" * 84)
+    print(f"{'mode':<10}{'wall s':>9}{'upstream calls':>16}{'p50 ms':>9}{'p95 ms':>9}{'hit rate':>10}"
+          f"{'stale':>8}{'evicted':>9}")
+    print("-" * 84)
+    try:
+        for label, enabled in (("bypass", False), ("cache", True), ("restart", True)):
+            cache = make(enabled)
+            r = replay(cache, plan, args)
+            cache.close()
+            print(f"{label:<10}{r['wall_s']:>9.2f}{r['upstream']:>16}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+                  f"{r['hit_rate']:>10.0%}{r['stale']:>8}{r['evictions']:>9}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: update-to-handler latency, polling vs webhook.
+
+Runs the bot's Application (bot.build_application) against a local
+TelegramStandIn with a one-way network delay, injects a stream of updates
+at a fixed rate (a share of them slow commands that hold their handler),
+and measures how long each fast command waits between Telegram receiving
+it and its handler starting:
+
+- polling, sequential: concurrency 1 (python-telegram-bot's default)
+- polling, concurrent: BOT_CONCURRENT_UPDATES handlers at a time
+- webhook, concurrent: updates pushed to the embedded webhook server
+
+    python webhook_benchmark.py --updates 200 --rate 50 --latency-ms 40
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import time
+
+os.environ.setdefault("FIRECRAWL_API_KEY", "benchmark")
+
+from telegram import Update  # noqa: E402
+from telegram.ext import CommandHandler, ContextTypes  # noqa: E402
+
+import bot  # noqa: E402
+from telegram_stand_in import TelegramStandIn  # noqa: E402
+
+TOKEN = "4242:stand-in"
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_mode(mode: str, concurrency: int, args) -> dict:
+    latencies = {}
+    done = asyncio.Event()
+
+    with TelegramStandIn(latency=args.latency_ms / 1000) as telegram:
+        app = bot.build_application(TOKEN, base_url=telegram.base_url, concurrency=concurrency)
+
+        async def ping(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            latencies[update.update_id] = time.perf_counter() - telegram.sent_at[update.update_id]
+            if len(latencies) >= expected_fast:
+                done.set()
+
+        async def slow(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            await asyncio.sleep(args.slow_seconds)
+
+        # Group -1 runs before the bot's own handlers
+        app.add_handler(CommandHandler("ping", ping), group=-1)
+        app.add_handler(CommandHandler("slow", slow), group=-1)
+
+        rng = random.Random(args.seed)
+        plan = ["/slow" if rng.random() < args.slow_share else "/ping" for _ in range(args.updates)]
+        expected_fast = plan.count("/ping")
+
+        await app.initialize()
+        if mode == "webhook":
+            port = free_port()
+            await app.updater.start_webhook(
+                listen="127.0.0.1", port=port, url_path="telegram",
+                webhook_url=f"http://127.0.0.1:{port}/telegram", secret_token="benchmark",
+                max_connections=args.max_connections,
+            )
+        else:
+            await app.updater.start_polling(poll_interval=0.0, timeout=10)
+        await app.start()
+
+        for i, text in enumerate(plan):
+            telegram.inject_command(text, user_id=1 + i % 50)
+            await asyncio.sleep(1 / args.rate)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=args.updates * args.slow_seconds + 30)
+        finally:
+            await app.updater.stop()
+            await app.stop()
+            await app.shutdown()
+
+    samples = list(latencies.values())
+    return {
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "max_ms": max(samples) * 1000,
+        "api_calls": sum(telegram.method_counts.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polling vs webhook update latency benchmark")
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.0, help="Updates per second")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="One-way network delay")
+    parser.add_argument("--slow-share", type=float, default=0.05, help="Share of updates that are slow commands")
+    parser.add_argument("--slow-seconds", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("BOT_CONCURRENT_UPDATES", "256")))
+    parser.add_argument("--max-connections", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"📨 {args.updates} updates at {args.rate:.0f}/s, {args.slow_share:.0%} slow ({args.slow_seconds}s), "
+          f"{args.latency_ms:.0f}ms one-way network delay")
+    print("=" * 70)
+    print(f"{'mode':<28}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>10}{'API calls':>12}")
+    print("-" * 70)
+    for label, mode, concurrency in (
+        ("polling, sequential", "polling", 1),
+        (f"polling, concurrency {args.concurrency}", "polling", args.concurrency),
+        (f"webhook, concurrency {args.concurrency}", "webhook", args.concurrency),
+    ):
+        r = asyncio.run(run_mode(mode, concurrency, args))
+        print(f"{label:<28}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['max_ms']:>10.1f}{r['api_calls']:>12}")
+
+
+if __name__ == "__main__":
+    main()
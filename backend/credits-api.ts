@@ -1,5 +1,6 @@
 import express from 'express';
 import cors from 'cors';
+import { randomUUID, timingSafeEqual } from 'crypto';
 import { createThirdwebClient } from 'thirdweb';
 import { prepareContractCall, sendTransaction, getContract, readContract } from 'thirdweb';
 import { privateKeyToAccount } from 'thirdweb/wallets';
@@ -47,8 +48,57 @@ interface UserCredits {
   lastUpdated: Date;
 }
 
+interface Consumption {
+  telegramUserId: string;
+  credits: number;
+  refunded: number;
+  createdAt: number;
+}
+
 // In-memory storage for demo (replace with PostgreSQL in production)
 const userCreditsStore: Map<string, UserCredits> = new Map();
+// Recorded consumptions, so a refund can only return credits that were actually consumed
+const consumptionsStore: Map<string, Consumption> = new Map();
+const REFUND_WINDOW_MS = 24 * 60 * 60 * 1000;
+
+// Shared secret the bot sends as X-Bot-Secret on consumptions and refunds
+const BOT_API_SECRET = process.env.BOT_API_SECRET;
+
+// Middleware: only the bot (holding BOT_API_SECRET) may call this endpoint
+function requireBotSecret(req: express.Request, res: express.Response, next: express.NextFunction) {
+  if (!BOT_API_SECRET) {
+    return res.status(503).json({
+      success: false,
+      error: 'BOT_API_SECRET is not configured',
+    });
+  }
+  const provided = Buffer.from(req.get('x-bot-secret') || '');
+  const expected = Buffer.from(BOT_API_SECRET);
+  if (provided.length !== expected.length || !timingSafeEqual(provided, expected)) {
+    return res.status(401).json({
+      success: false,
+      error: 'Unauthorized',
+    });
+  }
+  next();
+}
+
+// Credit amounts must be positive whole numbers (a negative deduction would add credits)
+function isCreditAmount(value: unknown): value is number {
+  return typeof value === 'number' && Number.isInteger(value) && value > 0;
+}
+
+// Helper function to record a consumption; returns its id for refunds
+function recordConsumption(telegramUserId: string, credits: number): string {
+  const now = Date.now();
+  for (const [id, consumption] of consumptionsStore) {
+    if (now - consumption.createdAt <= REFUND_WINDOW_MS) break; // insertion order: the rest are newer
+    consumptionsStore.delete(id);
+  }
+  const consumptionId = randomUUID();
+  consumptionsStore.set(consumptionId, { telegramUserId, credits, refunded: 0, createdAt: now });
+  return consumptionId;
+}
 
 // Helper function to get user credits
 async function getUserCredits(telegramUserId: string): Promise<number> {
@@ -151,7 +201,7 @@ app.get('/api/credits/:telegramUserId', async (req, res) => {
 });
 
 // Endpoint to consume credits (called by bot when user requests analysis)
-app.post('/api/consume-credits', async (req, res) => {
+app.post('/api/consume-credits', requireBotSecret, async (req, res) => {
   try {
     const { telegramUserId, creditsToConsume } = req.body;
 
@@ -162,6 +212,13 @@ app.post('/api/consume-credits', async (req, res) => {
       });
     }
 
+    if (!isCreditAmount(creditsToConsume)) {
+      return res.status(400).json({
+        success: false,
+        error: 'creditsToConsume must be a positive integer',
+      });
+    }
+
     const success = await deductUserCredits(telegramUserId, creditsToConsume);
     
     if (!success) {
@@ -177,6 +234,7 @@ app.post('/api/consume-credits', async (req, res) => {
     res.json({
       success: true,
       data: {
+        consumptionId: recordConsumption(telegramUserId, creditsToConsume),
         creditsConsumed: creditsToConsume,
         remainingCredits: remainingCredits,
       }
@@ -191,6 +249,102 @@ app.post('/api/consume-credits', async (req, res) => {
   }
 });
 
+// Endpoint to consume credits for several users in one request
+// (the bot batches consumptions and flushes them periodically under load)
+app.post('/api/consume-credits/batch', requireBotSecret, async (req, res) => {
+  try {
+    const { consumptions } = req.body;
+
+    if (!Array.isArray(consumptions)) {
+      return res.status(400).json({ 
+        success: false, 
+        error: 'consumptions must be an array' 
+      });
+    }
+
+    const results = [];
+    for (const { telegramUserId, creditsToConsume } of consumptions) {
+      if (!telegramUserId || !creditsToConsume) {
+        results.push({ telegramUserId, success: false, error: 'Missing required fields' });
+        continue;
+      }
+      if (!isCreditAmount(creditsToConsume)) {
+        results.push({ telegramUserId, success: false, error: 'creditsToConsume must be a positive integer' });
+        continue;
+      }
+
+      const success = await deductUserCredits(telegramUserId, creditsToConsume);
+      const credits = await getUserCredits(telegramUserId);
+      results.push(success
+        ? { telegramUserId, success: true, consumptionId: recordConsumption(telegramUserId, creditsToConsume),
+            creditsConsumed: creditsToConsume, remainingCredits: credits }
+        : { telegramUserId, success: false, error: 'Insufficient credits', currentCredits: credits });
+    }
+
+    res.json({
+      success: true,
+      data: { results }
+    });
+
+  } catch (error) {
+    console.error('Batch credits consumption error:', error);
+    res.status(500).json({ 
+      success: false, 
+      error: 'Failed to consume credits' 
+    });
+  }
+});
+
+// Endpoint to refund credits (called by bot when a paid analysis fails)
+// Refunds are tied to a recorded consumption and capped at what it has left to refund
+app.post('/api/refund-credits', requireBotSecret, async (req, res) => {
+  try {
+    const { telegramUserId, consumptionId, creditsToRefund } = req.body;
+
+    if (!telegramUserId || !consumptionId || !isCreditAmount(creditsToRefund)) {
+      return res.status(400).json({ 
+        success: false, 
+        error: 'Missing required fields' 
+      });
+    }
+
+    const consumption = consumptionsStore.get(consumptionId);
+    if (!consumption || consumption.telegramUserId !== telegramUserId) {
+      return res.status(404).json({
+        success: false,
+        error: 'Unknown consumption',
+      });
+    }
+
+    const creditsRefunded = Math.min(creditsToRefund, consumption.credits - consumption.refunded);
+    if (creditsRefunded <= 0) {
+      return res.status(409).json({
+        success: false,
+        error: 'Consumption already refunded',
+      });
+    }
+
+    consumption.refunded += creditsRefunded;
+    await addUserCredits(telegramUserId, creditsRefunded);
+    const totalCredits = await getUserCredits(telegramUserId);
+
+    res.json({
+      success: true,
+      data: {
+        creditsRefunded: creditsRefunded,
+        totalCredits: totalCredits,
+      }
+    });
+
+  } catch (error) {
+    console.error('Credits refund error:', error);
+    res.status(500).json({ 
+      success: false, 
+      error: 'Failed to refund credits' 
+    });
+  }
+});
+
 // Health check endpoint
 app.get('/api/health', (req, res) => {
   res.json({ 
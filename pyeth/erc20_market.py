@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Batched ERC-20 supply and market cap reads
+
+Market cap needs decimals, symbol and totalSupply per token (three
+eth_calls) plus a price. Erc20MarketReader packs the calls for every
+requested token into one Multicall3 `aggregate3` eth_call, so a batch of
+tokens costs one RPC round trip:
+
+- decimals, symbol and name never change, so they are fetched once (in
+  the same multicall as the first supply read) and cached permanently,
+  in memory and in a JSON file keyed by chain id and address
+- totalSupply is read on every call
+- prices come from the PythPriceProvider cache (one batched Hermes call
+  for whatever is not cached), looked up through a vetted contract address
+  -> Pyth feed map. A token's own symbol() is never used for pricing: anyone
+  can deploy an ERC-20 called "ETH", and it must not be valued at ETH's price
+
+Chains without Multicall3 fall back to a JSON-RPC batch of plain eth_calls
+(still one HTTP request). A failed aggregate3 only switches Multicall3 off
+for good once eth_getCode shows there is no contract at its address; other
+failures (node errors, rate limits) fall back for that one request. ABI encoding is done by hand for the few
+functions involved, so web3 is not required.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from metrics import CACHE_REQUESTS, RPC_CALLS
+
+# Multicall3 is deployed at the same address on most EVM chains
+MULTICALL3_ADDRESS = "0xca11bde05977b3631167028862be2a173976ca11"
+
+SELECTORS = {
+    "aggregate3": "82ad56cb",  # aggregate3((address,bool,bytes)[])
+    "totalSupply": "18160ddd",
+    "decimals": "313ce567",
+    "symbol": "95d89b41",
+    "name": "06fdde03",
+}
+METADATA_FIELDS = ("decimals", "symbol", "name")
+
+# Canonical token contracts per chain id -> Pyth feed (see pyth_oracle.PRICE_FEEDS).
+# Wrapped assets are priced as the asset they wrap. Addresses not listed get no price.
+TOKEN_PRICE_FEEDS: Dict[int, Dict[str, str]] = {
+    1: {  # Ethereum
+        "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2": "ETH/USD",  # WETH
+        "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599": "BTC/USD",  # WBTC
+        "0xb8c77482e45f1f44de1745f52c74426c631bdd52": "BNB/USD",  # BNB
+        "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": "USDC/USD",  # USDC
+        "0xdac17f958d2ee523a2206206994597c13d831ec7": "USDT/USD",  # USDT
+    },
+    56: {  # BNB Smart Chain
+        "0xbb4cdb9cbd36b01bd1cbaebf2de08d9173bc095c": "BNB/USD",  # WBNB
+        "0x8ac76a51cc950d9822d68b83fe1ad97b32cd580d": "USDC/USD",  # USDC
+        "0x55d398326f99059ff775485246999027b3197955": "USDT/USD",  # USDT
+    },
+    8453: {  # Base
+        "0x4200000000000000000000000000000000000006": "ETH/USD",  # WETH
+        "0x833589fcd6edb6e08f4c7c32d4f71b54bda02913": "USDC/USD",  # USDC
+    },
+}
+
+
+# --- ABI helpers ---
+
+def _word(value: int) -> str:
+    return f"{value % (1 << 256):064x}"
+
+
+def _padded(data: bytes) -> str:
+    return data.hex() + "00" * (-len(data) % 32)
+
+
+def encode_aggregate3(calls: Sequence[Tuple[str, str]]) -> str:
+    """Calldata for aggregate3 over (target address, calldata hex) pairs, all allowed to fail"""
+    heads, tails, offset = [], [], 32 * len(calls)
+    for target, calldata in calls:
+        data = bytes.fromhex(calldata.removeprefix("0x"))
+        # (address target, bool allowFailure, bytes callData): head of 3 words, then the bytes
+        encoded = _word(int(target, 16)) + _word(1) + _word(96) + _word(len(data)) + _padded(data)
+        heads.append(_word(offset))
+        tails.append(encoded)
+        offset += len(encoded) // 2
+    return "0x" + SELECTORS["aggregate3"] + _word(32) + _word(len(calls)) + "".join(heads) + "".join(tails)
+
+
+def decode_aggregate3(result: bytes) -> List[Tuple[bool, bytes]]:
+    """Decode aggregate3's (bool success, bytes returnData)[]"""
+    def word(position: int) -> int:
+        return int.from_bytes(result[position:position + 32], "big")
+
+    start = word(0)
+    count = word(start)
+    base = start + 32
+    decoded = []
+    for index in range(count):
+        entry = base + word(base + 32 * index)
+        success = bool(word(entry))
+        data_at = entry + word(entry + 32)
+        length = word(data_at)
+        decoded.append((success, result[data_at + 32:data_at + 32 + length]))
+    return decoded
+
+
+def decode_uint(data: bytes) -> Optional[int]:
+    return int.from_bytes(data[:32], "big") if len(data) >= 32 else None
+
+
+def decode_string(data: bytes) -> Optional[str]:
+    """ABI string, or bytes32 for tokens that predate the standard (e.g. MKR)"""
+    if len(data) == 32:
+        return data.rstrip(b"\0").decode("utf-8", "replace") or None
+    if len(data) >= 64:
+        offset = int.from_bytes(data[:32], "big")
+        length = int.from_bytes(data[offset:offset + 32], "big")
+        return data[offset + 32:offset + 32 + length].decode("utf-8", "replace")
+    return None
+
+
+def encode_uint(value: int) -> str:
+    return _word(value)
+
+
+def encode_string(value: str) -> str:
+    data = value.encode("utf-8")
+    return _word(32) + _word(len(data)) + _padded(data)
+
+
+class Erc20MarketReader:
+    """
+    Batched ERC-20 reads with a permanent metadata cache
+
+    Args:
+        rpc_url: JSON-RPC endpoint
+        multicall_address: Multicall3 deployment (None: always use JSON-RPC batches)
+        metadata_path: JSON file for the metadata cache (None keeps it in memory)
+        price_provider: PythPriceProvider (or any provider with get_many) for prices
+        timeout: Seconds per RPC request
+        price_feeds: chain id -> {contract address: Pyth feed} (default TOKEN_PRICE_FEEDS)
+    """
+
+    def __init__(self, rpc_url: str, multicall_address: Optional[str] = MULTICALL3_ADDRESS,
+                 metadata_path: Optional[str] = None, price_provider=None, timeout: float = 10.0,
+                 price_feeds: Optional[Dict[int, Dict[str, str]]] = None):
+        self.rpc_url = rpc_url
+        self.multicall_address = multicall_address
+        self.price_feeds = {chain: {address.lower(): feed for address, feed in feeds.items()}
+                            for chain, feeds in (TOKEN_PRICE_FEEDS if price_feeds is None else price_feeds).items()}
+        self.metadata_path = metadata_path
+        self.price_provider = price_provider
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._chain_id: Optional[int] = None
+        self._metadata: Dict[str, Dict] = {}  # "chain:address" -> decimals/symbol/name
+        self._lock = threading.Lock()
+        self._hit = CACHE_REQUESTS.labels("token_metadata", "hit")
+        self._miss = CACHE_REQUESTS.labels("token_metadata", "miss")
+        self.round_trips = 0
+        self._load()
+
+    # --- Metadata cache ---
+
+    def _load(self):
+        if not self.metadata_path or not os.path.exists(self.metadata_path):
+            return
+        try:
+            with open(self.metadata_path, "r", encoding="utf-8") as f:
+                self._metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read token metadata cache: {e}")
+
+    def _save(self):
+        if not self.metadata_path:
+            return
+        with self._lock:
+            data = json.dumps(self._metadata)
+        tmp = f"{self.metadata_path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.metadata_path)
+        except OSError as e:
+            print(f"⚠️ Could not write token metadata cache: {e}")
+
+    # --- RPC ---
+
+    def _rpc(self, payload):
+        with self._lock:
+            self.round_trips += 1
+        for call in payload if isinstance(payload, list) else [payload]:
+            RPC_CALLS.labels(call["method"]).inc()
+        response = self.session.post(self.rpc_url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            reply = self._rpc({"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []})
+            self._chain_id = int(reply["result"], 16)
+        return self._chain_id
+
+    def _call_many(self, calls: List[Tuple[str, str]]) -> List[Optional[bytes]]:
+        """Run (address, calldata) eth_calls in one round trip; None where a call failed"""
+        if not calls:
+            return []
+        if self.multicall_address:
+            request = {"to": self.multicall_address, "data": encode_aggregate3(calls)}
+            reply = self._rpc({"jsonrpc": "2.0", "id": 1, "method": "eth_call", "params": [request, "latest"]})
+            result = reply.get("result") or "0x"
+            if "error" not in reply and len(result) > 2:
+                return [data if ok else None for ok, data in decode_aggregate3(bytes.fromhex(result[2:]))]
+            if not self._has_code(self.multicall_address):
+                print(f"⚠️ Multicall3 unavailable at {self.multicall_address}, using JSON-RPC batches")
+                self.multicall_address = None
+            # Otherwise a node error or rate limit: this request falls back, the next tries Multicall3 again
+        batch = [{"jsonrpc": "2.0", "id": index, "method": "eth_call",
+                  "params": [{"to": address, "data": "0x" + calldata}, "latest"]}
+                 for index, (address, calldata) in enumerate(calls)]
+        replies = {reply.get("id"): reply for reply in self._rpc(batch)}
+        results = []
+        for index in range(len(calls)):
+            result = replies.get(index, {}).get("result")
+            results.append(bytes.fromhex(result[2:]) if result and len(result) > 2 else None)
+        return results
+
+    def _has_code(self, address: str) -> bool:
+        """False only when the node confirms there is no contract at ``address``"""
+        reply = self._rpc({"jsonrpc": "2.0", "id": 1, "method": "eth_getCode", "params": [address, "latest"]})
+        code = reply.get("result")
+        return "error" in reply or code is None or len(code) > 2
+
+    # --- Reads ---
+
+    def read_tokens(self, addresses: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Metadata and current totalSupply for many tokens in one round trip
+
+        Returns:
+            address -> {"address", "symbol", "name", "decimals", "total_supply_raw", "total_supply"}
+            (total_supply is None when the call failed, e.g. not an ERC-20)
+        """
+        addresses = list(dict.fromkeys(address.strip().lower() for address in addresses))
+        chain = self.chain_id
+        calls, plan = [], []
+        fetched_metadata = False
+        for address in addresses:
+            calls.append((address, SELECTORS["totalSupply"]))
+            plan.append((address, "totalSupply"))
+            with self._lock:
+                cached = f"{chain}:{address}" in self._metadata
+            if cached:
+                self._hit.inc()
+                continue
+            self._miss.inc()
+            fetched_metadata = True
+            for field in METADATA_FIELDS:
+                calls.append((address, SELECTORS[field]))
+                plan.append((address, field))
+
+        raw: Dict[str, Dict] = {address: {} for address in addresses}
+        for (address, field), data in zip(plan, self._call_many(calls)):
+            if data is None:
+                continue
+            raw[address][field] = decode_string(data) if field in ("symbol", "name") else decode_uint(data)
+
+        tokens = {}
+        for address in addresses:
+            key = f"{chain}:{address}"
+            values = raw[address]
+            with self._lock:
+                metadata = self._metadata.get(key)
+                if metadata is None and values.get("decimals") is not None:
+                    metadata = self._metadata[key] = {field: values.get(field) for field in METADATA_FIELDS}
+            supply = values.get("totalSupply")
+            decimals = metadata["decimals"] if metadata else None
+            tokens[address] = {
+                "address": address,
+                "symbol": metadata["symbol"] if metadata else None,
+                "name": metadata["name"] if metadata else None,
+                "decimals": decimals,
+                "total_supply_raw": supply,
+                "total_supply": supply / 10 ** decimals if supply is not None and decimals is not None else None,
+            }
+        if fetched_metadata:
+            self._save()
+        return tokens
+
+    def market_caps(self, addresses: Sequence[str]) -> Dict[str, Dict]:
+        """
+        read_tokens plus USD price and market cap (total supply x price)
+
+        Prices are looked up by contract address in ``price_feeds`` for the
+        reader's chain, never by the symbol a token reports; tokens not in
+        the map get price_feed, price and market cap None.
+        """
+        tokens = self.read_tokens(addresses)
+        vetted = self.price_feeds.get(self.chain_id, {})
+        feeds = {address: vetted[address] for address in tokens if address in vetted}
+        prices = self.price_provider.get_many(sorted(set(feeds.values()))) if self.price_provider and feeds else {}
+        for address, token in tokens.items():
+            token["price_feed"] = feeds.get(address)
+            price = prices.get(feeds.get(address))
+            token["price_usd"] = price["price"] if price else None
+            token["market_cap_usd"] = (token["total_supply"] * price["price"]
+                                       if price and token["total_supply"] is not None else None)
+        return tokens
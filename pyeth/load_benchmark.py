@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Offline Load Benchmark for the Price API
+
+Starts local stand-ins for Hermes (JSON + SSE) and JSON-RPC, then drives
+PythOracle and the web_api Flask app at fixed request rates (open loop) and
+reports throughput and p50/p95/p99 latency. Latency is measured from each
+request's scheduled send time, so queueing under overload is not hidden.
+
+Results are written as JSON so runs can be compared across commits:
+
+    python load_benchmark.py --rate 200 --duration 10 --latency-ms 20 --error-rate 0.01
+    python load_benchmark.py --compare benchmark_results/load_<commit>_<time>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from price_provider import PythPriceProvider, StubPriceProvider
+from pyth_oracle import PRICE_FEEDS, PythOracle, WEB3_AVAILABLE
+from stand_ins import HermesStandIn, JsonRpcStandIn
+
+RESULTS_DIR = Path(__file__).parent / "benchmark_results"
+
+# Throwaway key for the JSON-RPC stand-in (never used against a real chain)
+STAND_IN_PRIVATE_KEY = "0x" + "11" * 32
+STAND_IN_PYTH_CONTRACT = "0x" + "22" * 20
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, offered_rate: float) -> Dict:
+    latencies = sorted(latencies)
+    completed = len(latencies)
+    return {
+        "offered_rate": offered_rate,
+        "requests": completed + errors,
+        "errors": errors,
+        "error_ratio": round(errors / max(1, completed + errors), 4),
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def run_fixed_rate(call: Callable[[], bool], rate: float, duration: float, concurrency: int) -> Dict:
+    """
+    Issue ``call`` at a fixed rate for ``duration`` seconds
+
+    ``call`` returns True on success. Requests are scheduled on a fixed clock
+    regardless of completions (open loop).
+    """
+    total = int(rate * duration)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(scheduled: float):
+        nonlocal errors
+        try:
+            ok = call()
+        except Exception:
+            ok = False
+        finished = time.perf_counter()
+        with lock:
+            if ok:
+                latencies.append(finished - scheduled)
+            else:
+                errors += 1
+
+    # Oracle methods print on failure; keep injected errors from flooding the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for i in range(total):
+                scheduled = start + i / rate
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(timed, scheduled)
+        elapsed = time.perf_counter() - start
+
+    return summarize(latencies, errors, elapsed, rate)
+
+
+# --- Scenarios ---
+
+def scenario_oracle_fetch(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    oracle = PythOracle(hermes_url=hermes.url)
+    symbols = ["BTC/USD", "ETH/USD", "SOL/USD"]
+    return run_fixed_rate(lambda: bool(oracle.fetch_prices(symbols)), args.rate, args.duration, args.concurrency)
+
+
+def scenario_oracle_vaa(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    oracle = PythOracle(hermes_url=hermes.url)
+    symbols = ["BTC/USD", "ETH/USD"]
+    return run_fixed_rate(lambda: bool(oracle.fetch_vaa_data(symbols)), args.rate, args.duration, args.concurrency)
+
+
+def scenario_oracle_onchain_read(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    if not WEB3_AVAILABLE:
+        return {"skipped": "web3 not installed"}
+    with contextlib.redirect_stdout(io.StringIO()):
+        oracle = PythOracle(
+            rpc_url=rpc.url,
+            private_key=STAND_IN_PRIVATE_KEY,
+            pyth_contract=STAND_IN_PYTH_CONTRACT,
+            hermes_url=hermes.url,
+        )
+    if not oracle.w3:
+        return {"skipped": "could not connect to JSON-RPC stand-in"}
+    result = run_fixed_rate(
+        lambda: oracle.get_on_chain_price("BTC/USD", safe=False) is not None,
+        args.rate, args.duration, args.concurrency,
+    )
+    result["rpc_calls_by_method"] = dict(rpc.method_counts)
+    return result
+
+
+def _drive_web_api(provider, args) -> Dict:
+    from werkzeug.serving import make_server
+    import web_api
+
+    app = web_api.create_app(provider=provider)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/price/BTC-USD"
+    local = threading.local()
+
+    def call() -> bool:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        return session.get(url, timeout=10).status_code == 200
+
+    try:
+        return run_fixed_rate(call, args.rate, args.duration, args.concurrency)
+    finally:
+        server.shutdown()
+
+
+def scenario_web_api(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    """Full path: Flask -> PythPriceProvider cache -> PythOracle -> Hermes stand-in"""
+    provider = PythPriceProvider(PythOracle(hermes_url=hermes.url), ttl=args.cache_ttl)
+    before = hermes.request_counts.get("/api/latest_price_feeds", 0)
+    result = _drive_web_api(provider, args)
+    result["upstream_requests"] = hermes.request_counts.get("/api/latest_price_feeds", 0) - before
+    return result
+
+
+def scenario_web_api_stub(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    """API overhead only: Flask with the in-process StubPriceProvider"""
+    return _drive_web_api(StubPriceProvider(), args)
+
+
+def scenario_sse_stream(hermes: HermesStandIn, rpc: JsonRpcStandIn, args) -> Dict:
+    """Fan-out: N subscribers on the SSE stream, latency from server send to client parse"""
+    ids = [PRICE_FEEDS[s] for s in ("BTC/USD", "ETH/USD", "SOL/USD")]
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.time() + args.duration
+
+    def subscribe():
+        nonlocal errors
+        with requests.get(f"{hermes.url}/v2/updates/price/stream", params={"ids[]": ids},
+                          stream=True, timeout=args.duration + 5) as response:
+            for line in response.iter_lines(chunk_size=1):
+                if time.time() > deadline:
+                    break
+                if not line.startswith(b"data: "):
+                    continue
+                message = json.loads(line[6:])
+                with lock:
+                    if "sent_at" in message:
+                        latencies.append(time.time() - message["sent_at"])
+                    else:
+                        errors += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=subscribe, daemon=True) for _ in range(args.subscribers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(args.duration + 10)
+    elapsed = time.perf_counter() - start
+
+    result = summarize(latencies, errors, elapsed, args.subscribers / hermes.stream_interval)
+    result["subscribers"] = args.subscribers
+    return result
+
+
+SCENARIOS = {
+    "oracle_fetch": scenario_oracle_fetch,
+    "oracle_vaa": scenario_oracle_vaa,
+    "oracle_onchain_read": scenario_oracle_onchain_read,
+    "web_api_price": scenario_web_api,
+    "web_api_stub": scenario_web_api_stub,
+    "sse_stream": scenario_sse_stream,
+}
+
+
+# --- Reporting ---
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict] = None):
+    print(f"\n{'Scenario':<22}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    print("-" * 70)
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<22}⚠️  skipped: {result['skipped']}")
+            continue
+        print(f"{name:<22}{result['throughput_rps']:>10}{result['p50_ms']:>10}"
+              f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}")
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous and "skipped" not in previous:
+            deltas = []
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+                if previous.get(key):
+                    deltas.append(f"{key} {(result[key] - previous[key]) / previous[key] * 100:+.1f}%")
+            print(f"{'':<22}vs {baseline['meta']['commit']}: " + ", ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load benchmark for the price API")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--rate", type=float, default=100.0, help="requests per second per scenario")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="client worker threads")
+    parser.add_argument("--subscribers", type=int, default=10, help="SSE subscribers")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="injected upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="injected upstream jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream requests failing")
+    parser.add_argument("--cache-ttl", type=float, default=1.0, help="PythPriceProvider cache TTL (0 disables)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="result JSON path (default: benchmark_results/)")
+    parser.add_argument("--compare", type=Path, help="previous result JSON to diff against")
+    args = parser.parse_args()
+
+    injection = dict(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                     error_rate=args.error_rate, seed=args.seed)
+
+    print("🚀 FinRizz offline load benchmark")
+    print("=" * 50)
+    print(f"   rate={args.rate}/s duration={args.duration}s latency={args.latency_ms}ms "
+          f"jitter={args.jitter_ms}ms error_rate={args.error_rate}")
+
+    results = {}
+    with HermesStandIn(**injection) as hermes, JsonRpcStandIn(**injection) as rpc:
+        for name in args.scenarios:
+            print(f"⏱️  Running {name}...")
+            results[name] = SCENARIOS[name](hermes, rpc, args)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        },
+        "scenarios": results,
+    }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_results(results, baseline)
+
+    output = args.output or RESULTS_DIR / f"load_{commit}_{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\n💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for CPU Hot Paths (with regression gate)
+
+Times the pure-CPU paths of the price pipeline and the bot formatter on
+synthetic fixtures at several sizes:
+
+- PythOracle._parse_price_data / ZGPythOracle._parse_zg_price_data
+- VAA base64 decode (PythOracle._decode_vaa_data)
+- 0G DA payload construction (ZGPythOracle._build_da_payload)
+- bot.format_analysis_summary / bot.format_token_analysis on large reports
+
+Usage:
+    python micro_benchmark.py --save-baseline          # record a baseline
+    python micro_benchmark.py --threshold 0.15         # fail if >15% slower
+    python micro_benchmark.py --filter parse
+
+Exit status is 1 when any case regresses beyond the threshold.
+"""
+
+import argparse
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pyth_oracle
+import zg_pyth_oracle
+from pyth_oracle import PythOracle
+from zg_pyth_oracle import ZGPriceData, ZGPythOracle
+
+AGENTIC_BACKEND_DIR = Path(__file__).resolve().parent.parent / "agentic_backend"
+DEFAULT_BASELINE = Path(__file__).parent / "benchmark_results" / "micro_baseline.json"
+
+FEED_SIZES = (6, 64, 512)
+REPORT_SIZES = (10_000, 200_000, 2_000_000)
+
+
+# --- Synthetic fixtures ---
+
+@contextlib.contextmanager
+def synthetic_feeds(count: int):
+    """Temporarily extend PRICE_FEEDS of both oracles to ``count`` symbols"""
+    extra = {
+        f"SYN{i}/USD": "0x" + hashlib.sha256(f"SYN{i}".encode()).hexdigest()
+        for i in range(max(0, count - len(pyth_oracle.PRICE_FEEDS)))
+    }
+    originals = [dict(module.PRICE_FEEDS) for module in (pyth_oracle, zg_pyth_oracle)]
+    try:
+        for module in (pyth_oracle, zg_pyth_oracle):
+            module.PRICE_FEEDS.update(extra)
+        yield
+    finally:
+        for module, original in zip((pyth_oracle, zg_pyth_oracle), originals):
+            module.PRICE_FEEDS.clear()
+            module.PRICE_FEEDS.update(original)
+
+
+def hermes_response(symbols: List[str]) -> List[dict]:
+    """Hermes latest_price_feeds payload (verbose) for the given symbols"""
+    items = []
+    for i, symbol in enumerate(symbols):
+        price = {"price": str(6_500_000_000_000 + i), "conf": "3250000000", "expo": -8,
+                 "publish_time": 1_700_000_000 + i}
+        items.append({
+            "id": pyth_oracle.PRICE_FEEDS[symbol].replace("0x", ""),
+            "price": price,
+            "ema_price": dict(price),
+            "metadata": {"slot": 1000 + i, "emitter_chain": 26},
+        })
+    # Hermes does not promise response order; reverse to avoid best-case matching
+    return items[::-1]
+
+
+def vaa_response(count: int) -> List[str]:
+    """Base64 VAAs of realistic size (~1 KB each)"""
+    rng = random.Random(count)
+    return [base64.b64encode(bytes(rng.getrandbits(8) for _ in range(1024))).decode("ascii")
+            for _ in range(count)]
+
+
+def zg_price_data(symbols: List[str]) -> Dict[str, ZGPriceData]:
+    now = datetime.now()
+    return {
+        symbol: ZGPriceData(symbol=symbol, price=65000.0 + i, confidence=32.5, timestamp=now,
+                            feed_id=pyth_oracle.PRICE_FEEDS[symbol], zg_block_height=1_000_000 + i)
+        for i, symbol in enumerate(symbols)
+    }
+
+
+def llm_report(size: int) -> str:
+    """Markdown report resembling team output (headings, tables, bullets, prose)"""
+    rng = random.Random(size)
+    templates = [
+        "## Token Overview: {name}",
+        "| Metric | Value | Source |",
+        "|---|---|---|",
+        "| Market Cap | ${n}M | CryptoRank |",
+        "- **Recommendation:** {rec} with a {risk} risk profile",
+        "The project {name} raised ${n}M from tier-1 investors; vesting unlocks over {n} months.",
+        "* Whale concentration risk is {risk}; top holders control {n}% of supply.",
+        "Sentiment on social channels is {sent} after the latest announcement.",
+        "Liquidity depth across DEX pools remains thin relative to the valuation of {name}.",
+        "",
+    ]
+    words = {"name": ["Divine", "RedotPay", "UpTop", "Nexa", "Orbital"],
+             "rec": ["BUY", "HOLD", "SELL"], "risk": ["low", "medium", "high"],
+             "sent": ["bullish", "bearish", "mixed"]}
+    lines, total = [], 0
+    while total < size:
+        line = rng.choice(templates).format(
+            name=rng.choice(words["name"]), rec=rng.choice(words["rec"]), risk=rng.choice(words["risk"]),
+            sent=rng.choice(words["sent"]), n=rng.randint(1, 500),
+        )
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+# --- Cases ---
+
+def build_cases(selected: str = None) -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    """Return (name, setup) pairs; setup builds fixtures and returns the timed callable"""
+    cases = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        oracle = PythOracle()
+        zg_oracle = ZGPythOracle()
+    zg_oracle.w3 = None  # keep the parse path free of RPC calls
+
+    # Cases run inside synthetic_feeds(max(FEED_SIZES)), so the first N symbols exist
+    for size in FEED_SIZES:
+        def parse_setup(size=size):
+            symbols = list(pyth_oracle.PRICE_FEEDS)[:size]
+            raw = hermes_response(symbols)
+            return lambda: oracle._parse_price_data(raw, symbols)
+
+        def zg_parse_setup(size=size):
+            symbols = list(pyth_oracle.PRICE_FEEDS)[:size]
+            raw = hermes_response(symbols)
+            return lambda: zg_oracle._parse_zg_price_data(raw, symbols)
+
+        def vaa_setup(size=size):
+            vaas = vaa_response(size)
+            symbols = [f"S{i}" for i in range(size)]
+            return lambda: oracle._decode_vaa_data(vaas, symbols)
+
+        def da_setup(size=size):
+            data = zg_price_data(list(pyth_oracle.PRICE_FEEDS)[:size])
+            return lambda: zg_oracle._build_da_payload(data)
+
+        cases += [
+            (f"parse_price_data[{size}]", parse_setup),
+            (f"parse_zg_price_data[{size}]", zg_parse_setup),
+            (f"decode_vaa_data[{size}]", vaa_setup),
+            (f"build_da_payload[{size}]", da_setup),
+        ]
+
+    for size in REPORT_SIZES:
+        def summary_setup(size=size):
+            bot = _import_bot()
+            report = llm_report(size)
+            return lambda: bot.format_analysis_summary(report)
+
+        def token_setup(size=size):
+            bot = _import_bot()
+            report = llm_report(size)
+            return lambda: bot.format_token_analysis(report, "0x" + "ab" * 20)
+
+        label = f"{size // 1000}kb"
+        cases += [
+            (f"format_analysis_summary[{label}]", summary_setup),
+            (f"format_token_analysis[{label}]", token_setup),
+        ]
+
+    if selected:
+        cases = [case for case in cases if selected in case[0]]
+    return cases
+
+
+def _import_bot():
+    if str(AGENTIC_BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(AGENTIC_BACKEND_DIR))
+    import bot
+    return bot
+
+
+# --- Timing ---
+
+def time_case(fn: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    """Auto-calibrated timing; returns best and median microseconds per call"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"best_us": min(samples) * 1e6, "median_us": statistics.median(samples) * 1e6, "loops": number}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks with regression gate")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per timing sample")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_REGRESSION_THRESHOLD", 0.15)),
+                        help="allowed slowdown vs baseline (0.15 = 15%%)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()).get("cases", {})
+
+    print("⏱️  FinRizz microbenchmarks")
+    print("=" * 78)
+    print(f"{'Case':<36}{'best µs':>12}{'median µs':>12}{'vs base':>10}")
+    print("-" * 78)
+
+    results, regressions = {}, []
+    with synthetic_feeds(max(FEED_SIZES)):
+        for name, setup in build_cases(args.filter):
+            try:
+                fn = setup()
+            except Exception as e:
+                print(f"{name:<36}⚠️  skipped: {e}")
+                continue
+            result = time_case(fn, args.repeat, args.min_time)
+            results[name] = result
+
+            verdict = ""
+            previous = baseline.get(name)
+            if previous:
+                change = result["best_us"] / previous["best_us"] - 1
+                verdict = f"{change * 100:+.1f}%"
+                if change > args.threshold:
+                    regressions.append((name, change))
+                    verdict += " ❌"
+            print(f"{name:<36}{result['best_us']:>12.2f}{result['median_us']:>12.2f}{verdict:>10}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "meta": {"timestamp": datetime.now().isoformat(), "python": platform.python_version(),
+                     "machine": platform.machine()},
+            "cases": results,
+        }, indent=2))
+        print(f"\n💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold * 100:.0f}%:")
+        for name, change in regressions:
+            print(f"   {name}: {change * 100:+.1f}%")
+        sys.exit(1)
+    elif baseline:
+        print(f"\n✅ No regressions beyond {args.threshold * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
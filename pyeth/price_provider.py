@@ -0,0 +1,194 @@
+"""
+Price Providers for the Web API
+
+A single interface the API talks to, with two implementations:
+
+- PythPriceProvider: backed by one long-lived PythOracle (pooled Hermes
+  session) with a short TTL cache and batched get_many
+- StubPriceProvider: deterministic in-process prices for load tests
+
+Use create_price_provider() to pick one from the environment
+(PRICE_PROVIDER=pyth|stub, PRICE_CACHE_TTL, PRICE_FAILURE_TTL and
+PRICE_MAX_STALE seconds).
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from metrics import CACHE_REQUESTS
+from pyth_oracle import PRICE_FEEDS, PriceData, PythOracle
+
+
+def price_to_dict(data: PriceData) -> Dict:
+    """JSON-friendly representation used by the API responses"""
+    return {
+        "symbol": data.symbol,
+        "price": data.price,
+        "confidence": data.confidence,
+        "timestamp": data.timestamp.isoformat(),
+        "feed_id": data.feed_id,
+    }
+
+
+class PriceProvider(ABC):
+    """Interface between the API handlers and a price source"""
+
+    name = "base"
+
+    @abstractmethod
+    def get_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Prices for every known symbol in ``symbols`` (unknown ones are omitted)"""
+
+    @abstractmethod
+    def symbols(self) -> List[str]:
+        """Symbols this provider can price"""
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Price for a single symbol, or None if unavailable"""
+        return self.get_many([symbol]).get(symbol)
+
+
+class PythPriceProvider(PriceProvider):
+    """
+    PythOracle-backed provider with a TTL cache
+
+    Fresh entries are served from memory; misses for a request are fetched
+    from Hermes in one batched call. Each symbol has its own refresh lock
+    (taken in sorted order) and is re-checked once held, so a burst of
+    requests for the same symbols results in a single upstream call while
+    misses for other symbols proceed in parallel.
+
+    A symbol Hermes fails to return is not asked for again for
+    ``failure_ttl`` seconds; meanwhile (and on the failed call itself) its
+    last price is served if it is less than ``max_stale`` seconds old.
+
+    Args:
+        oracle: Oracle to fetch from (a new one is created if not provided)
+        ttl: Seconds a fetched price is served from cache
+        failure_ttl: Seconds a failed symbol is not refetched
+        max_stale: Seconds an expired price may stand in while Hermes fails
+    """
+
+    name = "pyth"
+
+    def __init__(self, oracle: PythOracle = None, ttl: float = 1.0, failure_ttl: float = 2.0,
+                 max_stale: float = 60.0):
+        self.oracle = oracle or PythOracle()
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_stale = max_stale
+        self._cache: Dict[str, tuple] = {}  # symbol -> (fetched_at, price dict)
+        self._failed_at: Dict[str, float] = {}  # symbol -> when Hermes last failed to return it
+        self._locks = {symbol: threading.Lock() for symbol in PRICE_FEEDS}
+        self._hit = CACHE_REQUESTS.labels("price", "hit")
+        self._miss = CACHE_REQUESTS.labels("price", "miss")
+        self._stale = CACHE_REQUESTS.labels("price", "stale")
+
+    def _fresh(self, symbols: List[str], now: float) -> Dict[str, Dict]:
+        found = {}
+        for symbol in symbols:
+            entry = self._cache.get(symbol)
+            if entry is not None and now - entry[0] < self.ttl:
+                found[symbol] = entry[1]
+        return found
+
+    def get_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        symbols = [s for s in dict.fromkeys(symbols) if s in PRICE_FEEDS]
+        result = self._fresh(symbols, time.monotonic())
+        if len(result) == len(symbols):
+            self._hit.inc(len(symbols))
+            return result
+
+        missing = [s for s in symbols if s not in result]
+        result.update(self._refresh(missing))
+        self._hit.inc(len(symbols) - len(missing))
+        self._miss.inc(len(missing))
+        return result
+
+    def _refresh(self, symbols: List[str]) -> Dict[str, Dict]:
+        locks = [self._locks[symbol] for symbol in sorted(symbols)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            # Another request may have refreshed these while we waited
+            now = time.monotonic()
+            result = self._fresh(symbols, now)
+            due = [s for s in symbols
+                   if s not in result and now - self._failed_at.get(s, float("-inf")) >= self.failure_ttl]
+            if due:
+                fetched = self.oracle.fetch_prices(due)
+                fetched_at = time.monotonic()
+                for symbol in due:
+                    data = fetched.get(symbol)
+                    if data is None:
+                        self._failed_at[symbol] = fetched_at
+                        continue
+                    self._failed_at.pop(symbol, None)
+                    entry = price_to_dict(data)
+                    self._cache[symbol] = (fetched_at, entry)
+                    result[symbol] = entry
+            for symbol in symbols:
+                entry = self._cache.get(symbol)
+                if symbol not in result and entry is not None and now - entry[0] < self.max_stale:
+                    result[symbol] = entry[1]
+                    self._stale.inc()
+            return result
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def symbols(self) -> List[str]:
+        return list(PRICE_FEEDS.keys())
+
+
+class StubPriceProvider(PriceProvider):
+    """
+    Deterministic in-process prices (no network)
+
+    Lets load tests measure the API's own overhead without an upstream.
+    """
+
+    name = "stub"
+
+    BASE_PRICES = {
+        "BTC/USD": 65000.0, "ETH/USD": 3200.0, "SOL/USD": 150.0,
+        "BNB/USD": 580.0, "USDC/USD": 1.0, "USDT/USD": 1.0,
+    }
+
+    def get_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        now = datetime.now().isoformat()
+        return {
+            symbol: {
+                "symbol": symbol,
+                "price": self.BASE_PRICES.get(symbol, 10.0),
+                "confidence": self.BASE_PRICES.get(symbol, 10.0) * 0.0005,
+                "timestamp": now,
+                "feed_id": PRICE_FEEDS[symbol],
+            }
+            for symbol in symbols if symbol in PRICE_FEEDS
+        }
+
+    def symbols(self) -> List[str]:
+        return list(PRICE_FEEDS.keys())
+
+
+PROVIDERS = {
+    "pyth": PythPriceProvider,
+    "stub": StubPriceProvider,
+}
+
+
+def create_price_provider(kind: str = None) -> PriceProvider:
+    """Build the provider named by ``kind`` or the PRICE_PROVIDER env var (default: pyth)"""
+    kind = (kind or os.getenv("PRICE_PROVIDER", "pyth")).lower()
+    if kind not in PROVIDERS:
+        raise ValueError(f"Unknown price provider '{kind}'. Choose from: {', '.join(PROVIDERS)}")
+    if kind == "pyth":
+        return PythPriceProvider(ttl=float(os.getenv("PRICE_CACHE_TTL", "1.0")),
+                                 failure_ttl=float(os.getenv("PRICE_FAILURE_TTL", "2.0")),
+                                 max_stale=float(os.getenv("PRICE_MAX_STALE", "60")))
+    return PROVIDERS[kind]()
@@ -6,12 +6,15 @@ This single file replaces multiple scattered implementations with a unified appr
 """
 
 import os
+import base64
 import time
 import requests
 from typing import Dict, List, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
 
+from metrics import HERMES_REQUEST_SECONDS, HERMES_ERRORS, instrument_provider, record_snapshot
+
 # Optional blockchain imports - will be checked at runtime
 try:
     from web3 import Web3
@@ -114,7 +117,8 @@ class PythOracle:
     3. Read prices from on-chain contract
     """
     
-    def __init__(self, rpc_url: str = None, private_key: str = None, pyth_contract: str = None):
+    def __init__(self, rpc_url: str = None, private_key: str = None, pyth_contract: str = None,
+                 hermes_url: str = None):
         """
         Initialize Pyth Oracle
         
@@ -122,9 +126,16 @@ class PythOracle:
             rpc_url: Ethereum RPC endpoint (from env if not provided)
             private_key: Wallet private key (from env if not provided)  
             pyth_contract: Pyth contract address (from env if not provided)
+            hermes_url: Hermes API base URL (from env if not provided, defaults to public Hermes)
         """
         # Hermes API configuration
-        self.hermes_url = "https://hermes.pyth.network"
+        self.hermes_url = hermes_url or os.getenv("HERMES_URL", "https://hermes.pyth.network")
+        
+        # Long-lived HTTP session so repeated fetches reuse pooled keep-alive connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
         # Blockchain configuration
         self.rpc_url = rpc_url or os.getenv("RPC_URL")
@@ -147,7 +158,7 @@ class PythOracle:
             
         try:
             # Connect to blockchain
-            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            self.w3 = Web3(instrument_provider(Web3.HTTPProvider(self.rpc_url)))
             
             if not self.w3.is_connected():
                 raise Exception("Failed to connect to blockchain")
@@ -197,17 +208,22 @@ class PythOracle:
         
         try:
             # Fetch from Hermes
-            response = requests.get(
-                f"{self.hermes_url}/api/latest_price_feeds",
-                params={"ids[]": feed_ids, "verbose": "true", "binary": "false"},
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            raw_data = response.json()
-            return self._parse_price_data(raw_data, valid_symbols)
+            with HERMES_REQUEST_SECONDS.labels("latest_price_feeds").time():
+                response = self.session.get(
+                    f"{self.hermes_url}/api/latest_price_feeds",
+                    params={"ids[]": feed_ids, "verbose": "true", "binary": "false"},
+                    timeout=10
+                )
+                response.raise_for_status()
+                raw_data = response.json()
+            
+            parsed = self._parse_price_data(raw_data, valid_symbols)
+            for symbol, data in parsed.items():
+                record_snapshot(symbol, data.timestamp.timestamp())
+            return parsed
             
         except Exception as e:
+            HERMES_ERRORS.labels("latest_price_feeds").inc()
             print(f"❌ Failed to fetch prices: {e}")
             return {}
     
@@ -231,28 +247,27 @@ class PythOracle:
         feed_ids = [PRICE_FEEDS[symbol] for symbol in valid_symbols]
         
         try:
-            response = requests.get(
-                f"{self.hermes_url}/api/latest_vaas",
-                params={"ids[]": feed_ids},
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            vaa_data = response.json()
-            result = {}
-            
-            for i, symbol in enumerate(valid_symbols):
-                if i < len(vaa_data):
-                    # VAA data is returned as base64, convert to bytes
-                    import base64
-                    result[symbol] = base64.b64decode(vaa_data[i])
-                    
-            return result
+            with HERMES_REQUEST_SECONDS.labels("latest_vaas").time():
+                response = self.session.get(
+                    f"{self.hermes_url}/api/latest_vaas",
+                    params={"ids[]": feed_ids},
+                    timeout=10
+                )
+                response.raise_for_status()
+                vaa_data = response.json()
+
+            return self._decode_vaa_data(vaa_data, valid_symbols)
             
         except Exception as e:
+            HERMES_ERRORS.labels("latest_vaas").inc()
             print(f"❌ Failed to fetch VAA data: {e}")
             return {}
     
+    def _decode_vaa_data(self, vaa_data: List[str], symbols: List[str]) -> Dict[str, bytes]:
+        """Decode base64 VAAs returned by Hermes (same order as the requested symbols)"""
+        b64decode = base64.b64decode
+        return {symbol: b64decode(vaa) for symbol, vaa in zip(symbols, vaa_data)}
+    
     # STEP 2: UPDATE ON-CHAIN
     def update_on_chain_prices(self, symbols: Union[str, List[str]]) -> bool:
         """
@@ -0,0 +1,408 @@
+"""
+Local Stand-in Servers for Offline Benchmarks
+
+Small threaded HTTP servers that mimic the upstream services used by the
+oracles, so load tests can run without the network:
+
+- HermesStandIn: Hermes REST (latest_price_feeds, latest_vaas) and the
+  SSE price stream (/v2/updates/price/stream)
+- JsonRpcStandIn: minimal Ethereum JSON-RPC node (single and batch calls)
+- Erc20StandIn: JSON-RPC node with mock ERC-20 tokens and Multicall3
+
+Every stand-in supports latency injection (fixed + random jitter) and error
+injection (a fraction of requests answered with HTTP 500), driven by a seeded
+RNG so runs are reproducible.
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from pyth_oracle import PRICE_FEEDS
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class StandInServer:
+    """
+    Base class for stand-in servers
+
+    Args:
+        latency: Fixed delay added to every request (seconds)
+        jitter: Extra uniformly distributed delay in [0, jitter] seconds
+        error_rate: Fraction of requests answered with HTTP 500
+        seed: RNG seed for jitter and error injection
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 42, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self.injected_errors = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StandInServer":
+        self._httpd = _QuietServer((self.host, self.port), self._make_handler())
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def _delay_and_maybe_fail(self) -> bool:
+        """Apply injected latency; return True when this request should fail"""
+        with self._rng_lock:
+            delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            with self._stats_lock:
+                self.injected_errors += 1
+        return fail
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        raise NotImplementedError
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY keep-alive
+            # clients hit the Nagle/delayed-ACK stall (~40 ms) on every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.handle(self, "GET")
+
+            def do_POST(self):
+                server.handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, payload, status: int = 200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"null")
+
+        return Handler
+
+
+class HermesStandIn(StandInServer):
+    """
+    Hermes API stand-in with deterministic random-walk prices
+
+    Args:
+        stream_interval: Seconds between SSE price updates
+        feeds: Symbol -> feed id map served (defaults to pyth_oracle.PRICE_FEEDS)
+    """
+
+    BASE_PRICES = {
+        "BTC/USD": 65000.0, "ETH/USD": 3200.0, "SOL/USD": 150.0,
+        "BNB/USD": 580.0, "USDC/USD": 1.0, "USDT/USD": 1.0,
+    }
+
+    def __init__(self, stream_interval: float = 0.1, feeds: Dict[str, str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream_interval = stream_interval
+        self.feeds = feeds or PRICE_FEEDS
+        self._by_id = {feed_id.replace("0x", "").lower(): symbol for symbol, feed_id in self.feeds.items()}
+        self._prices = {symbol: self.BASE_PRICES.get(symbol, 10.0) for symbol in self.feeds}
+        self._price_lock = threading.Lock()
+
+    def _feed(self, feed_id: str) -> Optional[dict]:
+        clean_id = feed_id.replace("0x", "").lower()
+        symbol = self._by_id.get(clean_id)
+        if symbol is None:
+            return None
+        with self._rng_lock:
+            drift = (self._rng.random() - 0.5) * 0.001
+        with self._price_lock:
+            price = self._prices[symbol] * (1 + drift)
+            self._prices[symbol] = price
+        expo = -8
+        publish_time = int(time.time())
+        price_obj = {
+            "price": str(int(price * 10 ** -expo)),
+            "conf": str(int(price * 0.0005 * 10 ** -expo)),
+            "expo": expo,
+            "publish_time": publish_time,
+        }
+        return {"id": clean_id, "price": price_obj, "ema_price": dict(price_obj)}
+
+    def handle(self, handler, method):
+        parsed = urlparse(handler.path)
+        self._count(parsed.path)
+        ids = parse_qs(parsed.query).get("ids[]", [])
+
+        if parsed.path == "/v2/updates/price/stream":
+            self._stream(handler, ids)
+            return
+
+        if self._delay_and_maybe_fail():
+            handler.send_json({"error": "injected failure"}, status=500)
+            return
+
+        if parsed.path == "/api/latest_price_feeds":
+            handler.send_json([feed for feed in map(self._feed, ids) if feed])
+        elif parsed.path == "/api/latest_vaas":
+            # Opaque payloads of realistic size (a Pyth VAA is roughly 1 KB)
+            handler.send_json([
+                base64.b64encode(feed_id.encode("utf-8") * 16).decode("ascii") for feed_id in ids
+            ])
+        else:
+            handler.send_json({"error": "not found"}, status=404)
+
+    def _stream(self, handler, ids: List[str]):
+        """Server-sent events: one message per interval with every requested feed"""
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        try:
+            while self._httpd is not None:
+                if self._delay_and_maybe_fail():
+                    handler.wfile.write(b"event: error\ndata: {\"error\": \"injected failure\"}\n\n")
+                else:
+                    message = {
+                        "parsed": [feed for feed in map(self._feed, ids) if feed],
+                        "sent_at": time.time(),
+                    }
+                    handler.wfile.write(f"data: {json.dumps(message)}\n\n".encode("utf-8"))
+                handler.wfile.flush()
+                time.sleep(self.stream_interval)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _encode_int(value: int) -> str:
+    """ABI-encode a signed/unsigned integer as one 32-byte word"""
+    return f"{value % (1 << 256):064x}"
+
+
+class JsonRpcStandIn(StandInServer):
+    """
+    Ethereum JSON-RPC stand-in
+
+    Answers the calls the oracles make (chain id, block number, balances, gas
+    price, eth_call). Every eth_call returns an ABI-encoded Pyth price struct
+    (price, conf, expo, publishTime), which also decodes as a uint256 for
+    getUpdateFee. Batch requests are supported.
+    """
+
+    def __init__(self, chain_id: int = 16602, **kwargs):
+        super().__init__(**kwargs)
+        self.chain_id = chain_id
+        self.block_number = 1_000_000
+        self.method_counts: Dict[str, int] = {}
+
+    def _result(self, method: str, params: list):
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "net_version":
+            return str(self.chain_id)
+        if method == "web3_clientVersion":
+            return "FinRizz/StandIn/v1"
+        if method == "eth_blockNumber":
+            self.block_number += 1
+            return hex(self.block_number)
+        if method == "eth_gasPrice":
+            return hex(1_000_000_000)
+        if method == "eth_getBalance":
+            return hex(10 ** 18)
+        if method == "eth_getTransactionCount":
+            return "0x0"
+        if method == "eth_call":
+            return "0x" + "".join([
+                _encode_int(6_500_000_000_000),
+                _encode_int(3_250_000_000),
+                _encode_int(-8),
+                _encode_int(int(time.time())),
+            ])
+        raise KeyError(method)
+
+    def _dispatch(self, call: dict) -> dict:
+        method = call.get("method", "")
+        with self._stats_lock:
+            self.method_counts[method] = self.method_counts.get(method, 0) + 1
+        try:
+            return {"jsonrpc": "2.0", "id": call.get("id"), "result": self._result(method, call.get("params", []))}
+        except KeyError:
+            return {"jsonrpc": "2.0", "id": call.get("id"),
+                    "error": {"code": -32601, "message": f"Method not found: {method}"}}
+
+    def handle(self, handler, method):
+        self._count(urlparse(handler.path).path)
+        if method != "POST":
+            handler.send_json({"error": "JSON-RPC expects POST"}, status=405)
+            return
+        payload = handler.read_json()
+        if self._delay_and_maybe_fail():
+            handler.send_json({"error": "injected failure"}, status=500)
+            return
+        if isinstance(payload, list):
+            handler.send_json([self._dispatch(call) for call in payload])
+        else:
+            handler.send_json(self._dispatch(payload))
+
+
+def _encode_string(value: str) -> str:
+    data = value.encode("utf-8")
+    return _encode_int(32) + _encode_int(len(data)) + data.hex() + "00" * (-len(data) % 32)
+
+
+class Erc20StandIn(JsonRpcStandIn):
+    """
+    JSON-RPC stand-in with mock ERC-20 contracts and a Multicall3 deployment
+
+    Tokens answer totalSupply(), decimals(), symbol() and name(); Multicall3
+    answers aggregate3 by running each sub-call against the tokens. Calls to
+    any other address return empty data (no code), as does eth_getCode. Sub-calls are counted by
+    function in ``contract_calls``.
+
+    Args:
+        tokens: address -> {"symbol", "name", "decimals", "total_supply"}
+        multicall: Serve Multicall3 at its canonical address
+    """
+
+    MULTICALL3 = "0xca11bde05977b3631167028862be2a173976ca11"
+    FUNCTIONS = {"18160ddd": "totalSupply", "313ce567": "decimals", "95d89b41": "symbol", "06fdde03": "name"}
+
+    def __init__(self, tokens: Dict[str, dict] = None, multicall: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.tokens = {address.lower(): dict(token) for address, token in (tokens or {}).items()}
+        self.multicall = multicall
+        self.contract_calls: Dict[str, int] = {}
+
+    def add_token(self, address: str, symbol: str, total_supply: int, decimals: int = 18, name: str = None):
+        self.tokens[address.lower()] = {"symbol": symbol, "name": name or symbol, "decimals": decimals,
+                                        "total_supply": total_supply}
+
+    def _token_call(self, address: str, data: bytes) -> tuple:
+        """(success, return data hex) for one call to a token"""
+        function = self.FUNCTIONS.get(data[:4].hex())
+        token = self.tokens.get(address.lower())
+        if token is None:
+            return True, ""  # no code at this address
+        if function is None:
+            return False, ""
+        with self._stats_lock:
+            self.contract_calls[function] = self.contract_calls.get(function, 0) + 1
+        if function == "totalSupply":
+            return True, _encode_int(token["total_supply"])
+        if function == "decimals":
+            return True, _encode_int(token["decimals"])
+        return True, _encode_string(token["symbol" if function == "symbol" else "name"])
+
+    def _aggregate3(self, calldata: bytes) -> str:
+        def word(position: int) -> int:
+            return int.from_bytes(calldata[position:position + 32], "big")
+
+        calldata = calldata[4:]  # after the selector
+        start = word(0)
+        count = word(start)
+        heads = start + 32
+        results = []
+        for index in range(count):
+            entry = heads + word(heads + 32 * index)
+            target = "0x" + calldata[entry + 12:entry + 32].hex()
+            data_at = entry + word(entry + 64)
+            length = word(data_at)
+            results.append(self._token_call(target, calldata[data_at + 32:data_at + 32 + length]))
+        # (bool success, bytes returnData)[]
+        encoded_heads, tails, offset = [], [], 32 * len(results)
+        for success, data in results:
+            length = len(data) // 2
+            tail = _encode_int(int(success)) + _encode_int(64) + _encode_int(length) + data + "00" * (-length % 32)
+            encoded_heads.append(_encode_int(offset))
+            tails.append(tail)
+            offset += len(tail) // 2
+        return "0x" + _encode_int(32) + _encode_int(len(results)) + "".join(encoded_heads) + "".join(tails)
+
+    def _result(self, method: str, params: list):
+        if method == "eth_getCode":
+            address = (params[0] if params else "").lower()
+            deployed = address in self.tokens or (self.multicall and address == self.MULTICALL3)
+            return "0x6080604052" if deployed else "0x"
+        if method != "eth_call":
+            return super()._result(method, params)
+        call = params[0] if params else {}
+        target = (call.get("to") or "").lower()
+        data = bytes.fromhex((call.get("data") or call.get("input") or "0x")[2:])
+        if self.multicall and target == self.MULTICALL3 and data[:4].hex() == "82ad56cb":
+            return self._aggregate3(data)
+        success, result = self._token_call(target, data)
+        if not success:
+            raise ValueError("execution reverted")
+        return "0x" + result
+
+    def _dispatch(self, call: dict) -> dict:
+        try:
+            return super()._dispatch(call)
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": 3, "message": str(e)}}
+
+
+if __name__ == "__main__":
+    import requests
+
+    with HermesStandIn(latency=0.005) as hermes, JsonRpcStandIn() as rpc:
+        print(f"📡 Hermes stand-in: {hermes.url}")
+        print(f"⛓️  JSON-RPC stand-in: {rpc.url}")
+
+        response = requests.get(
+            f"{hermes.url}/api/latest_price_feeds",
+            params={"ids[]": [PRICE_FEEDS["BTC/USD"]], "verbose": "true"},
+            timeout=5,
+        )
+        print(f"✅ latest_price_feeds: {response.json()[0]['price']}")
+
+        response = requests.post(rpc.url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId"}, timeout=5)
+        print(f"✅ eth_chainId: {response.json()['result']}")
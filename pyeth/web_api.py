@@ -5,18 +5,14 @@ A simple Flask-based web server that provides RESTful API endpoints
 for fetching cryptocurrency prices from Pyth Network.
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 import logging
+import time
 from datetime import datetime
 
-# Try to import the full service, fall back to simple fetcher
-try:
-    from src.pyth_service import PythPriceService
-    USE_FULL_SERVICE = True
-except ImportError:
-    from simple_price_fetcher import SimplePythPriceFetcher
-    USE_FULL_SERVICE = False
+from metrics import CONTENT_TYPE_LATEST, HTTP_REQUEST_SECONDS, generate_latest
+from price_provider import create_price_provider
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,13 +22,27 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize price service
-if USE_FULL_SERVICE:
-    price_service = PythPriceService()
-    logger.info("Using full PythPriceService")
-else:
-    price_service = SimplePythPriceFetcher()
-    logger.info("Using SimplePythPriceFetcher")
+# Initialize price provider once at startup (warm client + cache shared by all routes)
+price_service = create_price_provider()
+logger.info(f"Using {type(price_service).__name__}")
+
+
+@app.before_request
+def start_request_timer():
+    """Stamp the request start for the latency histogram"""
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    """Record per-route latency (labelled by URL rule to keep cardinality bounded)"""
+    start = g.get("request_start")
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        HTTP_REQUEST_SECONDS.labels(request.method, route, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+    return response
 
 
 @app.route('/')
@@ -48,7 +58,8 @@ def home():
             "GET /symbols": "List available symbols",
             "GET /price/<symbol>": "Get price for single symbol",
             "POST /prices": "Get prices for multiple symbols",
-            "GET /api/v1/price/<symbol>": "Alternative price endpoint"
+            "GET /api/v1/price/<symbol>": "Alternative price endpoint",
+            "GET /metrics": "Prometheus metrics"
         },
         "example_usage": {
             "single_price": "/price/BTC/USD",
@@ -62,17 +73,13 @@ def health():
     """Health check endpoint"""
     try:
         # Test fetching a price to ensure service is working
-        if USE_FULL_SERVICE:
-            test_price = price_service.get_latest_price("BTC/USD")
-        else:
-            test_price = price_service.get_price("BTC/USD")
-            
+        test_price = price_service.get("BTC/USD")
         status = "healthy" if test_price else "degraded"
         
         return jsonify({
             "status": status,
             "timestamp": datetime.now().isoformat(),
-            "service_type": "full" if USE_FULL_SERVICE else "simple"
+            "service_type": price_service.name
         })
     except Exception as e:
         return jsonify({
@@ -86,11 +93,7 @@ def health():
 def get_symbols():
     """Get list of available symbols"""
     try:
-        if USE_FULL_SERVICE:
-            symbols = price_service.get_price_feed_ids()
-            available_symbols = list(symbols.keys())
-        else:
-            available_symbols = price_service.available_symbols()
+        available_symbols = price_service.symbols()
             
         return jsonify({
             "symbols": available_symbols,
@@ -108,10 +111,7 @@ def get_price(symbol):
         # Replace - with / for URL-friendly symbols (e.g., BTC-USD -> BTC/USD)
         symbol = symbol.replace('-', '/')
         
-        if USE_FULL_SERVICE:
-            price_data = price_service.get_latest_price(symbol)
-        else:
-            price_data = price_service.get_price(symbol)
+        price_data = price_service.get(symbol)
             
         if price_data:
             return jsonify({
@@ -155,10 +155,7 @@ def get_multiple_prices():
         # Replace - with / in symbols
         symbols = [s.replace('-', '/') for s in symbols]
         
-        if USE_FULL_SERVICE:
-            prices = price_service.get_multiple_prices(symbols)
-        else:
-            prices = price_service.get_multiple_prices(symbols)
+        prices = price_service.get_many(symbols)
             
         return jsonify({
             "success": True,
@@ -176,6 +173,12 @@ def get_multiple_prices():
         }), 500
 
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+
+
 # Alternative API endpoints with versioning
 @app.route('/api/v1/price/<path:symbol>')
 def get_price_v1(symbol):
@@ -203,7 +206,7 @@ def not_found(error):
         "error": "Endpoint not found",
         "available_endpoints": [
             "/", "/health", "/symbols", "/price/<symbol>", 
-            "POST /prices", "/api/v1/..."
+            "POST /prices", "/metrics", "/api/v1/..."
         ],
         "timestamp": datetime.now().isoformat()
     }), 404
@@ -219,10 +222,13 @@ def internal_error(error):
     }), 500
 
 
-def create_app(config=None):
-    """Application factory"""
+def create_app(config=None, provider=None):
+    """Application factory (optionally swapping the price provider, e.g. a stub for load tests)"""
+    global price_service
     if config:
         app.config.update(config)
+    if provider is not None:
+        price_service = provider
     return app
 
 
@@ -238,6 +244,7 @@ API Endpoints:
 - GET  /price/<symbol>      - Get single price (e.g., /price/BTC/USD or /price/BTC-USD)
 - POST /prices              - Get multiple prices
 - GET  /api/v1/...          - Versioned endpoints
+- GET  /metrics             - Prometheus metrics
 
 Example Usage:
 - Single price: http://localhost:5000/price/BTC/USD
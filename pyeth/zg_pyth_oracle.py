@@ -11,12 +11,18 @@ Features:
 
 import os
 import json
+import base64
 import time
 import requests
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 
+from metrics import (
+    HERMES_REQUEST_SECONDS, HERMES_ERRORS, ZG_SUBMISSION_SECONDS,
+    instrument_provider, record_snapshot,
+)
+
 # Optional blockchain imports
 try:
     from web3 import Web3
@@ -149,7 +155,7 @@ class ZGPythOracle:
             network: 0G network to use ('newton_testnet' or 'mainnet')
         """
         # Hermes API configuration
-        self.hermes_url = "https://hermes.pyth.network"
+        self.hermes_url = os.getenv("HERMES_URL", "https://hermes.pyth.network")
         
         # 0G Network configuration
         self.network = network
@@ -181,7 +187,7 @@ class ZGPythOracle:
             
         try:
             # Connect to 0G blockchain
-            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+            self.w3 = Web3(instrument_provider(Web3.HTTPProvider(self.rpc_url)))
             
             if not self.w3.is_connected():
                 raise Exception("Failed to connect to 0G blockchain")
@@ -236,17 +242,22 @@ class ZGPythOracle:
         feed_ids = [PRICE_FEEDS[symbol] for symbol in valid_symbols]
         
         try:
-            response = requests.get(
-                f"{self.hermes_url}/api/latest_price_feeds",
-                params={"ids[]": feed_ids, "verbose": "true", "binary": "false"},
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            raw_data = response.json()
-            return self._parse_zg_price_data(raw_data, valid_symbols)
+            with HERMES_REQUEST_SECONDS.labels("latest_price_feeds").time():
+                response = requests.get(
+                    f"{self.hermes_url}/api/latest_price_feeds",
+                    params={"ids[]": feed_ids, "verbose": "true", "binary": "false"},
+                    timeout=10
+                )
+                response.raise_for_status()
+                raw_data = response.json()
+            
+            parsed = self._parse_zg_price_data(raw_data, valid_symbols)
+            for symbol, data in parsed.items():
+                record_snapshot(symbol, data.timestamp.timestamp())
+            return parsed
             
         except Exception as e:
+            HERMES_ERRORS.labels("latest_price_feeds").inc()
             print(f"❌ Failed to fetch prices: {e}")
             return {}
     
@@ -313,35 +324,25 @@ class ZGPythOracle:
             return {}
         
         try:
-            # Prepare data for 0G DA storage
-            da_payload = {
-                "timestamp": datetime.now().isoformat(),
-                "network": self.network,
-                "prices": {}
-            }
-            
-            for symbol, data in price_data.items():
-                da_payload["prices"][symbol] = {
-                    "price": data.price,
-                    "confidence": data.confidence,
-                    "timestamp": data.timestamp.isoformat(),
-                    "feed_id": data.feed_id,
-                    "zg_block_height": data.zg_block_height
-                }
-            
-            # Convert to JSON bytes
-            data_bytes = json.dumps(da_payload).encode('utf-8')
+            data_bytes = self._build_da_payload(price_data)
             
             # Submit to 0G DA (this is a simplified implementation)
             # In practice, you'd use 0G's official SDK
-            da_response = requests.post(
-                f"{self.zg_da_node}/submit",
-                json={
-                    "data": data_bytes.hex(),
-                    "namespace": "pyth_prices"
-                },
-                timeout=30
-            )
+            start = time.perf_counter()
+            try:
+                da_response = requests.post(
+                    f"{self.zg_da_node}/submit",
+                    json={
+                        "data": data_bytes.hex(),
+                        "namespace": "pyth_prices"
+                    },
+                    timeout=30
+                )
+            except Exception:
+                ZG_SUBMISSION_SECONDS.labels("da", "error").observe(time.perf_counter() - start)
+                raise
+            outcome = "ok" if da_response.status_code == 200 else "error"
+            ZG_SUBMISSION_SECONDS.labels("da", outcome).observe(time.perf_counter() - start)
             
             if da_response.status_code == 200:
                 commitment = da_response.json().get("commitment_hash")
@@ -362,6 +363,25 @@ class ZGPythOracle:
             print(f"❌ 0G DA storage error: {e}")
             return {}
     
+    def _build_da_payload(self, price_data: Dict[str, ZGPriceData]) -> bytes:
+        """Serialize price data into the JSON bytes submitted to 0G DA"""
+        da_payload = {
+            "timestamp": datetime.now().isoformat(),
+            "network": self.network,
+            "prices": {}
+        }
+        
+        for symbol, data in price_data.items():
+            da_payload["prices"][symbol] = {
+                "price": data.price,
+                "confidence": data.confidence,
+                "timestamp": data.timestamp.isoformat(),
+                "feed_id": data.feed_id,
+                "zg_block_height": data.zg_block_height
+            }
+        
+        return json.dumps(da_payload).encode('utf-8')
+    
     # STEP 3: 0G STORAGE INTEGRATION
     def store_historical_prices_on_0g_storage(self, price_data: Dict[str, ZGPriceData]) -> Optional[str]:
         """
@@ -391,11 +411,18 @@ class ZGPythOracle:
                 storage_payload["prices"][symbol]["timestamp"] = data.timestamp.isoformat()
             
             # Submit to 0G Storage
-            storage_response = requests.post(
-                f"{self.zg_storage_node}/store",
-                json=storage_payload,
-                timeout=60
-            )
+            start = time.perf_counter()
+            try:
+                storage_response = requests.post(
+                    f"{self.zg_storage_node}/store",
+                    json=storage_payload,
+                    timeout=60
+                )
+            except Exception:
+                ZG_SUBMISSION_SECONDS.labels("storage", "error").observe(time.perf_counter() - start)
+                raise
+            outcome = "ok" if storage_response.status_code == 200 else "error"
+            ZG_SUBMISSION_SECONDS.labels("storage", outcome).observe(time.perf_counter() - start)
             
             if storage_response.status_code == 200:
                 storage_root = storage_response.json().get("root_hash")
@@ -480,27 +507,27 @@ class ZGPythOracle:
         feed_ids = [PRICE_FEEDS[symbol] for symbol in valid_symbols]
         
         try:
-            response = requests.get(
-                f"{self.hermes_url}/api/latest_vaas",
-                params={"ids[]": feed_ids},
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            vaa_data = response.json()
-            result = {}
-            
-            for i, symbol in enumerate(valid_symbols):
-                if i < len(vaa_data):
-                    import base64
-                    result[symbol] = base64.b64decode(vaa_data[i])
-                    
-            return result
+            with HERMES_REQUEST_SECONDS.labels("latest_vaas").time():
+                response = requests.get(
+                    f"{self.hermes_url}/api/latest_vaas",
+                    params={"ids[]": feed_ids},
+                    timeout=10
+                )
+                response.raise_for_status()
+                vaa_data = response.json()
+
+            return self._decode_vaa_data(vaa_data, valid_symbols)
             
         except Exception as e:
+            HERMES_ERRORS.labels("latest_vaas").inc()
             print(f"❌ Failed to fetch VAA data: {e}")
             return {}
     
+    def _decode_vaa_data(self, vaa_data: List[str], symbols: List[str]) -> Dict[str, bytes]:
+        """Decode base64 VAAs returned by Hermes (same order as the requested symbols)"""
+        b64decode = base64.b64decode
+        return {symbol: b64decode(vaa) for symbol, vaa in zip(symbols, vaa_data)}
+    
     # COMPLETE 0G WORKFLOW
     def complete_0g_price_update(self, symbols: Union[str, List[str]]) -> Dict[str, ZGPriceData]:
         """